@@ -0,0 +1,76 @@
+"""Microbenchmark do codec OSPF: codificação e decodificação por tipo de pacote.
+
+Se o scapy estiver instalado, compara com a construção e a dissecação por
+objetos do scapy.
+
+    python3 benchmarks/bench_codec.py [--number 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import ospf_codec  # noqa: E402
+from lsdb import LinkRecord, RouterLSA  # noqa: E402
+from ospf_codec import (DatabaseDescription, Hello, decode, encode_dbd, encode_hello,  # noqa: E402
+                        encode_lsack, encode_lsr, encode_lsu, lsa_header)
+
+ROUTER_ID = "1.1.1.1"
+
+
+def sample_lsas(count, links, seed):
+    rng = random.Random(seed)
+    return [RouterLSA(0x0A000001 + i, 0x80000001,
+                      [LinkRecord(0x0A000001 + rng.randrange(1000), 0, rng.randint(1, 65535),
+                                  rng.uniform(1, 50), rng.uniform(0, 1), rng.uniform(0, 5), 100.0)
+                       for _ in range(links)])
+            for i in range(count)]
+
+
+def packets(lsas):
+    headers = [lsa_header(lsa) for lsa in lsas]
+    encoded = [lsa.to_bytes() for lsa in lsas]
+    return {
+        "Hello": lambda: encode_hello(ROUTER_ID, Hello(0xFFFFFF00, 10, 2, 1, 40, 0, 0,
+                                                       ["2.2.2.2", "3.3.3.3"])),
+        "DBD": lambda: encode_dbd(ROUTER_ID, DatabaseDescription(1500, 2, 0, 7, headers)),
+        "LSR": lambda: encode_lsr(ROUTER_ID, [(1, h.ls_id, h.adv_router) for h in headers]),
+        "LSU": lambda: encode_lsu(ROUTER_ID, encoded),
+        "LSAck": lambda: encode_lsack(ROUTER_ID, headers),
+    }
+
+
+def bench(func, number):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--lsas", type=int, default=10, help="LSAs por DBD/LSR/LSU/LSAck")
+    parser.add_argument("--links", type=int, default=4, help="enlaces por router-LSA")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    lsas = sample_lsas(args.lsas, args.links, args.seed)
+    print(f"{args.lsas} LSAs por pacote, {args.links} enlaces por LSA (µs por pacote)")
+    for name, encode in packets(lsas).items():
+        data = encode()
+        encode_us = bench(encode, args.number)
+        decode_us = bench(lambda: decode(data), args.number)
+        line = (f"  {name:6s} {len(data):5d} bytes  codificar {encode_us:7.2f}  "
+                f"decodificar {decode_us:7.2f}")
+        if ospf_codec.OSPF_Hdr is not None:
+            dissect_us = bench(lambda: bytes(ospf_codec.dissect(data)), args.number // 10)
+            line += f"  scapy (dissecar e remontar) {dissect_us:7.2f}"
+        print(line)
+    if ospf_codec.OSPF_Hdr is None:
+        print("  scapy não instalado: comparação omitida")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Bytes de flooding com jitter oscilando: deltas de métricas vs. router-LSAs completos.
+
+Usa a topologia de `config.json`. A cada medição os enlaces escolhidos
+alternam o jitter entre dois valores (flap) e cada roteador origina o seu
+LSA; os LSAs são inundados salto a salto até todos os LSDBs convergirem.
+
+    python3 benchmarks/bench_delta_lsa.py [--seconds 300] [--flapping 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from common import Clock, router_id, topology  # noqa: E402
+from lsdb import LSDB, ROUTER_LSA, LinkRecord, decode_lsa  # noqa: E402
+from metric_delta import DeltaOriginator  # noqa: E402
+from ospf_codec import IP_HEADER_SIZE, OSPF_HEADER  # noqa: E402
+
+# Cabeçalhos IP e OSPF e o contador de LSAs do LSU, com um LSA por pacote.
+PACKET_OVERHEAD = IP_HEADER_SIZE + OSPF_HEADER.size + 4
+
+
+def simulate(edges, seconds, interval_s, flapping, use_deltas, refresh_s, seed):
+    rng = random.Random(seed)
+    clock = Clock()
+    routers = sorted({r for (a, b), _ in edges for r in (a, b)})
+    neighbors = {r: [] for r in routers}
+    originators, lsdbs = {}, {r: LSDB(clock) for r in routers}
+    for r in routers:
+        links = []
+        for (a, b), link in edges:
+            if r in (a, b):
+                n = b if r == a else a
+                neighbors[r].append(n)
+                links.append(LinkRecord(router_id(n), 0, 1000, link["latency_ms"],
+                                        link["packet_loss_percent"], link["jitter_ms"],
+                                        link["bandwidth_mbps"]))
+        originators[r] = DeltaOriginator(router_id(r), links, refresh_s=refresh_s,
+                                         max_deltas=16 if use_deltas else 0, clock=clock)
+    flaps = rng.sample([edge for edge, _ in edges], flapping)
+
+    lsa_bytes = packets = 0
+
+    def flood(origin, data):
+        nonlocal lsa_bytes, packets
+        queue = deque((n, origin) for n in neighbors[origin])
+        while queue:
+            r, sender = queue.popleft()
+            lsa_bytes += len(data)
+            packets += 1
+            lsa, _ = decode_lsa(data)
+            if lsdbs[r].install(lsa):
+                queue.extend((n, r) for n in neighbors[r] if n != sender)
+
+    steps = int(seconds / interval_s)
+    for step in range(steps + 1):
+        clock.now = step * interval_s
+        for a, b in flaps:
+            jitter = 1.0 if step % 2 else 6.0
+            originators[a].update(router_id(b), jitter_ms=jitter)
+            originators[b].update(router_id(a), jitter_ms=jitter)
+        for r in routers:
+            lsa = originators[r].originate()
+            if lsa is not None:
+                lsdbs[r].install(lsa)
+                flood(r, lsa.to_bytes())
+
+    for r in routers:
+        expected = originators[r].full_lsa()
+        for db in lsdbs.values():
+            got = db.get(ROUTER_LSA, expected.adv_router, expected.adv_router)
+            assert got.seq == expected.seq
+            assert [(l.neighbor, l.jitter_ms) for l in got.links] == \
+                [(l.neighbor, l.jitter_ms) for l in expected.links]
+    full = sum(o.full_sent for o in originators.values())
+    deltas = sum(o.deltas_sent for o in originators.values())
+    return lsa_bytes, packets, full, deltas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=300.0)
+    parser.add_argument("--interval", type=float, default=1.0, help="intervalo de medição (s)")
+    parser.add_argument("--flapping", type=int, default=3, help="enlaces com jitter oscilando")
+    parser.add_argument("--refresh", type=float, default=30.0, help="refresh completo (s)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    edges = topology()
+    print(f"{len(edges)} enlaces, {args.flapping} com jitter oscilando, "
+          f"{args.seconds:.0f} s com medição a cada {args.interval} s")
+    results = {}
+    for name, use_deltas in (("LSAs completos", False), ("deltas + refresh", True)):
+        lsa_bytes, packets, full, deltas = simulate(
+            edges, args.seconds, args.interval, args.flapping, use_deltas, args.refresh, args.seed)
+        results[name] = lsa_bytes + packets * PACKET_OVERHEAD
+        print(f"  {name:17s} {full:5d} completos {deltas:5d} deltas  "
+              f"{lsa_bytes:9d} bytes de LSA  {results[name]:9d} bytes com cabeçalhos")
+    full_bytes, delta_bytes = results.values()
+    print(f"  redução: {1 - delta_bytes / full_bytes:.1%} com cabeçalhos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Flooding na topologia do docker-compose: LSUs em lote e cadenciados vs. um pacote por LSA.
+
+Simula os 8 roteadores de `config.json` com relógio falso. Em cada rodada
+todos reoriginam o router-LSA (ex.: jitter remedido) em instantes aleatórios
+dentro de uma janela curta; o flooding propaga pela rede com 1 ms por salto.
+
+    python3 benchmarks/bench_flooding.py [--rounds 20] [--window-ms 10]
+"""
+
+import argparse
+import heapq
+import itertools
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from common import Clock, router_id, topology  # noqa: E402
+from flooding import Flooder  # noqa: E402
+from lsdb import LSDB, LinkRecord, RouterLSA  # noqa: E402
+from ospf_codec import decode_lsu_body  # noqa: E402
+
+HOP_DELAY_S = 0.001
+TICK_S = 0.001
+
+
+def simulate(edges, rounds, window_s, batched, seed):
+    rng = random.Random(seed)
+    clock = Clock()
+    routers = sorted({r for edge in edges for r in edge})
+    in_flight = []
+    counter = itertools.count()
+    flooders, lsdbs, seqs = {}, {}, {}
+    for r in routers:
+        if batched:
+            flooders[r] = Flooder(clock=clock)
+        else:
+            flooders[r] = Flooder(mtu=1, rate_pps=1e9, burst=10 ** 9, batch_delay_s=0,
+                                  clock=clock)
+        lsdbs[r] = LSDB(clock)
+        seqs[r] = 0x80000000
+    for a, b in edges:
+        name = f"net-r{a}-r{b}"
+        for src, dst in ((a, b), (b, a)):
+            def send(body, dst=dst, name=name):
+                heapq.heappush(in_flight, (clock.now + HOP_DELAY_S, next(counter), dst, name, body))
+            flooders[src].add_interface(name, send)
+
+    neighbors = {r: [b if a == r else a for a, b in edges if r in (a, b)] for r in routers}
+    originations = []
+    for i in range(rounds):
+        base = i * window_s * 2
+        originations.extend((base + rng.uniform(0, window_s), r) for r in routers)
+    originations.sort()
+
+    def originate(r):
+        seqs[r] += 1
+        links = [LinkRecord(router_id(n), 0, rng.randint(1, 65535), jitter_ms=rng.uniform(0, 5))
+                 for n in neighbors[r]]
+        lsa = RouterLSA(router_id(r), seqs[r], links)
+        lsdbs[r].install(lsa)
+        flooders[r].flood(lsa)
+
+    def receive(r, name, body):
+        for lsa in decode_lsu_body(body):
+            if lsdbs[r].install(lsa):
+                flooders[r].flood(lsa, exclude=name)
+        if not batched:
+            flooders[r].poll()
+
+    while originations or in_flight or any(len(i) for f in flooders.values()
+                                            for i in f.interfaces.values()):
+        clock.now += TICK_S
+        while originations and originations[0][0] <= clock.now:
+            r = originations.pop(0)[1]
+            originate(r)
+            if not batched:
+                flooders[r].poll()
+        while in_flight and in_flight[0][0] <= clock.now:
+            _, _, r, name, body = heapq.heappop(in_flight)
+            receive(r, name, body)
+        for flooder in flooders.values():
+            flooder.poll()
+
+    final = {r: sorted((lsa.key, lsa.seq) for lsa in lsdbs[r]) for r in routers}
+    assert all(state == final[routers[0]] for state in final.values())
+    return flooders
+
+
+def totals(flooders):
+    packets = sum(s["packets"] for f in flooders.values() for s in f.stats().values())
+    lsas = sum(s["lsas"] for f in flooders.values() for s in f.stats().values())
+    return packets, lsas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--window-ms", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    edges = [edge for edge, _ in topology()]
+    window_s = args.window_ms / 1000.0
+    single = simulate(edges, args.rounds, window_s, False, args.seed)
+    batched = simulate(edges, args.rounds, window_s, True, args.seed)
+
+    print(f"{len(edges)} enlaces, {args.rounds} rodadas de reoriginação")
+    for name, flooders in (("um LSA por pacote", single), ("em lote", batched)):
+        packets, lsas = totals(flooders)
+        print(f"  {name:18s} {packets:6d} pacotes, {lsas:6d} LSAs, {lsas / packets:5.2f} LSAs/pacote")
+    print("  por interface (em lote):")
+    for r, flooder in sorted(batched.items()):
+        for name, s in flooder.stats().items():
+            print(f"    r{r} {name:10s} {s['packets']:5d} pacotes  "
+                  f"{s['lsas_per_packet']:5.2f} LSAs/pacote  máx {s['max_lsas_per_packet']:2d}  substituídos {s['superseded']:4d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Mensagens por evento: flooding completo vs. topologia de flooding reduzida.
+
+Gera malhas aleatórias conexas de 200 roteadores e inunda um LSA a partir de
+cada roteador. Também derruba um enlace da topologia reduzida para conferir
+que todos ainda recebem o LSA (e quantas vezes cai no flooding completo).
+
+    python3 benchmarks/bench_flooding_topology.py [--routers 200] [--degree 12]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from flooding_topology import DynamicFlooding, flooding_topology, undirected_edges  # noqa: E402
+
+
+def random_mesh(routers, degree, rng):
+    graph = {u: {} for u in range(1, routers + 1)}
+
+    def link(u, v):
+        cost = rng.randint(1, 100)
+        graph[u][v] = graph[v][u] = cost
+
+    nodes = list(graph)
+    rng.shuffle(nodes)
+    for i in range(1, routers):
+        link(nodes[i], nodes[rng.randrange(i)])
+    target = routers * degree // 2
+    while len(undirected_edges(graph)) < target:
+        u, v = rng.sample(nodes, 2)
+        link(u, v)
+    return graph
+
+
+def flood(graph, origin, states):
+    """Inunda um LSA de `origin`; retorna (mensagens, saltos até o último)."""
+    received = {origin: 0}
+    queue = deque([(origin, None)])
+    messages = 0
+    while queue:
+        u, sender = queue.popleft()
+        for v in states[u].flood_neighbors(graph[u]):
+            if v == sender:
+                continue
+            messages += 1
+            if v not in received:
+                received[v] = received[u] + 1
+                queue.append((v, u))
+    assert len(received) == len(graph), "LSA não chegou a todos os roteadores"
+    return messages, max(received.values())
+
+
+def run(graph, enabled):
+    states = {u: DynamicFlooding(u, enabled) for u in graph}
+    for state in states.values():
+        state.update(graph)
+    results = [flood(graph, origin, states) for origin in graph]
+    return (sum(m for m, _ in results) / len(results), max(h for _, h in results), states)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routers", type=int, default=200)
+    parser.add_argument("--degree", type=int, nargs="+", default=[6, 12, 24])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for degree in args.degree:
+        graph = random_mesh(args.routers, degree, rng)
+        edges = undirected_edges(graph)
+        start = time.perf_counter()
+        reduced = flooding_topology(graph)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        full_msgs, full_hops, _ = run(graph, False)
+        dyn_msgs, dyn_hops, states = run(graph, True)
+
+        # Falha de um enlace da topologia reduzida antes do recálculo.
+        a, b = rng.choice(sorted(reduced))
+        del graph[a][b], graph[b][a]
+        for state in states.values():
+            state.link_down(a, b)
+        fail_msgs = sum(flood(graph, origin, states)[0] for origin in graph) / len(graph)
+        fallbacks = sum(s.fallbacks for s in states.values())
+
+        print(f"{args.routers} roteadores, grau médio {degree}: {len(edges)} enlaces, "
+              f"topologia reduzida {len(reduced)} ({build_ms:.1f} ms)")
+        print(f"  flooding completo: {full_msgs:8.1f} mensagens/evento, {full_hops} saltos")
+        print(f"  topologia reduzida:{dyn_msgs:8.1f} mensagens/evento, {dyn_hops} saltos")
+        print(f"  após a queda de {a}-{b}: {fail_msgs:8.1f} mensagens/evento, "
+              f"{fallbacks} roteadores em flooding completo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Memória do LSDB por 10 mil enlaces: layout compacto vs. um dict por LSA.
+
+    python3 benchmarks/bench_lsdb_memory.py [--links 10000] [--degree 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from csr_graph import int_to_router_id  # noqa: E402
+from lsdb import LSDB, LinkRecord, RouterLSA  # noqa: E402
+
+
+def synthetic_lsas(links, degree, seed):
+    rng = random.Random(seed)
+    routers = max(links // degree, 2)
+    ids = [int_to_router_id(0x0A000001 + i) for i in range(routers)]
+    for i, router_id in enumerate(ids):
+        records = [LinkRecord(rng.choice(ids), 0x0A000000 + i, rng.randint(1, 65535),
+                              rng.uniform(1, 50), rng.uniform(0, 1), rng.uniform(0, 5),
+                              rng.choice((10, 50, 100, 1000)))
+                   for _ in range(degree)]
+        yield RouterLSA(router_id, 0x80000001, records)
+
+
+def dict_layout(lsas):
+    """Layout ingênuo: um dict por LSA e um dict por enlace, chaves em string."""
+    db = {}
+    for lsa in lsas:
+        router_id = int_to_router_id(lsa.adv_router)
+        db[(1, router_id, router_id)] = {
+            "ls_type": 1, "ls_id": router_id, "adv_router": router_id,
+            "seq": lsa.seq, "age": lsa.age, "checksum": lsa.checksum,
+            "links": [{"neighbor": int_to_router_id(link.neighbor),
+                       "link_data": int_to_router_id(link.link_data),
+                       "metric": link.metric, "latency_ms": link.latency_ms,
+                       "loss_percent": link.loss_percent, "jitter_ms": link.jitter_ms,
+                       "bandwidth_mbps": link.bandwidth_mbps}
+                      for link in lsa.links],
+        }
+    return db
+
+
+def compact_layout(lsas):
+    db = LSDB()
+    for lsa in lsas:
+        db.install(lsa)
+    return db
+
+
+def measure(build, lsas):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    db = build(lsas)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return db, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--links", type=int, default=10000)
+    parser.add_argument("--degree", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    lsas = list(synthetic_lsas(args.links, args.degree, args.seed))
+    total = sum(len(lsa.links) for lsa in lsas)
+    _, naive = measure(dict_layout, lsas)
+    db, compact = measure(compact_layout, lsas)
+    assert db.link_count == total
+
+    per_10k = 10000 / total
+    print(f"{len(lsas)} LSAs, {total} enlaces")
+    print(f"  dict por LSA: {naive * per_10k / 1024:10.1f} KiB / 10k enlaces")
+    print(f"  LSDB compacto:{compact * per_10k / 1024:10.1f} KiB / 10k enlaces")
+    print(f"  redução:      {naive / compact:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
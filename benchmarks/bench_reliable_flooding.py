@@ -0,0 +1,113 @@
+"""Convergência num enlace: acks em lote e RTO adaptativo vs. ack por LSA e RxmtInterval fixo.
+
+Um vizinho envia uma rajada de LSAs pelo enlace (latência e perda do
+`config.json`, nos dois sentidos) e conta pacotes de controle, retransmissões
+(espúrias = o outro lado já tinha o LSA) e o tempo até o último ack.
+
+    python3 benchmarks/bench_reliable_flooding.py [--lsas 500] [--loss 2]
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from common import CONFIG, Clock  # noqa: E402
+from cost_engine import load_config  # noqa: E402
+from ospf_codec import LSAHeader  # noqa: E402
+from reliable_flooding import (AckBatcher, RetransmissionList, RTOEstimator,  # noqa: E402
+                               link_rtt_s)
+from timer_wheel import TimerWheel  # noqa: E402
+
+LSA_SIZE = 100
+CLASSIC_RXMT_S = 5.0
+
+
+def simulate(latency_s, loss, lsas, burst_s, adaptive, seed):
+    rng = random.Random(seed)
+    clock = Clock()
+    wheel = TimerWheel(tick_s=0.001, clock=clock)
+    counts = {"lsu": 0, "ack": 0, "spurious": 0}
+    received = set()
+    done = {}
+
+    def deliver(func, *args):
+        if rng.random() >= loss:
+            wheel.schedule(latency_s, func, *args)
+
+    def send_lsas(batch):
+        counts["lsu"] += 1
+        deliver(on_lsu, [int.from_bytes(data[:8], "big") for data in batch])
+
+    def send_ack(headers):
+        counts["ack"] += 1
+        deliver(on_ack, [h.ls_id for h in headers])
+
+    if adaptive:
+        estimator = RTOEstimator(2 * latency_s)
+        acks = AckBatcher(send_ack, wheel)
+    else:
+        estimator = RTOEstimator(CLASSIC_RXMT_S, ack_delay_s=0,
+                                 min_rto_s=CLASSIC_RXMT_S, max_rto_s=CLASSIC_RXMT_S)
+        estimator.sample = lambda rtt: None
+        acks = None
+    rxmt = RetransmissionList(send_lsas, wheel, estimator, clock=clock)
+
+    def on_lsu(keys):
+        for key in keys:
+            if key in received:
+                counts["spurious"] += 1
+            received.add(key)
+            header = LSAHeader(0, 0, 1, key, 0, 1, 0, LSA_SIZE)
+            if acks is not None:
+                acks.ack(header)
+            else:
+                send_ack([header])
+
+    def on_ack(keys):
+        for key in keys:
+            if rxmt.acknowledge(key, 1):
+                done[key] = clock.now
+
+    def originate(key):
+        data = key.to_bytes(8, "big") + bytes(LSA_SIZE - 8)
+        rxmt.add(key, 1, data)
+        send_lsas([data])
+
+    for key in range(lsas):
+        wheel.schedule(burst_s * key / lsas, originate, key)
+    while len(done) < lsas:
+        clock.now += 0.001
+        wheel.advance()
+    return counts, rxmt.retransmitted, max(done.values()), estimator.rto
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lsas", type=int, default=500)
+    parser.add_argument("--burst-ms", type=float, default=200.0, help="duração da rajada")
+    parser.add_argument("--loss", type=float, default=None,
+                        help="perda em %% (padrão: a do enlace no config.json)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    config = load_config(CONFIG)
+    for prefix in ("10.7.8.0/24", "10.6.8.0/24"):
+        link = config["links"][prefix]
+        latency_s = link_rtt_s(config, prefix) / 2
+        loss = (link["packet_loss_percent"] if args.loss is None else args.loss) / 100
+        print(f"{link['description']}: {latency_s * 1000:.0f} ms, perda {loss:.1%}, "
+              f"{args.lsas} LSAs em {args.burst_ms:.0f} ms")
+        for name, adaptive in (("ack por LSA, RxmtInterval 5 s", False),
+                               ("acks em lote, RTO adaptativo", True)):
+            counts, retransmitted, finish, rto = simulate(
+                latency_s, loss, args.lsas, args.burst_ms / 1000, adaptive, args.seed)
+            print(f"  {name:31s} {counts['lsu']:5d} LSUs {counts['ack']:5d} acks  "
+                  f"{retransmitted:4d} retransm. ({counts['spurious']} espúrias)  "
+                  f"último ack em {finish * 1000:7.0f} ms  RTO {rto * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark do SPF: dicionário + heapq vs. CSR (heap binário e radix heap).
+
+Gera uma topologia sintética de roteadores (anel com cordas aleatórias) e
+mede o tempo médio de um SPF completo em cada representação.
+
+    python3 benchmarks/bench_spf.py [--routers 5000] [--degree 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from csr_graph import CSRGraph, int_to_router_id  # noqa: E402
+from spf import dijkstra, spf_csr  # noqa: E402
+
+QUANTIZATION_SCALE = 65535
+
+
+def synthetic_topology(routers, degree, seed):
+    rng = random.Random(seed)
+    ids = [int_to_router_id(0x0A000001 + i) for i in range(routers)]
+    graph = {r: {} for r in ids}
+
+    def link(a, b):
+        cost = rng.uniform(0.01, 1.0)
+        graph[a][b] = cost
+        graph[b][a] = cost
+
+    for i in range(routers):
+        link(ids[i], ids[(i + 1) % routers])
+    for _ in range(routers * (degree - 2) // 2):
+        a, b = rng.sample(ids, 2)
+        link(a, b)
+    return graph
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routers", type=int, default=5000)
+    parser.add_argument("--degree", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    graph = synthetic_topology(args.routers, args.degree, args.seed)
+    root = next(iter(graph))
+    quantized = {u: {v: max(1, round(w * QUANTIZATION_SCALE)) for v, w in e.items()}
+                 for u, e in graph.items()}
+
+    start = time.perf_counter()
+    csr = CSRGraph.from_adjacency(graph)
+    build_ms = (time.perf_counter() - start) * 1000
+    csr_int = CSRGraph.from_adjacency(quantized, integer=True)
+    root_idx = csr.ids.index(root)
+
+    print(f"{args.routers} roteadores, {csr.edge_count} enlaces dirigidos")
+    print(f"  montagem do CSR:         {build_ms:8.2f} ms")
+    print(f"  dict + heapq:            {best_of(lambda: dijkstra(graph, root), args.repeat):8.2f} ms")
+    print(f"  CSR + heapq (float):     {best_of(lambda: spf_csr(csr, root_idx), args.repeat):8.2f} ms")
+    print(f"  CSR + heapq (quantizado):{best_of(lambda: spf_csr(csr_int, root_idx), args.repeat):8.2f} ms")
+    print(f"  CSR + radix (quantizado):"
+          f"{best_of(lambda: spf_csr(csr_int, root_idx, radix=True), args.repeat):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
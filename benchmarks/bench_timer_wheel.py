@@ -0,0 +1,95 @@
+"""Vazão da roda de temporização: inserção, cancelamento e disparo.
+
+Compara com um heap binário (heapq) com cancelamento preguiçoso, a forma
+usual de centralizar timers sem a roda.
+
+    python3 benchmarks/bench_timer_wheel.py [--timers 100000]
+"""
+
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from timer_wheel import TimerWheel  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def noop(*_):
+    pass
+
+
+def bench_wheel(delays, cancel_ratio):
+    clock = FakeClock()
+    wheel = TimerWheel(clock=clock)
+    start = time.perf_counter()
+    timers = [wheel.schedule(d, noop) for d in delays]
+    inserted = time.perf_counter()
+    for timer in timers[:int(len(timers) * cancel_ratio)]:
+        timer.cancel()
+    cancelled = time.perf_counter()
+    clock.now = max(delays) + 1
+    wheel.advance()
+    fired = time.perf_counter()
+    return inserted - start, cancelled - inserted, fired - cancelled, wheel.fired
+
+
+def bench_heap(delays, cancel_ratio):
+    heap = []
+    start = time.perf_counter()
+    entries = []
+    for i, d in enumerate(delays):
+        entry = [d, i, noop]
+        heapq.heappush(heap, entry)
+        entries.append(entry)
+    inserted = time.perf_counter()
+    for entry in entries[:int(len(entries) * cancel_ratio)]:
+        entry[2] = None
+    cancelled = time.perf_counter()
+    count = 0
+    while heap:
+        _, _, callback = heapq.heappop(heap)
+        if callback is not None:
+            callback()
+            count += 1
+    fired = time.perf_counter()
+    return inserted - start, cancelled - inserted, fired - cancelled, count
+
+
+def report(name, n, cancelled, result):
+    insert_s, cancel_s, fire_s, count = result
+    print(f"  {name:6s} inserção {n / insert_s / 1e6:6.2f} M/s   "
+          f"cancelamento {cancelled / cancel_s / 1e6:6.2f} M/s   "
+          f"disparo {count / fire_s / 1e6:6.2f} M/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timers", type=int, default=100000)
+    parser.add_argument("--cancel", type=float, default=0.5,
+                        help="fração cancelada antes de disparar (ex.: dead timers rearmados)")
+    parser.add_argument("--horizon", type=float, default=60.0, help="prazo máximo em segundos")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    delays = [rng.uniform(0, args.horizon) for _ in range(args.timers)]
+    cancelled = int(args.timers * args.cancel)
+    print(f"{args.timers} timers em até {args.horizon:.0f} s, {cancelled} cancelados")
+    report("roda", args.timers, cancelled, bench_wheel(delays, args.cancel))
+    report("heapq", args.timers, cancelled, bench_heap(delays, args.cancel))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Utilitários dos benchmarks que simulam a topologia do `config.json`."""
+
+import os
+import re
+
+from cost_engine import load_config
+
+CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config.json")
+
+
+class Clock:
+    """Relógio falso avançado à mão pela simulação."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def topology(config=None):
+    """Enlaces roteador-roteador do bloco `links`: [((a, b), link)], a < b.
+
+    Os roteadores são os números de "Ra-Rb" na descrição; enlaces de hosts
+    ficam de fora.
+    """
+    config = load_config(CONFIG) if config is None else config
+    edges = []
+    for link in config["links"].values():
+        match = re.fullmatch(r"R(\d+)-R(\d+)", link["description"])
+        if match:
+            edges.append((tuple(sorted(int(g) for g in match.groups())), link))
+    return edges
+
+
+def router_id(n):
+    return f"{n}.{n}.{n}.{n}"
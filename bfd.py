@@ -0,0 +1,384 @@
+"""Detecção rápida de falhas no estilo BFD (RFC 5880/5881) sobre asyncio.
+
+Um único laço asyncio atende todas as sessões: um socket UDP escuta na
+porta 3784 em todas as interfaces e outro, com TTL 255, envia a partir de
+uma porta de origem da faixa 49152-65535. Como exige a RFC 5881 (GTSM,
+seção 5), pacotes recebidos com TTL diferente de 255 são descartados: só um
+vizinho diretamente conectado consegue entregá-los assim, então um host
+fora do enlace não derruba sessões com pacotes forjados.
+
+Cada sessão segue a máquina de estados da RFC 5880 (AdminDown, Down, Init,
+Up) com intervalos de envio e recepção configuráveis (até 10-50 ms) e
+multiplicador de detecção.
+
+Uma sessão Up que fica `detect_mult` intervalos sem receber pacotes (ou cujo
+vizinho sinaliza Down) cai na hora e chama `on_down(sessão)`;
+`reconvergence_handler` monta um `on_down` que derruba a adjacência, aciona
+o FastReroute e dispara o SPF sem esperar o dead interval do OSPF.
+"""
+
+import asyncio
+import logging
+import random
+import socket
+import struct
+import time
+
+log = logging.getLogger(__name__)
+
+BFD_PORT = 3784
+SOURCE_PORTS = range(49152, 65536)
+BFD_VERSION = 1
+GTSM_TTL = 255
+
+# IP_RECVTTL só aparece no módulo socket a partir do Python 3.12; 12 é o
+# valor do Linux. O TTL chega como um int nativo na mensagem de controle.
+IP_RECVTTL = getattr(socket, "IP_RECVTTL", 12)
+_TTL = struct.Struct("=i")
+_RX_BUFSIZE = 512
+_ANC_BUFSIZE = socket.CMSG_SPACE(_TTL.size)
+
+ADMIN_DOWN, DOWN, INIT, UP = range(4)
+STATE_NAMES = ("AdminDown", "Down", "Init", "Up")
+
+# Diagnósticos (RFC 5880, 4.1).
+DIAG_NONE, DIAG_TIME_EXPIRED, DIAG_NEIGHBOR_DOWN, DIAG_ADMIN_DOWN = 0, 1, 3, 7
+
+FLAG_POLL, FLAG_FINAL = 0x20, 0x10
+
+# vers|diag, estado|flags, mult, tamanho, discriminadores e intervalos (µs).
+CONTROL = struct.Struct("!BBBBIIIII")
+
+# Fora do estado Up o envio é no máximo 1 por segundo (RFC 5880, 6.8.3).
+SLOW_TX_US = 1_000_000
+
+DEFAULT_TX_MS = 50
+DEFAULT_RX_MS = 50
+DEFAULT_MULTIPLIER = 3
+
+
+def bfd_settings(config):
+    block = config.get("bfd") or {}
+    return (bool(block.get("enabled", False)),
+            int(block.get("desired_min_tx_ms", DEFAULT_TX_MS)),
+            int(block.get("required_min_rx_ms", DEFAULT_RX_MS)),
+            int(block.get("detect_multiplier", DEFAULT_MULTIPLIER)))
+
+
+def encode_control(state, diag, flags, mult, my_disc, your_disc, min_tx_us, min_rx_us):
+    return CONTROL.pack((BFD_VERSION << 5) | diag, (state << 6) | flags, mult, CONTROL.size,
+                        my_disc, your_disc, min_tx_us, min_rx_us, 0)
+
+
+def decode_control(data):
+    """Campos de um pacote de controle, ou None se inválido (RFC 5880, 6.8.6)."""
+    if len(data) < CONTROL.size:
+        return None
+    vers_diag, state_flags, mult, length, my_disc, your_disc, min_tx, min_rx, _ = \
+        CONTROL.unpack_from(data)
+    if vers_diag >> 5 != BFD_VERSION or length < CONTROL.size or length > len(data):
+        return None
+    if mult == 0 or my_disc == 0:
+        return None
+    state = state_flags >> 6
+    if your_disc == 0 and state not in (DOWN, ADMIN_DOWN):
+        return None
+    return state, vers_diag & 0x1F, state_flags & 0x3F, mult, my_disc, your_disc, min_tx, min_rx
+
+
+class Session:
+    """Sessão BFD com um vizinho (endereço IP na interface compartilhada)."""
+
+    def __init__(self, service, peer, interface=None, neighbor=None, tx_ms=DEFAULT_TX_MS,
+                 rx_ms=DEFAULT_RX_MS, multiplier=DEFAULT_MULTIPLIER, port=BFD_PORT):
+        self.service = service
+        self.peer = peer
+        self.port = port
+        self.interface = interface
+        self.neighbor = neighbor
+        self.desired_min_tx_us = tx_ms * 1000
+        self.required_min_rx_us = rx_ms * 1000
+        self.multiplier = multiplier
+
+        self.state = DOWN
+        self.diag = DIAG_NONE
+        self.local_disc = service.new_discriminator()
+        self.remote_disc = 0
+        self.remote_state = DOWN
+        self.remote_min_tx_us = 0
+        self.remote_min_rx_us = 1
+        self.remote_mult = 0
+        self._poll = False
+        self._tx_handle = None
+        self._detect_handle = None
+
+        # Instrumentação.
+        self.sent = 0
+        self.received = 0
+        self.flaps = 0
+        self.last_change = None
+
+    def __repr__(self):
+        return f"Session({self.peer}, {STATE_NAMES[self.state]})"
+
+    @property
+    def tx_interval_s(self):
+        desired = self.desired_min_tx_us if self.state == UP else max(self.desired_min_tx_us,
+                                                                       SLOW_TX_US)
+        return max(desired, self.remote_min_rx_us) / 1e6
+
+    @property
+    def detection_time_s(self):
+        return self.remote_mult * max(self.required_min_rx_us, self.remote_min_tx_us) / 1e6
+
+    def start(self):
+        self._schedule_tx(0)
+
+    def stop(self):
+        for handle in (self._tx_handle, self._detect_handle):
+            if handle is not None:
+                handle.cancel()
+        self._tx_handle = self._detect_handle = None
+
+    def _schedule_tx(self, delay_s=None):
+        if self._tx_handle is not None:
+            self._tx_handle.cancel()
+        if delay_s is None:
+            # Jitter de 0-25% para baixo (10-25% com multiplicador 1).
+            delay_s = self.tx_interval_s * random.uniform(0.75, 1.0 if self.multiplier > 1
+                                                          else 0.9)
+        self._tx_handle = self.service.loop.call_later(delay_s, self._periodic)
+
+    def _periodic(self):
+        self._schedule_tx()
+        # Um vizinho com RequiredMinRx 0 não quer pacotes periódicos.
+        if not (self.remote_min_rx_us == 0 and self.state == UP):
+            self._transmit(FLAG_POLL if self._poll else 0)
+
+    def _transmit(self, flags=0):
+        tx_us = self.desired_min_tx_us if self.state == UP else max(self.desired_min_tx_us,
+                                                                    SLOW_TX_US)
+        packet = encode_control(self.state, self.diag, flags, self.multiplier, self.local_disc,
+                                self.remote_disc, tx_us, self.required_min_rx_us)
+        self.service.send(packet, (self.peer, self.port))
+        self.sent += 1
+
+    def receive(self, fields):
+        state, diag, flags, mult, my_disc, _, min_tx, min_rx = fields
+        self.received += 1
+        self.remote_disc = my_disc
+        self.remote_state = state
+        self.remote_min_tx_us = min_tx
+        self.remote_min_rx_us = min_rx
+        self.remote_mult = mult
+        if flags & FLAG_FINAL:
+            self._poll = False
+
+        if state == ADMIN_DOWN:
+            if self.state != DOWN:
+                self._set_state(DOWN, DIAG_NEIGHBOR_DOWN)
+        elif self.state == DOWN:
+            if state == DOWN:
+                self._set_state(INIT)
+            elif state == INIT:
+                self._set_state(UP)
+        elif self.state == INIT:
+            if state in (INIT, UP):
+                self._set_state(UP)
+        elif self.state == UP and state == DOWN:
+            self._set_state(DOWN, DIAG_NEIGHBOR_DOWN)
+
+        if flags & FLAG_POLL:
+            self._transmit(FLAG_FINAL)
+        if self.state in (INIT, UP):
+            self._arm_detection()
+
+    def _arm_detection(self):
+        if self._detect_handle is not None:
+            self._detect_handle.cancel()
+        self._detect_handle = self.service.loop.call_later(self.detection_time_s, self._expired)
+
+    def _expired(self):
+        self._detect_handle = None
+        if self.state in (INIT, UP):
+            self._set_state(DOWN, DIAG_TIME_EXPIRED)
+
+    def _set_state(self, state, diag=DIAG_NONE):
+        old, self.state = self.state, state
+        self.diag = diag
+        self.last_change = time.monotonic()
+        if state == DOWN:
+            self.remote_disc = 0
+            if self._detect_handle is not None:
+                self._detect_handle.cancel()
+                self._detect_handle = None
+        if state == UP:
+            # Passou ao intervalo rápido: confirma com uma sequência de poll.
+            self._poll = True
+            self._schedule_tx(0)
+        log.info("BFD %s: %s -> %s", self.peer, STATE_NAMES[old], STATE_NAMES[state])
+        self.service.state_changed(self, old, state)
+
+
+def received_ttl(ancdata):
+    """TTL de um datagrama a partir dos dados auxiliares de `recvmsg`."""
+    for level, kind, value in ancdata:
+        if level == socket.IPPROTO_IP and kind == socket.IP_TTL and len(value) >= _TTL.size:
+            return _TTL.unpack_from(value)[0]
+    return None
+
+
+class BFDService:
+    """Todas as sessões BFD do roteador num único laço asyncio.
+
+    `on_down(sessão)` é chamado quando uma sessão sai de Up; `on_up(sessão)`,
+    quando entra.
+    """
+
+    def __init__(self, on_down=None, on_up=None, tx_ms=DEFAULT_TX_MS, rx_ms=DEFAULT_RX_MS,
+                 multiplier=DEFAULT_MULTIPLIER, listen=("0.0.0.0", BFD_PORT)):
+        self.on_down = on_down
+        self.on_up = on_up
+        self.tx_ms = tx_ms
+        self.rx_ms = rx_ms
+        self.multiplier = multiplier
+        self.listen = listen
+        self.loop = None
+        self.sessions = {}
+        self._by_disc = {}
+        self._rx_sock = None
+        self._tx_sock = None
+        self.dropped = 0
+        self.dropped_ttl = 0
+
+    @classmethod
+    def from_config(cls, config, on_down=None, on_up=None, **kwargs):
+        _, tx_ms, rx_ms, multiplier = bfd_settings(config)
+        return cls(on_down, on_up, tx_ms, rx_ms, multiplier, **kwargs)
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self._rx_sock = self._open_rx_socket()
+        self.loop.add_reader(self._rx_sock.fileno(), self._read_ready)
+        self._tx_sock = self._open_tx_socket()
+
+    def _open_rx_socket(self):
+        # O DatagramProtocol do asyncio não entrega dados auxiliares; o TTL
+        # exige recvmsg direto no socket.
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.setsockopt(socket.IPPROTO_IP, IP_RECVTTL, 1)
+        sock.setblocking(False)
+        try:
+            sock.bind(self.listen)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _read_ready(self):
+        while True:
+            try:
+                data, ancdata, _, addr = self._rx_sock.recvmsg(_RX_BUFSIZE, _ANC_BUFSIZE)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                log.debug("BFD recepção falhou: %s", e)
+                return
+            self.datagram_received(data, addr, received_ttl(ancdata))
+
+    def _open_tx_socket(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, 255)
+        sock.setblocking(False)
+        for port in random.sample(SOURCE_PORTS, 64):
+            try:
+                sock.bind((self.listen[0], port))
+                return sock
+            except OSError:
+                continue
+        sock.close()
+        raise OSError("nenhuma porta de origem BFD livre")
+
+    def close(self):
+        for session in self.sessions.values():
+            session.stop()
+        if self._rx_sock is not None:
+            if self.loop is not None:
+                self.loop.remove_reader(self._rx_sock.fileno())
+            self._rx_sock.close()
+        if self._tx_sock is not None:
+            self._tx_sock.close()
+
+    def new_discriminator(self):
+        while True:
+            disc = random.getrandbits(32)
+            if disc and disc not in self._by_disc:
+                return disc
+
+    def add_session(self, peer, interface=None, neighbor=None, port=BFD_PORT):
+        """Cria (ou devolve) a sessão com `peer`; `neighbor` é o ROUTER_ID."""
+        session = self.sessions.get(peer)
+        if session is None:
+            session = Session(self, peer, interface, neighbor, self.tx_ms, self.rx_ms,
+                              self.multiplier, port)
+            self.sessions[peer] = session
+            self._by_disc[session.local_disc] = session
+            session.start()
+        return session
+
+    def remove_session(self, peer):
+        """Encerra administrativamente: avisa o vizinho com AdminDown."""
+        session = self.sessions.pop(peer, None)
+        if session is not None:
+            session.state = ADMIN_DOWN
+            session.diag = DIAG_ADMIN_DOWN
+            session.stop()
+            session._transmit()
+            self._by_disc.pop(session.local_disc, None)
+
+    def send(self, packet, addr):
+        try:
+            self._tx_sock.sendto(packet, addr)
+        except (BlockingIOError, OSError) as e:
+            self.dropped += 1
+            log.debug("BFD envio para %s falhou: %s", addr[0], e)
+
+    def datagram_received(self, data, addr, ttl):
+        """Processa um pacote de controle; `ttl` é o TTL IP com que chegou."""
+        if ttl != GTSM_TTL:
+            # GTSM (RFC 5881, 5): sem TTL 255 o pacote não veio do enlace.
+            self.dropped_ttl += 1
+            return
+        fields = decode_control(data)
+        if fields is None:
+            self.dropped += 1
+            return
+        your_disc = fields[5]
+        session = self._by_disc.get(your_disc) if your_disc else self.sessions.get(addr[0])
+        if session is None:
+            self.dropped += 1
+            return
+        session.receive(fields)
+
+    def state_changed(self, session, old, new):
+        if old == UP and new != UP:
+            session.flaps += 1
+            if self.on_down is not None:
+                self.on_down(session)
+        elif new == UP and self.on_up is not None:
+            self.on_up(session)
+
+
+def reconvergence_handler(spf_scheduler, fast_reroute=None, adjacency_down=None):
+    """Callback `on_down` que derruba a adjacência (`adjacency_down(vizinho)`),
+    aplica os backups do FastReroute e dispara o SPF (spf_scheduler)."""
+    def on_down(session):
+        if adjacency_down is not None:
+            adjacency_down(session.neighbor)
+        if fast_reroute is not None and session.neighbor is not None:
+            fast_reroute.neighbor_down(session.neighbor, detected_at=session.last_change)
+        spf_scheduler.trigger("bfd_down")
+    return on_down
@@ -0,0 +1,155 @@
+"""Rastreamento de enlaces "sujos" com histerese.
+
+As medições de latência, jitter e perda mudam o tempo todo; só vale a pena
+recalcular o SPF quando o custo composto de um enlace se move além de um
+limiar absoluto e relativo. Enlaces que acabaram de mudar ficam em hold-down:
+novas mudanças são adiadas até o fim do período, o que segura o flap do termo
+de jitter.
+"""
+
+import time
+
+from cost_engine import METRIC_FIELDS
+
+DEFAULT_ABSOLUTE = 0.01
+DEFAULT_RELATIVE = 0.05
+DEFAULT_HOLD_DOWN_S = 5.0
+DEFAULT_RECOST_INTERVAL_S = 1.0
+
+
+class CostChangeTracker:
+    """Guarda o custo anunciado de cada enlace e decide quando ele muda.
+
+    O custo anunciado é o que o SPF enxerga. Ele só é atualizado quando o novo
+    custo difere do anunciado em mais de `absolute` *e* em mais de `relative`
+    vezes o valor anunciado (use 0 para desligar um dos limiares). `absolute`
+    é sempre expresso na escala [0, 1]; no modo de métrica inteira ele é
+    convertido para a escala da métrica.
+
+    Medições podem ser parciais (os hellos não medem banda). Um enlace que o
+    engine ainda não conhece é criado a partir de `defaults` ({chave:
+    métricas}, o bloco `links` no `from_config`) com a medição por cima; sem
+    defaults e sem as quatro métricas, a medição é descartada (`skipped`).
+    """
+
+    def __init__(self, engine, absolute=DEFAULT_ABSOLUTE, relative=DEFAULT_RELATIVE,
+                 hold_down_s=DEFAULT_HOLD_DOWN_S, clock=time.monotonic, defaults=None):
+        self.engine = engine
+        self.absolute = float(absolute)
+        self._absolute_units = self.absolute * (engine.metric_scale or 1.0)
+        self.relative = float(relative)
+        self.hold_down_s = float(hold_down_s)
+        self._clock = clock
+        self._advertised = {}
+        self._last_change = {}
+        self._pending = set()
+        self._defaults = {key: {f: link[f] for f in METRIC_FIELDS}
+                          for key, link in (defaults or {}).items()}
+        # Contadores para instrumentação.
+        self.skipped = 0
+        self.suppressed = 0
+        self.deferred = 0
+        self.changed = 0
+
+        for key in engine.keys():
+            self._advertised[key] = engine.cost(key)
+
+    @classmethod
+    def from_config(cls, engine, config, **kwargs):
+        block = config.get("cost_hysteresis", {})
+        return cls(engine,
+                   absolute=block.get("absolute", DEFAULT_ABSOLUTE),
+                   relative=block.get("relative", DEFAULT_RELATIVE),
+                   hold_down_s=block.get("hold_down_s", DEFAULT_HOLD_DOWN_S),
+                   defaults=config.get("links"), **kwargs)
+
+    def record(self, key, **metrics):
+        """Registra uma medição (parcial ou completa); o enlace só é
+        re-custeado no `recost`. Retorna False se ela foi descartada."""
+        if key not in self.engine:
+            full = {**self._defaults.get(key, {}), **metrics}
+            if any(f not in full for f in METRIC_FIELDS):
+                self.skipped += 1
+                return False
+            self.engine.add_link(key, **{f: full[f] for f in METRIC_FIELDS})
+        else:
+            self.engine.update_link(key, **metrics)
+        self._pending.add(key)
+        return True
+
+    def forget(self, key):
+        self.engine.remove_link(key)
+        self._advertised.pop(key, None)
+        self._last_change.pop(key, None)
+        self._pending.discard(key)
+
+    def advertised_cost(self, key):
+        return self._advertised[key]
+
+    def advertised(self):
+        return dict(self._advertised)
+
+    def has_pending(self):
+        return bool(self._pending)
+
+    def _significant(self, old, new):
+        delta = abs(new - old)
+        return delta > self._absolute_units and delta > self.relative * abs(old)
+
+    def recost(self, now=None):
+        """Re-custeia só os enlaces com medições novas.
+
+        Retorna a lista de enlaces cujo custo anunciado mudou (vazia quando
+        nada precisa de SPF). Mudanças em hold-down continuam pendentes.
+        """
+        if not self._pending:
+            return []
+        now = self._clock() if now is None else now
+        keys = list(self._pending)
+        costs = self.engine.recompute([self.engine.index_of(k) for k in keys])
+
+        dirty = []
+        still_pending = set()
+        for key, cost in zip(keys, costs.tolist()):
+            old = self._advertised.get(key)
+            if old is not None and not self._significant(old, cost):
+                self.suppressed += 1
+                continue
+            last = self._last_change.get(key)
+            if old is not None and last is not None and now - last < self.hold_down_s:
+                self.deferred += 1
+                still_pending.add(key)
+                continue
+            self._advertised[key] = cost
+            self._last_change[key] = now
+            dirty.append(key)
+
+        self._pending = still_pending
+        self.changed += len(dirty)
+        return dirty
+
+
+class RecostScheduler:
+    """Re-custeia periodicamente os enlaces pendentes e avisa quem roda o SPF.
+
+    O laço principal do daemon chama `poll()`; `on_dirty` recebe a lista de
+    enlaces cujo custo anunciado mudou.
+    """
+
+    def __init__(self, tracker, on_dirty, interval_s=DEFAULT_RECOST_INTERVAL_S,
+                 clock=time.monotonic):
+        self.tracker = tracker
+        self.on_dirty = on_dirty
+        self.interval_s = float(interval_s)
+        self._clock = clock
+        self._next_run = clock()
+
+    def poll(self, now=None):
+        now = self._clock() if now is None else now
+        if now < self._next_run:
+            return []
+        self._next_run = now + self.interval_s
+        dirty = self.tracker.recost(now)
+        if dirty:
+            self.on_dirty(dirty)
+        return dirty
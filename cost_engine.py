@@ -0,0 +1,278 @@
+"""Motor de custo composto vetorizado.
+
+Mantém as métricas de todos os enlaces conhecidos (largura de banda, latência,
+perda e jitter) em arrays NumPy contíguos e recalcula todos os custos
+
+    Custo(L) = α⋅BW_norm + β⋅Lat_norm + γ⋅Loss_norm + δ⋅Jitter_norm
+
+em uma única chamada (saturação, normalização e ponderação), sem laços Python
+por enlace.
+
+Opcionalmente (bloco `metric` do config.json) o custo em [0, 1] é mapeado
+para uma métrica inteira de ponto fixo de 16 ou 24 bits, no estilo do OSPF,
+que passa a ser o custo usado no SPF e anunciado nos LSAs.
+"""
+
+import json
+
+import numpy as np
+
+# Ordem das linhas na matriz de métricas.
+METRIC_FIELDS = ("bandwidth_mbps", "latency_ms", "packet_loss_percent", "jitter_ms")
+WEIGHT_KEYS = ("alpha", "beta", "gamma", "delta")
+
+# (bloco em "normalization", chave do mínimo, chave do máximo) para cada métrica.
+_NORMALIZATION_KEYS = (
+    ("bandwidth", "min_mbps", "max_mbps"),
+    ("latency", "min_ms", "max_ms"),
+    ("packet_loss", "min_percent", "max_percent"),
+    ("jitter", "min_ms", "max_ms"),
+)
+
+_INITIAL_CAPACITY = 64
+
+# Larguras de métrica do OSPF: 16 bits nos router-LSAs, 24 nos summary/external.
+METRIC_BITS = (16, 24)
+DEFAULT_METRIC_BITS = 16
+
+
+def load_config(path="config.json"):
+    with open(path) as f:
+        return json.load(f)
+
+
+def weights_vector(cost_weights):
+    """Converte o bloco `cost_weights` em um vetor (α, β, γ, δ)."""
+    try:
+        return np.array([float(cost_weights[k]) for k in WEIGHT_KEYS])
+    except KeyError as e:
+        raise ValueError(f"cost_weights sem o peso {e.args[0]!r}") from None
+
+
+def normalization_bounds(normalization):
+    """Retorna os vetores (mínimos, máximos) na ordem de METRIC_FIELDS."""
+    lower, upper = [], []
+    for block, min_key, max_key in _NORMALIZATION_KEYS:
+        lo = float(normalization[block][min_key])
+        hi = float(normalization[block][max_key])
+        if hi <= lo:
+            raise ValueError(f"normalização inválida para {block!r}: max <= min")
+        lower.append(lo)
+        upper.append(hi)
+    return np.array(lower), np.array(upper)
+
+
+def quantize(cost, scale, bits=DEFAULT_METRIC_BITS):
+    """Mapeia um custo em [0, 1] para a métrica inteira em [1, 2**bits - 1]."""
+    return min(max(int(round(cost * scale)), 1), (1 << bits) - 1)
+
+
+def quantize_array(costs, scale, bits=DEFAULT_METRIC_BITS):
+    """Versão vetorizada de `quantize`; retorna um array uint32."""
+    q = np.rint(np.asarray(costs) * scale)
+    np.clip(q, 1, (1 << bits) - 1, out=q)
+    return q.astype(np.uint32)
+
+
+def composite_costs(metrics, weights, lower, upper, out=None, scratch=None):
+    """Custos de uma matriz (4, n) de métricas com pesos e limites arbitrários.
+
+    Única implementação da fórmula (saturação, normalização, inversão da
+    banda e ponderação): o CostEngine e o SPF por perfil a usam. `out` e
+    `scratch` (formato (4, n)) evitam alocações no recálculo completo.
+    """
+    lower = np.asarray(lower).reshape(-1, 1)
+    upper = np.asarray(upper).reshape(-1, 1)
+    norm = np.clip(metrics, lower, upper, out=scratch)
+    norm -= lower
+    norm /= upper - lower
+    # Mais banda é melhor: o termo de banda é invertido.
+    np.subtract(1.0, norm[0], out=norm[0])
+    return np.dot(weights, norm, out=out)
+
+
+def metric_settings(config):
+    """Lê o bloco `metric`; retorna (bits, escala) ou None para custo float."""
+    block = config.get("metric") or {}
+    if not block.get("integer", False):
+        return None
+    bits = int(block.get("bits", DEFAULT_METRIC_BITS))
+    if bits not in METRIC_BITS:
+        raise ValueError(f"metric.bits deve ser um de {METRIC_BITS}")
+    scale = float(block.get("scale", (1 << bits) - 1))
+    if not 0 < scale <= (1 << bits) - 1:
+        raise ValueError("metric.scale fora do intervalo da métrica")
+    return bits, scale
+
+
+class CostEngine:
+    """Tabela de enlaces com recálculo de custos em lote.
+
+    Cada enlace é identificado por uma chave arbitrária (o prefixo do bloco
+    `links`, ou o par de ROUTER_IDs vindo do LSDB) e ocupa uma coluna da matriz
+    de métricas. As colunas são compactadas na remoção, de modo que os
+    primeiros `len(engine)` elementos estão sempre ocupados; `layout_version`
+    conta as remoções, as únicas operações que mudam a coluna de um enlace.
+
+    Com `metric=(bits, escala)` os custos expostos por `costs`, `cost` e
+    `as_dict` são inteiros; o valor float continua em `raw_costs`.
+    """
+
+    def __init__(self, cost_weights, normalization, capacity=_INITIAL_CAPACITY,
+                 metric=None):
+        self._weights = weights_vector(cost_weights)
+        lower, upper = normalization_bounds(normalization)
+        # Formato (4, 1) para fazer broadcast sobre as colunas.
+        self._lower = lower[:, None]
+        self._upper = upper[:, None]
+
+        capacity = max(int(capacity), 1)
+        self._metrics = np.zeros((len(METRIC_FIELDS), capacity))
+        self._scratch = np.empty_like(self._metrics)
+        self._costs = np.zeros(capacity)
+        self._keys = []
+        self._index = {}
+        self.layout_version = 0
+
+        self.metric_bits, self.metric_scale = metric if metric else (None, None)
+        self._metric = np.ones(capacity, dtype=np.uint32)
+
+    @classmethod
+    def from_config(cls, config):
+        engine = cls(config["cost_weights"], config["normalization"],
+                     capacity=max(len(config.get("links", {})), _INITIAL_CAPACITY),
+                     metric=metric_settings(config))
+        for key, link in config.get("links", {}).items():
+            engine.add_link(key, **{f: link[f] for f in METRIC_FIELDS})
+        engine.recompute()
+        return engine
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def keys(self):
+        return list(self._keys)
+
+    def index_of(self, key):
+        return self._index[key]
+
+    @property
+    def integer(self):
+        return self.metric_scale is not None
+
+    @property
+    def weights(self):
+        return dict(zip(WEIGHT_KEYS, self._weights.tolist()))
+
+    def set_weights(self, cost_weights):
+        self._weights = weights_vector(cost_weights)
+
+    def _grow(self):
+        capacity = self._metrics.shape[1] * 2
+        metrics = np.zeros((len(METRIC_FIELDS), capacity))
+        metrics[:, :len(self)] = self._metrics[:, :len(self)]
+        costs = np.zeros(capacity)
+        costs[:len(self)] = self._costs[:len(self)]
+        metric = np.ones(capacity, dtype=np.uint32)
+        metric[:len(self)] = self._metric[:len(self)]
+        self._metrics = metrics
+        self._scratch = np.empty_like(metrics)
+        self._costs = costs
+        self._metric = metric
+
+    def add_link(self, key, bandwidth_mbps, latency_ms, packet_loss_percent, jitter_ms):
+        """Adiciona (ou sobrescreve) um enlace e retorna sua coluna."""
+        idx = self._index.get(key)
+        if idx is None:
+            if len(self) == self._metrics.shape[1]:
+                self._grow()
+            idx = len(self)
+            self._keys.append(key)
+            self._index[key] = idx
+        self._metrics[:, idx] = (bandwidth_mbps, latency_ms, packet_loss_percent, jitter_ms)
+        return idx
+
+    def update_link(self, key, **metrics):
+        """Atualiza parcialmente as métricas medidas de um enlace."""
+        idx = self._index[key]
+        for field, value in metrics.items():
+            self._metrics[METRIC_FIELDS.index(field), idx] = value
+        return idx
+
+    def update_many(self, indices, values):
+        """Atualiza várias colunas de uma vez; `values` tem formato (4, len(indices))."""
+        self._metrics[:, indices] = values
+
+    def remove_link(self, key):
+        """Remove um enlace movendo a última coluna para o lugar dele."""
+        idx = self._index.pop(key)
+        self.layout_version += 1
+        last = len(self) - 1
+        if idx != last:
+            moved = self._keys[last]
+            self._metrics[:, idx] = self._metrics[:, last]
+            self._costs[idx] = self._costs[last]
+            self._metric[idx] = self._metric[last]
+            self._keys[idx] = moved
+            self._index[moved] = idx
+        self._keys.pop()
+
+    def metrics(self, key):
+        return dict(zip(METRIC_FIELDS, self._metrics[:, self._index[key]].tolist()))
+
+    def metrics_view(self):
+        """Visão (4, n) das métricas ocupadas; não copie se for só leitura."""
+        return self._metrics[:, :len(self)]
+
+    def recompute(self, indices=None):
+        """Recalcula os custos de todos os enlaces (ou só de `indices`).
+
+        Retorna os custos recalculados (inteiros no modo de métrica inteira).
+        """
+        n = len(self)
+        if indices is None:
+            composite_costs(self._metrics[:, :n], self._weights, self._lower, self._upper,
+                            out=self._costs[:n], scratch=self._scratch[:, :n])
+            if self.integer:
+                self._metric[:n] = self._quantize(self._costs[:n])
+            return self.costs()
+
+        indices = np.asarray(indices, dtype=np.intp)
+        costs = composite_costs(self._metrics[:, indices], self._weights,
+                                self._lower, self._upper)
+        self._costs[indices] = costs
+        if self.integer:
+            quantized = self._quantize(costs)
+            self._metric[indices] = quantized
+            return quantized
+        return costs
+
+    def _quantize(self, costs):
+        return quantize_array(costs, self.metric_scale, self.metric_bits)
+
+    @property
+    def bounds(self):
+        """Limites de normalização (mínimos, máximos) na ordem de METRIC_FIELDS."""
+        return self._lower[:, 0].copy(), self._upper[:, 0].copy()
+
+    def costs(self):
+        """Visão dos custos calculados no último `recompute`."""
+        if self.integer:
+            return self._metric[:len(self)]
+        return self._costs[:len(self)]
+
+    def raw_costs(self):
+        """Custos float em [0, 1], mesmo no modo de métrica inteira."""
+        return self._costs[:len(self)]
+
+    def cost(self, key):
+        idx = self._index[key]
+        if self.integer:
+            return int(self._metric[idx])
+        return float(self._costs[idx])
+
+    def as_dict(self):
+        return dict(zip(self._keys, self.costs().tolist()))
@@ -0,0 +1,134 @@
+"""Caminho mínimo com restrições (CSPF) para o tráfego de jogos.
+
+Em vez de só minimizar a soma ponderada, encontra o caminho de menor custo
+cuja latência fim a fim fica abaixo de um limite e cuja banda de gargalo fica
+acima de um piso, usando as métricas brutas do bloco `links` (ms e Mbps), não
+as normalizadas.
+
+A restrição de banda é tratada podando os enlaces abaixo do piso. A de
+latência usa um algoritmo de label-setting: rótulos (custo, latência) saem do
+heap em ordem de custo e um rótulo só é útil se sua latência for menor que a
+de todos os rótulos já fixados no mesmo nó (os demais são dominados). Rótulos
+que estouram o limite de latência são descartados na criação.
+"""
+
+import heapq
+from collections import namedtuple
+
+from cost_engine import METRIC_FIELDS
+from spf import forwarding_path
+
+DEFAULT_RULE_PRIORITY = 900
+
+Constraint = namedtuple("Constraint",
+                        "name max_latency_ms min_bandwidth_mbps table dscp fwmark priority")
+
+_BANDWIDTH = METRIC_FIELDS.index("bandwidth_mbps")
+_LATENCY = METRIC_FIELDS.index("latency_ms")
+
+
+def load_constraint(config):
+    """Lê o bloco `constrained_routing`; None se ele não existir."""
+    block = config.get("constrained_routing")
+    if not block:
+        return None
+    return Constraint(
+        name="constrained",
+        max_latency_ms=float(block["max_latency_ms"]),
+        min_bandwidth_mbps=float(block.get("min_bandwidth_mbps", 0.0)),
+        table=int(block["table"]),
+        dscp=block.get("dscp"),
+        fwmark=block.get("fwmark"),
+        priority=int(block.get("priority", DEFAULT_RULE_PRIORITY)),
+    )
+
+
+def constrained_graph(adjacency, engine, min_bandwidth_mbps=0.0):
+    """Monta `graph[u][v] = (custo, latência_ms)` podando enlaces sem banda.
+
+    `adjacency[u][v]` é a chave do enlace u -> v no `CostEngine`.
+    """
+    costs = engine.costs()
+    metrics = engine.metrics_view()
+    graph = {}
+    for u, edges in adjacency.items():
+        out = graph.setdefault(u, {})
+        for v, key in edges.items():
+            idx = engine.index_of(key)
+            if metrics[_BANDWIDTH, idx] < min_bandwidth_mbps:
+                continue
+            out[v] = (costs[idx].item(), float(metrics[_LATENCY, idx]))
+    return graph
+
+
+def cspf_tree(graph, root, max_latency_ms):
+    """Melhor caminho viável da raiz para cada destino.
+
+    Retorna {destino: (custo, latência, caminho)}, com o caminho como lista de
+    nós começando na raiz.
+    """
+    # Rótulos em listas paralelas; o pai permite reconstruir o caminho.
+    label_node = [root]
+    label_parent = [-1]
+    heap = [(0, 0.0, 0)]
+    best_latency = {}
+    result = {}
+    while heap:
+        cost, latency, label = heapq.heappop(heap)
+        node = label_node[label]
+        if latency >= best_latency.get(node, float("inf")):
+            continue
+        best_latency[node] = latency
+        if node not in result:
+            result[node] = (cost, latency, label)
+        for v, (w, lat) in graph.get(node, {}).items():
+            nl = latency + lat
+            if nl > max_latency_ms or nl >= best_latency.get(v, float("inf")):
+                continue
+            label_node.append(v)
+            label_parent.append(label)
+            heapq.heappush(heap, (cost + w, nl, len(label_node) - 1))
+
+    tree = {}
+    for node, (cost, latency, label) in result.items():
+        path = []
+        while label >= 0:
+            path.append(label_node[label])
+            label = label_parent[label]
+        path.reverse()
+        tree[node] = (cost, latency, path)
+    return tree
+
+
+def constrained_rib(graph, root, max_latency_ms):
+    """RIB do modo restrito: {destino: (primeiro salto, custo)}.
+
+    Caminhos restritos não têm subcaminhos ótimos, então o próximo roteador
+    pode escolher outro caminho para o mesmo destino. Como o encaminhamento é
+    salto a salto, o caminho efetivo é simulado com as árvores dos roteadores
+    seguintes (calculadas sob demanda, uma por roteador visitado). Destinos
+    cujo caminho efetivo forma laço ou estoura a latência ficam de fora e
+    seguem pela tabela normal.
+    """
+    trees = {root: cspf_tree(graph, root, max_latency_ms)}
+
+    def tree(router):
+        if router not in trees:
+            trees[router] = cspf_tree(graph, router, max_latency_ms)
+        return trees[router]
+
+    def next_hop(router, dest):
+        entry = tree(router).get(dest)
+        return entry[2][1] if entry is not None else None
+
+    rib = {}
+    for dest, (cost, _, path) in trees[root].items():
+        if dest == root:
+            continue
+        effective = forwarding_path(root, dest, next_hop)
+        if effective is None:
+            continue
+        latency = sum(graph[u][v][1] for u, v in zip(effective, effective[1:]))
+        if latency <= max_latency_ms:
+            rib[dest] = (path[1], cost)
+    return rib
@@ -0,0 +1,124 @@
+"""Grafo em formato CSR (compressed sparse row) para o SPF.
+
+Os ROUTER_IDs ("1.1.1.1") são mapeados para índices int32 densos e as
+adjacências ficam em três arrays contíguos: `offsets` (n + 1 posições),
+`targets` e `costs`. Os vizinhos de `u` são `targets[offsets[u]:offsets[u+1]]`.
+"""
+
+import socket
+import struct
+from array import array
+
+_IPV4 = struct.Struct("!I")
+
+
+def router_id_to_int(router_id):
+    """Converte um ROUTER_ID em notação de ponto para um inteiro de 32 bits."""
+    return _IPV4.unpack(socket.inet_aton(router_id))[0]
+
+
+def int_to_router_id(value):
+    return socket.inet_ntoa(_IPV4.pack(value))
+
+
+class RouterIdMap:
+    """Interna ROUTER_IDs em índices densos 0..n-1."""
+
+    def __init__(self, router_ids=()):
+        self._index = {}
+        self._ids = []
+        for router_id in router_ids:
+            self.intern(router_id)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, router_id):
+        return router_id in self._index
+
+    def intern(self, router_id):
+        idx = self._index.get(router_id)
+        if idx is None:
+            idx = self._index[router_id] = len(self._ids)
+            self._ids.append(router_id)
+        return idx
+
+    def index(self, router_id):
+        return self._index[router_id]
+
+    def router_id(self, idx):
+        return self._ids[idx]
+
+    def router_ids(self):
+        return list(self._ids)
+
+
+class CSRGraph:
+    """Grafo dirigido imutável em CSR.
+
+    `costs` usa floats ('d') ou, para custos quantizados, inteiros sem sinal
+    de 32 bits ('I').
+    """
+
+    __slots__ = ("ids", "offsets", "targets", "costs")
+
+    def __init__(self, ids, offsets, targets, costs):
+        self.ids = ids
+        self.offsets = offsets
+        self.targets = targets
+        self.costs = costs
+
+    @property
+    def integer_costs(self):
+        return self.costs.typecode == "I"
+
+    @classmethod
+    def from_edges(cls, ids, edges, integer=False):
+        """Monta o grafo a partir de (u, v, custo) com u e v já internados."""
+        n = len(ids)
+        degree = [0] * (n + 1)
+        edges = list(edges)
+        for u, _, _ in edges:
+            degree[u + 1] += 1
+        for i in range(n):
+            degree[i + 1] += degree[i]
+        offsets = array("i", degree)
+
+        fill = degree[:-1]
+        targets = array("i", bytes(4 * len(edges)))
+        costs = array("I" if integer else "d", [0] * len(edges))
+        for u, v, w in edges:
+            pos = fill[u]
+            targets[pos] = v
+            costs[pos] = w
+            fill[u] = pos + 1
+        return cls(ids, offsets, targets, costs)
+
+    @classmethod
+    def from_adjacency(cls, graph, ids=None, integer=False):
+        """Converte o dicionário `graph[u][v] = custo` montado dos LSAs."""
+        ids = RouterIdMap() if ids is None else ids
+        edges = []
+        for u, neighbors in graph.items():
+            ui = ids.intern(u)
+            for v, w in neighbors.items():
+                edges.append((ui, ids.intern(v), w))
+        return cls.from_edges(ids, edges, integer=integer)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def edge_count(self):
+        return len(self.targets)
+
+    def neighbors(self, u):
+        start, end = self.offsets[u], self.offsets[u + 1]
+        return zip(self.targets[start:end], self.costs[start:end])
+
+    def to_adjacency(self):
+        graph = {}
+        for u in range(len(self)):
+            graph[self.ids.router_id(u)] = {
+                self.ids.router_id(v): w for v, w in self.neighbors(u)}
+        return graph
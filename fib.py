@@ -0,0 +1,234 @@
+"""Instalação das rotas calculadas nas tabelas do kernel via pyroute2.
+
+O pyroute2 só é importado por quem fala netlink (KernelFib e
+install_policy_rule); a montagem de rotas e o FastReroute não dependem dele.
+"""
+
+import errno
+import time
+from collections import namedtuple
+
+# Número de protocolo de roteamento "ospf" em /etc/iproute2/rt_protos.
+RTPROT_OSPF = 188
+MAIN_TABLE = 254
+
+# nexthops: tupla de (gateway, peso); mais de um nexthop gera rota multipath.
+Route = namedtuple("Route", "prefix nexthops metric")
+
+
+def build_routes(rib, prefixes_by_router, gateway_by_neighbor, local_prefixes=()):
+    """Converte um RIB {roteador: (primeiro salto, custo)} em rotas por prefixo.
+
+    `prefixes_by_router` vem dos LSAs e `gateway_by_neighbor` dá o IP do
+    vizinho no enlace compartilhado. Prefixos diretamente conectados ficam de
+    fora: o kernel já tem rota para eles.
+    """
+    best = {}
+    for router, (hop, cost) in rib.items():
+        for prefix in prefixes_by_router.get(router, ()):
+            if prefix in local_prefixes:
+                continue
+            if prefix not in best or cost < best[prefix].metric:
+                best[prefix] = Route(prefix, ((gateway_by_neighbor[hop], 1),), cost)
+    return list(best.values())
+
+
+def build_multipath_routes(rib, prefixes_by_router, gateway_by_neighbor, local_prefixes=()):
+    """Como `build_routes`, para o RIB de multipath.multipath_rib:
+    {roteador: (custo, ((vizinho, peso), ...))}."""
+    best = {}
+    for router, (cost, hops) in rib.items():
+        for prefix in prefixes_by_router.get(router, ()):
+            if prefix in local_prefixes:
+                continue
+            if prefix not in best or cost < best[prefix].metric:
+                nexthops = tuple(sorted((gateway_by_neighbor[n], w) for n, w in hops))
+                best[prefix] = Route(prefix, nexthops, cost)
+    return list(best.values())
+
+
+class KernelFib:
+    """Mantém uma tabela do kernel em sincronia com as rotas calculadas.
+
+    Só rotas cujo conjunto de nexthops mudou geram chamadas netlink; variações
+    de custo sem troca de caminho não mexem no kernel.
+    """
+
+    def __init__(self, table=MAIN_TABLE, proto=RTPROT_OSPF, ipr=None):
+        self.table = table
+        self.proto = proto
+        if ipr is None:
+            from pyroute2 import IPRoute
+            ipr = IPRoute()
+        self._ipr = ipr
+        self._installed = {}
+
+    def installed(self):
+        return dict(self._installed)
+
+    def adopt(self, installed):
+        """Assume rotas que já estão no kernel (graceful restart).
+
+        Nada é enviado ao kernel: o próximo `sync` só corrige as diferenças
+        e remove as rotas que deixaram de existir.
+        """
+        self._installed = dict(installed)
+
+    def sync(self, routes):
+        """Instala, troca e remove rotas; retorna o número de chamadas netlink."""
+        wanted = {r.prefix: r for r in routes}
+        calls = 0
+        for prefix in self._installed.keys() - wanted.keys():
+            self.delete(prefix)
+            calls += 1
+        for prefix, route in wanted.items():
+            if self._installed.get(prefix) != route.nexthops:
+                self.replace(route)
+                calls += 1
+        return calls
+
+    def replace(self, route):
+        kwargs = {"dst": route.prefix, "table": self.table, "proto": self.proto}
+        if len(route.nexthops) == 1:
+            kwargs["gateway"] = route.nexthops[0][0]
+        else:
+            # No netlink o peso do nexthop é "hops" + 1.
+            kwargs["multipath"] = [{"gateway": gw, "hops": max(int(w), 1) - 1}
+                                   for gw, w in route.nexthops]
+        self._ipr.route("replace", **kwargs)
+        self._installed[route.prefix] = route.nexthops
+
+    def replace_via_interface(self, prefix, oif):
+        """Rota sem gateway por uma interface (ex.: túnel até um nó PQ)."""
+        self._ipr.route("replace", dst=prefix, oif=oif, table=self.table, proto=self.proto)
+        self._installed[prefix] = ((None, oif),)
+
+    def delete(self, prefix):
+        from pyroute2 import NetlinkError
+        try:
+            self._ipr.route("del", dst=prefix, table=self.table, proto=self.proto)
+        except NetlinkError as e:
+            if e.code != errno.ESRCH:
+                raise
+        self._installed.pop(prefix, None)
+
+    def flush(self):
+        for prefix in list(self._installed):
+            self.delete(prefix)
+
+
+def install_policy_rule(profile, ipr=None):
+    """Cria o `ip rule` que desvia o tráfego do perfil para a tabela dele.
+
+    O tráfego é selecionado pelo DSCP (campo TOS do cabeçalho IP) ou pelo
+    fwmark marcado pelo iptables/nftables.
+    """
+    kwargs = {"table": profile.table, "priority": profile.priority}
+    if profile.dscp is not None:
+        kwargs["tos"] = int(profile.dscp) << 2
+    elif profile.fwmark is not None:
+        kwargs["fwmark"] = int(profile.fwmark)
+    else:
+        raise ValueError(f"perfil {profile.name!r} sem dscp nem fwmark")
+    from pyroute2 import IPRoute, NetlinkError
+    ipr = ipr if ipr is not None else IPRoute()
+    try:
+        ipr.rule("add", **kwargs)
+    except NetlinkError as e:
+        if e.code != errno.EEXIST:
+            raise
+
+
+class FastReroute:
+    """Troca local para os nexthops de backup quando um vizinho cai.
+
+    `arm` recebe o resultado de lfa.compute_alternates (e, com multipath, o
+    RIB de multipath.multipath_rib) e guarda, para cada prefixo, o grupo de
+    nexthops instalado e a rota de backup já resolvida. Quando um vizinho
+    cai, ele sai de todos os grupos que o contêm; o backup só é usado quando
+    o grupo fica vazio. `neighbor_down` só faz as chamadas netlink de troca;
+    o tempo entre a detecção da falha e o fim da troca fica em
+    `last_failover_s`.
+    """
+
+    def __init__(self, fib, gateway_by_neighbor, tunnel_oif_by_router=None, clock=None):
+        self.fib = fib
+        self.gateway_by_neighbor = gateway_by_neighbor
+        self.tunnel_oif_by_router = tunnel_oif_by_router or {}
+        self._clock = clock or time.monotonic
+        self._groups = {}
+        self._backups = {}
+        self._by_neighbor = {}
+        self._down = set()
+        self.failovers = 0
+        self.unprotected = 0
+        self.last_failover_s = None
+        self.max_failover_s = 0.0
+
+    def arm(self, alternates, prefixes_by_router, local_prefixes=(), multipath=None):
+        """Prepara os grupos e backups de cada prefixo.
+
+        Sem `multipath` o grupo de cada destino é só o vizinho primário; com
+        ele ({destino: (custo, ((vizinho, peso), ...))}) é o grupo ECMP
+        instalado por `build_multipath_routes`.
+        """
+        groups, backups, by_neighbor = {}, {}, {}
+        for router, (primary, alt) in alternates.items():
+            if multipath is not None and router in multipath:
+                cost, group = multipath[router]
+            else:
+                cost, group = None, ((primary, 1),)
+            for prefix in prefixes_by_router.get(router, ()):
+                if prefix in local_prefixes:
+                    continue
+                groups[prefix] = (cost, tuple(group))
+                backups[prefix] = (alt, self._backup_route(prefix, alt))
+                for neighbor, _ in group:
+                    by_neighbor.setdefault(neighbor, set()).add(prefix)
+        self._groups, self._backups, self._by_neighbor = groups, backups, by_neighbor
+        self._down.clear()
+
+    def _backup_route(self, prefix, alt):
+        if alt is None:
+            return None
+        if alt.remote is None:
+            return Route(prefix, ((self.gateway_by_neighbor[alt.neighbor], 1),), alt.cost)
+        oif = self.tunnel_oif_by_router.get(alt.remote)
+        if oif is None:
+            # Sem túnel até o nó PQ não há como usar o remote LFA.
+            return None
+        return Route(prefix, ((None, oif),), alt.cost)
+
+    def neighbor_down(self, neighbor, detected_at=None):
+        """Tira `neighbor` dos grupos de nexthops e aplica os backups dos
+        prefixos que ficaram sem nenhum.
+
+        Retorna os prefixos que ficaram sem proteção.
+        """
+        detected_at = self._clock() if detected_at is None else detected_at
+        self._down.add(neighbor)
+        lost = []
+        for prefix in sorted(self._by_neighbor.pop(neighbor, ())):
+            cost, group = self._groups[prefix]
+            remaining = tuple((n, w) for n, w in group if n != neighbor)
+            if remaining:
+                self._groups[prefix] = (cost, remaining)
+                nexthops = tuple(sorted((self.gateway_by_neighbor[n], w) for n, w in remaining))
+                self.fib.replace(Route(prefix, nexthops, cost))
+                continue
+            del self._groups[prefix]
+            alt, route = self._backups.pop(prefix)
+            if route is None or alt.neighbor in self._down:
+                lost.append(prefix)
+                continue
+            gateway, oif = route.nexthops[0]
+            if gateway is None:
+                self.fib.replace_via_interface(prefix, oif)
+            else:
+                self.fib.replace(route)
+        elapsed = self._clock() - detected_at
+        self.failovers += 1
+        self.unprotected += len(lost)
+        self.last_failover_s = elapsed
+        self.max_failover_s = max(self.max_failover_s, elapsed)
+        return lost
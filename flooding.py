@@ -0,0 +1,196 @@
+"""Flooding em lote: vários LSAs por Link State Update e envio cadenciado.
+
+Em vez de um datagrama por LSA por vizinho, cada interface tem uma fila de
+LSAs pendentes. O primeiro LSA enfileirado espera até `batch_delay_s` pelos
+seguintes (ou até o LSU encher) e, quando o pacer libera, os LSAs são empacotados num único LSU
+até o MTU da interface (descontados os cabeçalhos IP e OSPF). Um LSA que é
+reenfileirado antes de sair substitui a cópia pendente, então rajadas de
+atualizações do mesmo roteador saem uma vez só.
+
+O pacer é um balde de fichas por interface, em pacotes por segundo: `burst`
+pacotes podem sair de uma vez e depois o ritmo é `rate_pps`. Enquanto não há
+fichas, os LSAs se acumulam e o próximo pacote sai mais cheio.
+"""
+
+import time
+from collections import OrderedDict
+
+from ospf_codec import IP_HEADER_SIZE, OSPF_HEADER, lsu_body, lsu_capacity
+
+DEFAULT_MTU = 1500
+DEFAULT_RATE_PPS = 200.0
+DEFAULT_BURST = 20
+DEFAULT_BATCH_DELAY_S = 0.005
+
+
+def flooding_settings(config):
+    block = config.get("flooding") or {}
+    return (int(block.get("mtu", DEFAULT_MTU)), float(block.get("rate_pps", DEFAULT_RATE_PPS)),
+            int(block.get("burst", DEFAULT_BURST)),
+            float(block.get("batch_delay_ms", DEFAULT_BATCH_DELAY_S * 1000)) / 1000.0)
+
+
+class TokenBucket:
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def take(self, now=None):
+        """Consome uma ficha; False se não há."""
+        self._refill(self._clock() if now is None else now)
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def ready_at(self, now=None):
+        """Instante em que haverá uma ficha."""
+        now = self._clock() if now is None else now
+        self._refill(now)
+        return now if self.tokens >= 1 else now + (1 - self.tokens) / self.rate
+
+
+class InterfaceFlooder:
+    """Fila de flooding de uma interface.
+
+    `send(corpo)` recebe o corpo do LSU (sem cabeçalho OSPF; ver
+    `ospf_codec.frame`) e é chamado uma vez por pacote.
+    """
+
+    def __init__(self, name, send, mtu=DEFAULT_MTU, rate_pps=DEFAULT_RATE_PPS,
+                 burst=DEFAULT_BURST, batch_delay_s=DEFAULT_BATCH_DELAY_S, clock=time.monotonic):
+        self.name = name
+        self.send = send
+        self.mtu = mtu
+        self.batch_delay_s = batch_delay_s
+        self.bucket = TokenBucket(rate_pps, burst, clock)
+        self._clock = clock
+        self._pending = OrderedDict()
+        self._pending_bytes = 0
+        self._oldest_at = None
+
+        # Instrumentação.
+        self.packets = 0
+        self.lsas = 0
+        self.bytes = 0
+        self.superseded = 0
+        self.max_lsas_per_packet = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def enqueue(self, key, data):
+        """Enfileira um LSA codificado; substitui a cópia pendente da mesma chave."""
+        old = self._pending.pop(key, None)
+        if old is not None:
+            self.superseded += 1
+            self._pending_bytes -= len(old)
+        elif not self._pending:
+            self._oldest_at = self._clock()
+        self._pending[key] = data
+        self._pending_bytes += len(data)
+
+    def discard(self, key):
+        data = self._pending.pop(key, None)
+        if data is not None:
+            self._pending_bytes -= len(data)
+
+    def _due(self, now, capacity):
+        return self._pending and (now >= self._oldest_at + self.batch_delay_s
+                                  or self._pending_bytes >= capacity)
+
+    def poll(self, now=None):
+        """Envia o que as fichas permitirem; retorna o número de pacotes."""
+        now = self._clock() if now is None else now
+        sent = 0
+        capacity = lsu_capacity(self.mtu)
+        while self._due(now, capacity) and self.bucket.take(now):
+            batch, size = [], 0
+            while self._pending:
+                key, data = next(iter(self._pending.items()))
+                if batch and size + len(data) > capacity:
+                    break
+                del self._pending[key]
+                batch.append(data)
+                size += len(data)
+            self._pending_bytes -= size
+            self._oldest_at = now
+            body = lsu_body(batch)
+            self.send(body)
+            sent += 1
+            self.packets += 1
+            self.lsas += len(batch)
+            self.bytes += len(body) + OSPF_HEADER.size + IP_HEADER_SIZE
+            self.max_lsas_per_packet = max(self.max_lsas_per_packet, len(batch))
+        return sent
+
+    def next_deadline(self):
+        if not self._pending:
+            return None
+        return max(self.bucket.ready_at(), self._oldest_at + self.batch_delay_s)
+
+    def stats(self):
+        return {
+            "pending": len(self._pending),
+            "packets": self.packets,
+            "lsas": self.lsas,
+            "bytes": self.bytes,
+            "superseded": self.superseded,
+            "lsas_per_packet": self.lsas / self.packets if self.packets else 0.0,
+            "max_lsas_per_packet": self.max_lsas_per_packet,
+        }
+
+
+class Flooder:
+    """Flooding de um roteador sobre todas as suas interfaces."""
+
+    def __init__(self, mtu=DEFAULT_MTU, rate_pps=DEFAULT_RATE_PPS, burst=DEFAULT_BURST,
+                 batch_delay_s=DEFAULT_BATCH_DELAY_S, clock=time.monotonic):
+        self.mtu = mtu
+        self.rate_pps = rate_pps
+        self.burst = burst
+        self.batch_delay_s = batch_delay_s
+        self._clock = clock
+        self.interfaces = {}
+
+    @classmethod
+    def from_config(cls, config, **kwargs):
+        mtu, rate_pps, burst, batch_delay_s = flooding_settings(config)
+        return cls(mtu, rate_pps, burst, batch_delay_s, **kwargs)
+
+    def add_interface(self, name, send, mtu=None):
+        self.interfaces[name] = InterfaceFlooder(name, send, mtu or self.mtu, self.rate_pps,
+                                                 self.burst, self.batch_delay_s, self._clock)
+        return self.interfaces[name]
+
+    def remove_interface(self, name):
+        self.interfaces.pop(name, None)
+
+    def flood(self, lsa, exclude=None, only=None):
+        """Enfileira `lsa` em todas as interfaces menos `exclude` (a interface
+        por onde ele chegou). Com `only`, só nas interfaces desse conjunto
+        (ex.: as da topologia de flooding, ver flooding_topology)."""
+        data = lsa.to_bytes()
+        for name, interface in self.interfaces.items():
+            if name != exclude and (only is None or name in only):
+                interface.enqueue(lsa.key, data)
+
+    def poll(self, now=None):
+        now = self._clock() if now is None else now
+        return sum(interface.poll(now) for interface in self.interfaces.values())
+
+    def next_deadline(self):
+        deadlines = [d for d in (i.next_deadline() for i in self.interfaces.values())
+                     if d is not None]
+        return min(deadlines) if deadlines else None
+
+    def stats(self):
+        """{interface: contadores}, incluindo LSAs por pacote."""
+        return {name: interface.stats() for name, interface in self.interfaces.items()}
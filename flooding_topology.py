@@ -0,0 +1,174 @@
+"""Topologia de flooding reduzida para malhas densas (flooding dinâmico).
+
+Com flooding completo cada LSA atravessa todas as adjacências: O(E) cópias
+por evento. Aqui todos os roteadores calculam, a partir do mesmo LSDB, o
+mesmo subgrafo esparso e só inundam por ele:
+
+1. árvore em largura (menor número de saltos) a partir do menor ROUTER_ID,
+   com vizinhos em ordem de ID para o resultado ser determinístico;
+2. redundância: de baixo para cima, cada aresta da árvore ainda não coberta
+   ganha a aresta fora da árvore que sai da sua subárvore para o vértice
+   mais raso. Cada aresta da árvore fica num ciclo e o subgrafo resiste à
+   queda de qualquer enlace (2-aresta-conexo) sempre que a rede também for.
+
+Se, descontadas as adjacências que caíram, o subgrafo deixar de ligar todos
+os roteadores, o flooding volta a ser completo até a topologia ser
+recalculada.
+"""
+
+from collections import deque
+
+
+def undirected_edges(graph):
+    """Arestas {u, v} presentes nos dois sentidos de `graph[u][v]`."""
+    return {(u, v) if u < v else (v, u)
+            for u, neighbors in graph.items() for v in neighbors
+            if u != v and u in graph.get(v, ())}
+
+
+def _adjacency(edges):
+    adjacency = {}
+    for u, v in edges:
+        adjacency.setdefault(u, []).append(v)
+        adjacency.setdefault(v, []).append(u)
+    for neighbors in adjacency.values():
+        neighbors.sort()
+    return adjacency
+
+
+def flooding_topology(graph):
+    """Conjunto de arestas (u, v), u < v, por onde os LSAs são inundados."""
+    edges = undirected_edges(graph)
+    adjacency = _adjacency(edges)
+    if not adjacency:
+        return set()
+
+    # Floresta em largura: uma árvore por componente, raiz no menor ID.
+    parent, depth, order = {}, {}, []
+    for root in sorted(adjacency):
+        if root in parent:
+            continue
+        parent[root], depth[root] = None, 0
+        queue = deque([root])
+        while queue:
+            u = queue.popleft()
+            order.append(u)
+            for v in adjacency[u]:
+                if v not in parent:
+                    parent[v], depth[v] = u, depth[u] + 1
+                    queue.append(v)
+    chosen = {(min(u, p), max(u, p)) for u, p in parent.items() if p is not None}
+
+    # Intervalos de pré-ordem para testar "x está na subárvore de c".
+    children = {u: [] for u in order}
+    for u in order:
+        if parent[u] is not None:
+            children[parent[u]].append(u)
+    tin, tout, clock = {}, {}, 0
+    for root in (u for u in order if parent[u] is None):
+        stack = [(root, False)]
+        while stack:
+            u, done = stack.pop()
+            if done:
+                tout[u] = clock - 1
+                continue
+            tin[u] = clock
+            clock += 1
+            stack.append((u, True))
+            stack.extend((c, False) for c in reversed(children[u]))
+
+    def inside(x, c):
+        return tin[c] <= tin[x] <= tout[c]
+
+    non_tree = sorted(edges - chosen)
+    extra = []
+    for c in reversed(order):
+        if parent[c] is None:
+            continue
+        if any(inside(x, c) != inside(y, c) for x, y in extra):
+            continue
+        best = None
+        for x, y in non_tree:
+            if inside(x, c) == inside(y, c):
+                continue
+            outer = y if inside(x, c) else x
+            rank = (depth[outer], outer, x, y)
+            if best is None or rank < best[0]:
+                best = (rank, (x, y))
+        if best is not None:
+            extra.append(best[1])
+    return chosen | set(extra)
+
+
+def _connected(nodes, edges):
+    if not nodes:
+        return True
+    adjacency = _adjacency(edges)
+    start = next(iter(nodes))
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        for v in adjacency.get(queue.popleft(), ()):
+            if v not in seen:
+                seen.add(v)
+                queue.append(v)
+    return nodes <= seen
+
+
+class DynamicFlooding:
+    """Escolhe os vizinhos para os quais um roteador inunda.
+
+    `update(graph)` recalcula a topologia a partir da adjacência do LSDB;
+    `link_down`/`link_up` registram adjacências locais que mudaram antes de o
+    LSDB refletir a mudança. Desligado (`enabled=False`), tudo é flooding
+    completo.
+    """
+
+    def __init__(self, router_id, enabled=True):
+        self.router_id = router_id
+        self.enabled = enabled
+        self.edges = set()
+        self._nodes = set()
+        self._down = set()
+        self._partitioned = False
+        # Instrumentação.
+        self.fallbacks = 0
+
+    @classmethod
+    def from_config(cls, router_id, config):
+        block = config.get("flooding") or {}
+        return cls(router_id, bool(block.get("dynamic", False)))
+
+    def update(self, graph):
+        self.edges = flooding_topology(graph)
+        self._nodes = {u for edge in self.edges for u in edge}
+        self._down.clear()
+        self._check()
+
+    def link_down(self, a, b):
+        edge = (a, b) if a < b else (b, a)
+        if edge in self.edges:
+            self._down.add(edge)
+            self._check()
+
+    def link_up(self, a, b):
+        self._down.discard((a, b) if a < b else (b, a))
+        self._check()
+
+    def _check(self):
+        partitioned = bool(self._down) and not _connected(self._nodes, self.edges - self._down)
+        if partitioned and not self._partitioned:
+            self.fallbacks += 1
+        self._partitioned = partitioned
+
+    @property
+    def full_flooding(self):
+        return not self.enabled or self._partitioned or not self.edges
+
+    def flood_neighbors(self, neighbors):
+        """Subconjunto de `neighbors` (adjacências ativas) que recebe o LSA."""
+        if self.full_flooding or self.router_id not in self._nodes:
+            return set(neighbors)
+        me = self.router_id
+        return {n for n in neighbors
+                if ((me, n) if me < n else (n, me)) in self.edges - self._down}
@@ -0,0 +1,142 @@
+"""Medição passiva de RTT, jitter e perda pelos hellos.
+
+Alternativa às sondas separadas (pythonping): cada hello leva no bloco LLS um
+número de sequência, o instante de envio e o eco do último carimbo recebido
+do vizinho com o tempo que ele ficou retido (ospf_codec.HelloTiming):
+
+- RTT: agora - carimbo ecoado - tempo retido no vizinho; a latência é
+  metade do RTT suavizado (ganho 1/8, como o SRTT do TCP);
+- jitter: estimador da RFC 3550 sobre o tempo de trânsito (chegada - envio;
+  o deslocamento entre os relógios se cancela), J += (|D| - J) / 16;
+- perda: buracos na sequência dentro de uma janela dos últimos `window`
+  hellos.
+
+O eco tem um único vizinho por interface, como nos enlaces ponto a ponto da
+topologia. As medições alimentam o CostChangeTracker (termos β, γ e δ); a
+banda continua vindo da configuração.
+"""
+
+import time
+
+from ospf_codec import HelloTiming
+
+DEFAULT_WINDOW = 64
+_SEQ_MASK = 0xFFFFFFFF
+
+
+class HelloProbe:
+    """Estado de medição de uma interface ponto a ponto."""
+
+    def __init__(self, window=DEFAULT_WINDOW, clock_ns=time.monotonic_ns):
+        self.window = window
+        self._clock_ns = clock_ns
+        self._seq = 0
+        self.reset()
+        self.srtt_ns = None
+        self.jitter_ns = 0.0
+        # Instrumentação.
+        self.received = 0
+        self.rtt_samples = 0
+
+    def reset(self):
+        """Esquece a sequência e os carimbos do vizinho (adjacência caiu ou
+        o vizinho reiniciou); RTT e jitter suavizados são do enlace e ficam."""
+        self._peer_tx_ns = 0
+        self._peer_rx_ns = 0
+        self._last_transit = None
+        self._highest = None
+        self._first = None
+        self._mask = 0
+
+    def timing(self, now_ns=None):
+        """HelloTiming para o próximo hello enviado nesta interface."""
+        now_ns = self._clock_ns() if now_ns is None else now_ns
+        self._seq = (self._seq + 1) & _SEQ_MASK
+        delay_us = (now_ns - self._peer_rx_ns) // 1000 if self._peer_tx_ns else 0
+        return HelloTiming(self._seq, now_ns, self._peer_tx_ns, delay_us)
+
+    def receive(self, timing, now_ns=None):
+        """Processa o HelloTiming de um hello recebido do vizinho."""
+        now_ns = self._clock_ns() if now_ns is None else now_ns
+        self.received += 1
+        in_order = self._track_sequence(timing.seq, timing.tx_ns)
+
+        if in_order:
+            transit = now_ns - timing.tx_ns
+            if self._last_transit is not None:
+                d = abs(transit - self._last_transit)
+                self.jitter_ns += (d - self.jitter_ns) / 16
+            self._last_transit = transit
+            self._peer_tx_ns, self._peer_rx_ns = timing.tx_ns, now_ns
+
+        if timing.echo_ns:
+            rtt = now_ns - timing.echo_ns - timing.echo_delay_us * 1000
+            if rtt > 0:
+                if self.srtt_ns is None:
+                    self.srtt_ns = rtt
+                else:
+                    self.srtt_ns += (rtt - self.srtt_ns) / 8
+                self.rtt_samples += 1
+
+    def _track_sequence(self, seq, tx_ns):
+        if self._highest is None or self._restarted(seq, tx_ns):
+            self._highest = self._first = seq
+            self._mask = 1
+            self._last_transit = None
+            return True
+        ahead = (seq - self._highest) & _SEQ_MASK
+        if 0 < ahead < 1 << 31:
+            self._mask = ((self._mask << ahead) | 1) & ((1 << self.window) - 1)
+            self._highest = seq
+            return True
+        behind = (self._highest - seq) & _SEQ_MASK
+        if behind < self.window:
+            self._mask |= 1 << behind
+        return False
+
+    def _restarted(self, seq, tx_ns):
+        """O vizinho reiniciou a sequência (e não é só um hello atrasado)?"""
+        if seq == 1 and self._highest != 1:
+            return True
+        # Antes do primeiro número visto: a contagem recomeçou abaixo dele.
+        if 0 < (self._first - seq) & _SEQ_MASK < 1 << 31:
+            return True
+        behind = (self._highest - seq) & _SEQ_MASK
+        if not 0 < behind < 1 << 31:
+            return False  # adiante do maior visto (ou repetido)
+        if self._peer_tx_ns and tx_ns > self._peer_tx_ns:
+            # Número atrás do maior visto, mas enviado depois dele.
+            return True
+        return seq < self.window <= behind
+
+    @property
+    def loss_percent(self):
+        if self._highest is None:
+            return None
+        expected = min(self.window, ((self._highest - self._first) & _SEQ_MASK) + 1)
+        return 100.0 * (1 - bin(self._mask).count("1") / expected)
+
+    def metrics(self):
+        """Campos do cost_engine já medidos: latency_ms, jitter_ms e
+        packet_loss_percent."""
+        metrics = {}
+        if self.srtt_ns is not None:
+            metrics["latency_ms"] = self.srtt_ns / 2 / 1e6
+        if self._last_transit is not None and self.received > 1:
+            metrics["jitter_ms"] = self.jitter_ns / 1e6
+        if self._highest is not None:
+            metrics["packet_loss_percent"] = self.loss_percent
+        return metrics
+
+
+def record_measurements(tracker, probes, key_by_interface):
+    """Passa as medições de cada interface para o CostChangeTracker.
+
+    `probes` é {interface: HelloProbe} e `key_by_interface` dá a chave do
+    enlace no cost_engine.
+    """
+    for interface, probe in probes.items():
+        key = key_by_interface.get(interface)
+        metrics = probe.metrics()
+        if key is not None and metrics:
+            tracker.record(key, **metrics)
@@ -0,0 +1,101 @@
+"""Alternativas livres de laço (LFA, RFC 5286) e remote LFA (RFC 7490).
+
+Depois de cada SPF calcula, por destino, um nexthop de backup que pode ser
+usado imediatamente quando o enlace do nexthop primário cai, sem esperar a
+inundação de LSAs e um novo SPF.
+
+Notação: S é a raiz, E o primário, N um vizinho alternativo e D(x, y) a
+distância mínima de x para y.
+"""
+
+from collections import namedtuple
+
+from multipath import neighbor_distances
+from spf import dijkstra, first_hops, reverse_graph
+
+# `remote` é o nó PQ para onde o tráfego é tunelado (remote LFA) ou None.
+Alternate = namedtuple("Alternate", "neighbor cost node_protecting remote")
+
+
+def compute_alternates(graph, root, root_dist=None, root_parent=None,
+                       neighbor_dist=None, remote=True):
+    """Retorna {destino: (vizinho primário, Alternate ou None)}.
+
+    Um vizinho N é LFA para o destino d se D(N, d) < D(N, S) + D(S, d)
+    (inequação 1 da RFC 5286); é também node-protecting se
+    D(N, d) < D(N, E) + D(E, d). Entre os LFAs, os node-protecting têm
+    preferência e depois o menor custo. Destinos sem LFA recebem um remote
+    LFA quando existe um nó PQ para o enlace S-E.
+    """
+    if root_dist is None or root_parent is None:
+        root_dist, root_parent = dijkstra(graph, root)
+    if neighbor_dist is None:
+        neighbor_dist = neighbor_distances(graph, root)
+    links = graph.get(root, {})
+    primaries = first_hops(root_parent, root)
+
+    result = {}
+    unprotected = {}
+    for dest, primary in primaries.items():
+        d_primary = neighbor_dist[primary]
+        best = None
+        for n, dist_n in neighbor_dist.items():
+            if n == primary or dest not in dist_n or root not in dist_n:
+                continue
+            d_nd = dist_n[dest]
+            if not d_nd < dist_n[root] + root_dist[dest]:
+                continue
+            node_protecting = (dest != primary and primary in dist_n
+                               and d_nd < dist_n[primary] + d_primary.get(dest, float("inf")))
+            candidate = Alternate(n, links[n] + d_nd, node_protecting, None)
+            if best is None or (not best.node_protecting, best.cost) > (not node_protecting,
+                                                                       candidate.cost):
+                best = candidate
+        result[dest] = (primary, best)
+        if best is None:
+            unprotected.setdefault(primary, []).append(dest)
+
+    if remote and unprotected:
+        reverse = reverse_graph(graph)
+        to_root = dijkstra(reverse, root)[0]
+        for primary, dests in unprotected.items():
+            pq = _pq_node(graph, reverse, root, primary, root_dist, neighbor_dist, to_root)
+            if pq is None:
+                continue
+            via, pq_node, cost_to_pq = pq
+            from_pq = dijkstra(graph, pq_node)[0]
+            for dest in dests:
+                if dest in from_pq:
+                    result[dest] = (primary, Alternate(via, cost_to_pq + from_pq[dest],
+                                                       False, pq_node))
+    return result
+
+
+def _pq_node(graph, reverse, root, primary, root_dist, neighbor_dist, to_root):
+    """Nó PQ mais próximo para proteger o enlace S-E.
+
+    P estendido: nós y alcançáveis a partir de algum vizinho N != E sem voltar
+    por S, D(N, y) < D(N, S) + D(S, y). Q de E: nós y cujo caminho mínimo até
+    E não usa S-E, D(y, E) < D(y, S) + w(S, E).
+    Retorna (vizinho de saída, nó PQ, custo até o nó PQ) ou None.
+    """
+    w_se = graph[root][primary]
+    to_primary = dijkstra(reverse, primary)[0]
+    links = graph[root]
+    best = None
+    for n, dist_n in neighbor_dist.items():
+        if n == primary or root not in dist_n:
+            continue
+        for y, d_ny in dist_n.items():
+            if y in (root, primary) or y not in root_dist:
+                continue
+            if not d_ny < dist_n[root] + root_dist[y]:
+                continue
+            if y not in to_primary or y not in to_root:
+                continue
+            if not to_primary[y] < to_root[y] + w_se:
+                continue
+            cost = links[n] + d_ny
+            if best is None or cost < best[2]:
+                best = (n, y, cost)
+    return best
@@ -0,0 +1,658 @@
+"""LSDB compacto.
+
+Os ROUTER_IDs são internados como inteiros de 32 bits e nada é guardado como
+dicionário por LSA: os cabeçalhos ficam em colunas (`array`) de uma tabela de
+LSAs e os enlaces de todos os router-LSAs numa única tabela de métricas
+compartilhada, em que cada LSA ocupa uma faixa contígua. Nem o índice é um
+dict: é uma tabela hash de endereçamento aberto em que cada slot guarda só o
+número da linha; a chave é lida das próprias colunas.
+
+`RouterLSA` e `LinkRecord` (com `__slots__`) são a forma de troca com o resto
+do daemon; o LSDB os materializa sob demanda.
+
+O SPF lê uma versão imutável (`LSDB.freeze`) enquanto o flooding continua
+instalando LSAs na próxima. Congelar é O(1): a versão compartilha os arrays e
+o LSDB vivo só copia as colunas de cabeçalho na primeira escrita seguinte.
+Os enlaces nem isso: enquanto houver uma versão, o LSDB vivo não sobrescreve
+faixas, só anexa (a faixa antiga vira lixo até a próxima compactação).
+"""
+
+import struct
+import time
+from array import array
+
+from csr_graph import int_to_router_id, router_id_to_int
+
+ROUTER_LSA = 1
+# Delta de métricas de um router-LSA (tipo local deste protocolo).
+METRIC_DELTA_LSA = 128
+MAX_AGE = 3600
+
+# Formato no fio: cabeçalho de LSA do OSPFv2 (20 bytes), flags e número de
+# enlaces, e por enlace (vizinho, link_data, métrica em float64) seguidos das
+# quatro métricas medidas em float32. A métrica é o custo do cost_engine: um
+# float em [0, 1] ou, com `metric.integer`, a métrica quantizada, que o
+# float64 representa exatamente.
+LSA_HEADER = struct.Struct("!HBBIIIHH")
+_ROUTER_BODY = struct.Struct("!BxH")
+_LINK = struct.Struct("!IIdffff")
+# Delta: número de mudanças e, por mudança, índice do enlace e máscara dos
+# campos presentes, seguidos dos valores (métrica float64, demais float32).
+_DELTA_BODY = struct.Struct("!H2x")
+_DELTA_CHANGE = struct.Struct("!BB")
+DELTA_FIELDS = ("metric", "latency_ms", "loss_percent", "jitter_ms", "bandwidth_mbps")
+_DELTA_VALUE = tuple(struct.Struct("!d" if name == "metric" else "!f") for name in DELTA_FIELDS)
+_WIRE_CODEC = dict(zip(DELTA_FIELDS, _DELTA_VALUE))
+
+_router_ids = {}
+
+
+def intern_router_id(router_id):
+    """ROUTER_ID em notação de ponto (ex.: do env ROUTER_ID) -> uint32."""
+    if isinstance(router_id, int):
+        return router_id
+    value = _router_ids.get(router_id)
+    if value is None:
+        value = _router_ids[router_id] = router_id_to_int(router_id)
+    return value
+
+
+def signed_seq(seq):
+    """Números de sequência do OSPF são inteiros de 32 bits com sinal
+    (InitialSequenceNumber = 0x80000001 é o menor)."""
+    return seq - (1 << 32) if seq & 0x80000000 else seq
+
+
+def wire_value(field, value):
+    """`value` do campo `field` de um enlace como fica no fio (e no LSDB)."""
+    codec = _WIRE_CODEC[field]
+    return codec.unpack(codec.pack(value))[0]
+
+
+def lsa_key(ls_type, ls_id, adv_router):
+    return (ls_type << 64) | (ls_id << 32) | adv_router
+
+
+def unpack_key(key):
+    return key >> 64, (key >> 32) & 0xFFFFFFFF, key & 0xFFFFFFFF
+
+
+class LinkRecord:
+    """Enlace de um router-LSA com as métricas medidas deste protocolo."""
+
+    __slots__ = ("neighbor", "link_data", "metric",
+                 "latency_ms", "loss_percent", "jitter_ms", "bandwidth_mbps")
+
+    def __init__(self, neighbor, link_data, metric,
+                 latency_ms=0.0, loss_percent=0.0, jitter_ms=0.0, bandwidth_mbps=0.0):
+        self.neighbor = intern_router_id(neighbor)
+        self.link_data = link_data
+        self.metric = metric
+        self.latency_ms = latency_ms
+        self.loss_percent = loss_percent
+        self.jitter_ms = jitter_ms
+        self.bandwidth_mbps = bandwidth_mbps
+
+    def __repr__(self):
+        return (f"LinkRecord({int_to_router_id(self.neighbor)}, metric={self.metric}, "
+                f"lat={self.latency_ms}, loss={self.loss_percent}, "
+                f"jitter={self.jitter_ms}, bw={self.bandwidth_mbps})")
+
+
+class RouterLSA:
+    __slots__ = ("ls_type", "ls_id", "adv_router", "seq", "age", "checksum", "links")
+
+    def __init__(self, adv_router, seq, links, age=0, checksum=0, ls_id=None,
+                 ls_type=ROUTER_LSA):
+        self.adv_router = intern_router_id(adv_router)
+        self.ls_id = self.adv_router if ls_id is None else intern_router_id(ls_id)
+        self.ls_type = ls_type
+        self.seq = seq
+        self.age = age
+        self.checksum = checksum
+        self.links = tuple(links)
+
+    @property
+    def key(self):
+        return lsa_key(self.ls_type, self.ls_id, self.adv_router)
+
+    @property
+    def size(self):
+        return LSA_HEADER.size + _ROUTER_BODY.size + _LINK.size * len(self.links)
+
+    def to_bytes(self):
+        out = bytearray(self.size)
+        LSA_HEADER.pack_into(out, 0, min(self.age, MAX_AGE), 0, self.ls_type, self.ls_id,
+                             self.adv_router, self.seq & 0xFFFFFFFF, self.checksum, len(out))
+        _ROUTER_BODY.pack_into(out, LSA_HEADER.size, 0, len(self.links))
+        pos = LSA_HEADER.size + _ROUTER_BODY.size
+        for link in self.links:
+            _LINK.pack_into(out, pos, link.neighbor, link.link_data, link.metric,
+                            link.latency_ms, link.loss_percent, link.jitter_ms,
+                            link.bandwidth_mbps)
+            pos += _LINK.size
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data, offset=0):
+        """Decodifica um LSA de `data` (bytes ou memoryview); retorna (lsa, tamanho)."""
+        age, _, ls_type, ls_id, adv_router, seq, checksum, length = \
+            LSA_HEADER.unpack_from(data, offset)
+        _, count = _ROUTER_BODY.unpack_from(data, offset + LSA_HEADER.size)
+        start = offset + LSA_HEADER.size + _ROUTER_BODY.size
+        if start + count * _LINK.size > offset + length:
+            raise ValueError("LSA truncado")
+        links = [LinkRecord(*fields) for fields in
+                 _LINK.iter_unpack(data[start:start + count * _LINK.size])]
+        return cls(adv_router, seq, links, age=age, checksum=checksum, ls_id=ls_id,
+                   ls_type=ls_type), length
+
+    def __repr__(self):
+        return (f"RouterLSA({int_to_router_id(self.adv_router)}, seq={self.seq:#x}, "
+                f"age={self.age}, links={len(self.links)})")
+
+
+class MetricDelta:
+    """Só as métricas alteradas de um router-LSA.
+
+    Vale sobre a instância `base_seq` do router-LSA de `adv_router` e a leva
+    para `seq`; `checksum` é o da instância resultante. No cabeçalho o ls_id
+    carrega `base_seq`, então cada delta tem chave própria. `changes` é uma
+    sequência de (índice do enlace, ((campo, valor), ...)).
+    """
+
+    __slots__ = ("adv_router", "base_seq", "seq", "age", "checksum", "changes")
+    ls_type = METRIC_DELTA_LSA
+
+    def __init__(self, adv_router, base_seq, seq, changes, age=0, checksum=0):
+        self.adv_router = intern_router_id(adv_router)
+        self.base_seq = base_seq
+        self.seq = seq
+        self.age = age
+        self.checksum = checksum
+        self.changes = tuple((index, tuple(fields)) for index, fields in changes)
+
+    @property
+    def ls_id(self):
+        return self.base_seq
+
+    @property
+    def key(self):
+        return lsa_key(METRIC_DELTA_LSA, self.base_seq, self.adv_router)
+
+    @property
+    def size(self):
+        return (LSA_HEADER.size + _DELTA_BODY.size
+                + sum(_DELTA_CHANGE.size + sum(_WIRE_CODEC[name].size for name, _ in fields)
+                      for _, fields in self.changes))
+
+    def to_bytes(self):
+        out = bytearray(self.size)
+        LSA_HEADER.pack_into(out, 0, min(self.age, MAX_AGE), 0, METRIC_DELTA_LSA, self.base_seq,
+                             self.adv_router, self.seq & 0xFFFFFFFF, self.checksum, len(out))
+        _DELTA_BODY.pack_into(out, LSA_HEADER.size, len(self.changes))
+        pos = LSA_HEADER.size + _DELTA_BODY.size
+        for index, fields in self.changes:
+            values = dict(fields)
+            mask = sum(1 << bit for bit, name in enumerate(DELTA_FIELDS) if name in values)
+            _DELTA_CHANGE.pack_into(out, pos, index, mask)
+            pos += _DELTA_CHANGE.size
+            for name, codec in zip(DELTA_FIELDS, _DELTA_VALUE):
+                if name in values:
+                    codec.pack_into(out, pos, values[name])
+                    pos += codec.size
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data, offset=0):
+        age, _, _, base_seq, adv_router, seq, checksum, length = \
+            LSA_HEADER.unpack_from(data, offset)
+        (count,) = _DELTA_BODY.unpack_from(data, offset + LSA_HEADER.size)
+        pos = offset + LSA_HEADER.size + _DELTA_BODY.size
+        changes = []
+        for _ in range(count):
+            index, mask = _DELTA_CHANGE.unpack_from(data, pos)
+            pos += _DELTA_CHANGE.size
+            fields = []
+            for bit, (name, codec) in enumerate(zip(DELTA_FIELDS, _DELTA_VALUE)):
+                if mask & (1 << bit):
+                    fields.append((name, codec.unpack_from(data, pos)[0]))
+                    pos += codec.size
+            changes.append((index, fields))
+        if pos > offset + length:
+            raise ValueError("delta truncado")
+        return cls(adv_router, base_seq, seq, changes, age=age, checksum=checksum), length
+
+    def __repr__(self):
+        return (f"MetricDelta({int_to_router_id(self.adv_router)}, {self.base_seq:#x} -> "
+                f"{self.seq:#x}, changes={len(self.changes)})")
+
+
+def decode_lsa(data, offset=0):
+    """Decodifica o LSA em `offset` conforme o tipo; retorna (lsa, tamanho)."""
+    ls_type = data[offset + 3]
+    if ls_type == METRIC_DELTA_LSA:
+        return MetricDelta.from_bytes(data, offset)
+    return RouterLSA.from_bytes(data, offset)
+
+
+class LinkTable:
+    """Tabela colunar com os enlaces de todos os LSAs."""
+
+    __slots__ = ("neighbor", "link_data", "metric",
+                 "latency_ms", "loss_percent", "jitter_ms", "bandwidth_mbps")
+
+    def __init__(self):
+        self.neighbor = array("I")
+        self.link_data = array("I")
+        self.metric = array("d")
+        self.latency_ms = array("f")
+        self.loss_percent = array("f")
+        self.jitter_ms = array("f")
+        self.bandwidth_mbps = array("f")
+
+    def __len__(self):
+        return len(self.neighbor)
+
+    def append(self, link):
+        for name in self.__slots__:
+            getattr(self, name).append(getattr(link, name))
+
+    def write(self, pos, link):
+        for name in self.__slots__:
+            getattr(self, name)[pos] = getattr(link, name)
+
+    def record(self, pos):
+        return LinkRecord(*(getattr(self, name)[pos] for name in self.__slots__))
+
+
+class _RowIndex:
+    """Hash com sondagem linear sobre as colunas (ls_type, ls_id, adv_router).
+
+    Cada slot é um int32 com a linha (-1 = vazio), ocupação máxima de 1/2.
+    Remoções usam deslocamento para trás, sem lápides.
+    """
+
+    __slots__ = ("_slots", "_mask", "_used", "_ls_type", "_ls_id", "_adv_router")
+
+    def __init__(self, ls_type, ls_id, adv_router):
+        self._ls_type, self._ls_id, self._adv_router = ls_type, ls_id, adv_router
+        self._slots = array("i", [-1]) * 8
+        self._mask = 7
+        self._used = 0
+
+    def _home(self, ls_type, ls_id, adv_router):
+        h = (ls_id * 0x9E3779B1 ^ adv_router * 0x85EBCA77 ^ ls_type * 0xC2B2AE3D) & 0xFFFFFFFF
+        return (h ^ (h >> 16)) & self._mask
+
+    def _home_of_row(self, row):
+        return self._home(self._ls_type[row], self._ls_id[row], self._adv_router[row])
+
+    def _slot(self, ls_type, ls_id, adv_router):
+        slots, mask = self._slots, self._mask
+        i = self._home(ls_type, ls_id, adv_router)
+        while True:
+            row = slots[i]
+            if row < 0:
+                return i, -1
+            if (self._adv_router[row] == adv_router and self._ls_id[row] == ls_id
+                    and self._ls_type[row] == ls_type):
+                return i, row
+            i = (i + 1) & mask
+
+    def find(self, ls_type, ls_id, adv_router):
+        return self._slot(ls_type, ls_id, adv_router)[1]
+
+    def insert(self, row):
+        """Indexa `row`, cuja chave já está gravada nas colunas."""
+        if (self._used + 1) * 2 > len(self._slots):
+            self._resize(len(self._slots) * 2)
+        i, _ = self._slot(self._ls_type[row], self._ls_id[row], self._adv_router[row])
+        self._slots[i] = row
+        self._used += 1
+
+    def copy(self, ls_type, ls_id, adv_router):
+        """Cópia do índice sobre outras colunas com as mesmas linhas."""
+        index = _RowIndex.__new__(_RowIndex)
+        index._ls_type, index._ls_id, index._adv_router = ls_type, ls_id, adv_router
+        index._slots = self._slots[:]
+        index._mask = self._mask
+        index._used = self._used
+        return index
+
+    def repoint(self, ls_type, ls_id, adv_router, row):
+        i, _ = self._slot(ls_type, ls_id, adv_router)
+        self._slots[i] = row
+
+    def delete(self, ls_type, ls_id, adv_router):
+        slots, mask = self._slots, self._mask
+        j, _ = self._slot(ls_type, ls_id, adv_router)
+        slots[j] = -1
+        self._used -= 1
+        i = j
+        while True:
+            i = (i + 1) & mask
+            row = slots[i]
+            if row < 0:
+                return
+            k = self._home_of_row(row)
+            # Move o slot i para o buraco j se sua posição de origem não
+            # estiver no intervalo cíclico (j, i].
+            if (j < i and (k <= j or k > i)) or (j > i and k <= j and k > i):
+                slots[j] = row
+                slots[i] = -1
+                j = i
+
+    def _resize(self, size):
+        rows = [r for r in self._slots if r >= 0]
+        self._slots = array("i", [-1]) * size
+        self._mask = size - 1
+        for row in rows:
+            i = self._home_of_row(row)
+            while self._slots[i] >= 0:
+                i = (i + 1) & self._mask
+            self._slots[i] = row
+
+
+class LSDB:
+    """Banco de LSAs com cabeçalhos e enlaces em colunas."""
+
+    _HEADER = (("ls_type", "B"), ("ls_id", "I"), ("adv_router", "I"), ("seq", "I"),
+               ("age", "H"), ("checksum", "H"), ("link_start", "I"), ("link_count", "H"))
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._columns = {name: array(code) for name, code in self._HEADER}
+        self._index = _RowIndex(self._columns["ls_type"], self._columns["ls_id"],
+                                self._columns["adv_router"])
+        self._installed_at = array("d")
+        self.links = LinkTable()
+        self._garbage = 0
+        self.version = 0
+        self._view = None
+        self._shared = False
+        self._links_shared = False
+
+    def __len__(self):
+        return len(self._installed_at)
+
+    def __contains__(self, key):
+        return self._index.find(*unpack_key(key)) >= 0
+
+    def _key(self, row):
+        cols = self._columns
+        return lsa_key(cols["ls_type"][row], cols["ls_id"][row], cols["adv_router"][row])
+
+    @property
+    def link_count(self):
+        return len(self.links) - self._garbage
+
+    def freeze(self):
+        """Versão imutável do estado atual (`LSDBVersion`), em O(1).
+
+        Sem instalações desde o último congelamento devolve a mesma versão.
+        """
+        if self._view is None:
+            self._view = LSDBVersion(self)
+            self._shared = self._links_shared = True
+        return self._view
+
+    def _before_write(self):
+        self.version += 1
+        self._view = None
+        if self._shared:
+            self._columns = {name: column[:] for name, column in self._columns.items()}
+            cols = self._columns
+            self._index = self._index.copy(cols["ls_type"], cols["ls_id"], cols["adv_router"])
+            self._installed_at = self._installed_at[:]
+            self._shared = False
+
+    def install(self, lsa):
+        """Instala `lsa` se for mais novo que a cópia atual; retorna True se instalou.
+
+        Um MetricDelta é aplicado sobre o router-LSA base (ver `apply_delta`).
+        """
+        if lsa.ls_type == METRIC_DELTA_LSA:
+            return self.apply_delta(lsa)
+        row = self._index.find(lsa.ls_type, lsa.ls_id, lsa.adv_router)
+        cols = self._columns
+        if row >= 0:
+            if ((signed_seq(lsa.seq), lsa.checksum)
+                    <= (signed_seq(cols["seq"][row]), cols["checksum"][row])):
+                return False
+            self._before_write()
+            cols = self._columns
+            start, count = cols["link_start"][row], cols["link_count"][row]
+            if count == len(lsa.links) and not self._links_shared:
+                for i, link in enumerate(lsa.links):
+                    self.links.write(start + i, link)
+            else:
+                self._garbage += count
+                cols["link_start"][row] = self._append_links(lsa.links)
+                cols["link_count"][row] = len(lsa.links)
+            cols["seq"][row] = lsa.seq
+            cols["age"][row] = lsa.age
+            cols["checksum"][row] = lsa.checksum
+            self._installed_at[row] = self._clock()
+            self._maybe_compact()
+            return True
+
+        self._before_write()
+        cols = self._columns
+        row = len(self)
+        start = self._append_links(lsa.links)
+        for name, value in (("ls_type", lsa.ls_type), ("ls_id", lsa.ls_id),
+                            ("adv_router", lsa.adv_router), ("seq", lsa.seq),
+                            ("age", lsa.age), ("checksum", lsa.checksum),
+                            ("link_start", start), ("link_count", len(lsa.links))):
+            cols[name].append(value)
+        self._installed_at.append(self._clock())
+        self._index.insert(row)
+        return True
+
+    def apply_delta(self, delta):
+        """Aplica um MetricDelta à instância `base_seq` do router-LSA.
+
+        Retorna False (sem alterar nada) se a cópia local não é a base do
+        delta; nesse caso o LSA completo tem de vir por LSR ou pelo próximo
+        refresh.
+        """
+        row = self._index.find(ROUTER_LSA, delta.adv_router, delta.adv_router)
+        if row < 0 or self._columns["seq"][row] != delta.base_seq:
+            return False
+        count = self._columns["link_count"][row]
+        if any(index >= count for index, _ in delta.changes):
+            return False
+        self._before_write()
+        cols = self._columns
+        start = cols["link_start"][row]
+        if self._links_shared:
+            # Uma versão congelada ainda lê a faixa atual: copia para o fim.
+            cols["link_start"][row] = len(self.links)
+            for name in LinkTable.__slots__:
+                column = getattr(self.links, name)
+                column.extend(column[start:start + count])
+            self._garbage += count
+            start = cols["link_start"][row]
+        for index, fields in delta.changes:
+            for name, value in fields:
+                getattr(self.links, name)[start + index] = value
+        cols["seq"][row] = delta.seq
+        cols["age"][row] = delta.age
+        cols["checksum"][row] = delta.checksum
+        self._installed_at[row] = self._clock()
+        self._maybe_compact()
+        return True
+
+    def _append_links(self, links):
+        start = len(self.links)
+        for link in links:
+            self.links.append(link)
+        return start
+
+    def remove(self, key):
+        ls_type, ls_id, adv_router = unpack_key(key)
+        row = self._index.find(ls_type, ls_id, adv_router)
+        if row < 0:
+            raise KeyError(key)
+        self._before_write()
+        self._index.delete(ls_type, ls_id, adv_router)
+        self._garbage += self._columns["link_count"][row]
+        last = len(self) - 1
+        if row != last:
+            self._index.repoint(*unpack_key(self._key(last)), row)
+            for column in self._columns.values():
+                column[row] = column[last]
+            self._installed_at[row] = self._installed_at[last]
+        for column in self._columns.values():
+            column.pop()
+        self._installed_at.pop()
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self._garbage * 2 > len(self.links):
+            self._compact()
+
+    def _compact(self):
+        # Não escreve nos arrays antigos: podem pertencer a uma versão.
+        self._columns["link_start"], self.links = self._compacted_links()
+        self._garbage = 0
+        self._links_shared = False
+
+    def _compacted_links(self):
+        """(link_start, LinkTable) sem as faixas de lixo, sem alterar o LSDB."""
+        links = LinkTable()
+        starts, counts = array("I"), self._columns["link_count"]
+        for row, start in enumerate(self._columns["link_start"]):
+            starts.append(len(links))
+            for name in LinkTable.__slots__:
+                column = getattr(self.links, name)
+                getattr(links, name).extend(column[start:start + counts[row]])
+        return starts, links
+
+    def _has_garbage(self):
+        return self._garbage > 0
+
+    def age(self, row, now=None):
+        now = self._clock() if now is None else now
+        return self._columns["age"][row] + int(now - self._installed_at[row])
+
+    def get(self, ls_type, ls_id, adv_router):
+        row = self._index.find(ls_type, intern_router_id(ls_id), intern_router_id(adv_router))
+        return None if row < 0 else self._materialize(row)
+
+    def _materialize(self, row):
+        cols = self._columns
+        start = cols["link_start"][row]
+        links = [self.links.record(start + i) for i in range(cols["link_count"][row])]
+        return RouterLSA(cols["adv_router"][row], cols["seq"][row], links,
+                         age=self.age(row), checksum=cols["checksum"][row],
+                         ls_id=cols["ls_id"][row], ls_type=cols["ls_type"][row])
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self._materialize(row)
+
+    def keys(self):
+        return [self._key(row) for row in range(len(self))]
+
+    def header(self, key):
+        """(seq, checksum, idade) de um LSA, sem materializar os enlaces."""
+        row = self._index.find(*unpack_key(key))
+        if row < 0:
+            raise KeyError(key)
+        cols = self._columns
+        return cols["seq"][row], cols["checksum"][row], self.age(row)
+
+    def export_columns(self, now=None):
+        """Cópia das colunas (cabeçalhos e enlaces) para persistência.
+
+        A coluna `age` sai com a idade atual de cada LSA. Os enlaces saem
+        compactados numa cópia; o LSDB não é alterado.
+        """
+        if self._has_garbage():
+            link_start, links = self._compacted_links()
+        else:
+            link_start, links = self._columns["link_start"], self.links
+        columns = {name: array(code, column) for (name, code), column
+                   in zip(self._HEADER, self._columns.values())}
+        columns["link_start"] = array("I", link_start)
+        columns["age"] = array("H", (min(self.age(row, now), MAX_AGE) for row in range(len(self))))
+        for name in LinkTable.__slots__:
+            columns["link_" + name] = array(getattr(links, name).typecode, getattr(links, name))
+        return columns
+
+    @classmethod
+    def from_columns(cls, columns, clock=time.monotonic):
+        """Reconstrói um LSDB a partir de `export_columns` (ex.: de um snapshot)."""
+        db = cls(clock)
+        for name, code in cls._HEADER:
+            column = columns[name]
+            if column.typecode != code:
+                raise ValueError(f"coluna {name!r} com tipo {column.typecode!r}")
+            db._columns[name].extend(column)
+        for name in LinkTable.__slots__:
+            column, target = columns["link_" + name], getattr(db.links, name)
+            if column.typecode != target.typecode:
+                raise ValueError(f"coluna {'link_' + name!r} com tipo {column.typecode!r}")
+            target.extend(column)
+        now = clock()
+        db._installed_at.extend([now] * len(db._columns["ls_type"]))
+        for row in range(len(db)):
+            db._index.insert(row)
+        return db
+
+    def adjacency(self):
+        """`graph[u][v] = métrica`, com u e v como uint32, para o SPF."""
+        graph = {}
+        cols = self._columns
+        neighbor, metric = self.links.neighbor, self.links.metric
+        for row in range(len(self)):
+            if cols["ls_type"][row] != ROUTER_LSA:
+                continue
+            out = graph.setdefault(cols["adv_router"][row], {})
+            start = cols["link_start"][row]
+            for i in range(start, start + cols["link_count"][row]):
+                out[neighbor[i]] = metric[i]
+        return graph
+
+
+class LSDBVersion(LSDB):
+    """Versão imutável de um LSDB, criada por `LSDB.freeze`.
+
+    Tem toda a interface de leitura do LSDB (get, header, keys, iteração,
+    adjacency, export_columns) e pode ser lida de outra thread sem lock
+    enquanto o LSDB vivo recebe LSAs. Para um processo de SPF, envie
+    `export_columns()` e reconstrua com `LSDB.from_columns`.
+    """
+
+    def __init__(self, db):
+        self._clock = db._clock
+        self._columns = dict(db._columns)
+        self._index = db._index
+        self._installed_at = db._installed_at
+        self.links = db.links
+        # O LSDB vivo pode anexar enlaces aos arrays compartilhados.
+        self._link_end = len(db.links)
+        self._garbage = db._garbage
+        self.version = db.version
+        self._view = self
+        self._shared = self._links_shared = True
+
+    @property
+    def link_count(self):
+        return self._link_end - self._garbage
+
+    def install(self, lsa):
+        raise TypeError("versão do LSDB é somente leitura")
+
+    def apply_delta(self, delta):
+        raise TypeError("versão do LSDB é somente leitura")
+
+    def remove(self, key):
+        raise TypeError("versão do LSDB é somente leitura")
+
+    def _has_garbage(self):
+        # Além do lixo, os arrays compartilhados podem ter enlaces anexados
+        # depois pelo LSDB vivo.
+        return self._garbage > 0 or len(self.links) != self._link_end
@@ -0,0 +1,166 @@
+"""Sincronização do LSDB por resumos (árvore de Merkle sobre faixas de hash).
+
+Na formação de uma adjacência, em vez de trocar o cabeçalho de todos os LSAs
+(DBD), os roteadores trocam resumos: cada LSA tem um digest de 64 bits de
+(chave, seq, checksum), os LSAs são distribuídos em 2**k baldes por hash da
+chave e o resumo de um balde é o XOR dos digests dos seus LSAs. Os baldes são
+as folhas de uma árvore com fan-out 16 em que cada nó é o XOR dos filhos.
+
+A reconciliação desce só pelos nós diferentes; nos baldes diferentes troca os
+cabeçalhos e então pede apenas os LSAs que divergem. O XOR permite manter o
+resumo incrementalmente a cada LSA instalado ou removido.
+"""
+
+import hashlib
+import struct
+from array import array
+from collections import namedtuple
+
+from lsdb import lsa_key, signed_seq, unpack_key
+
+DEFAULT_BUCKET_BITS = 12
+FANOUT_BITS = 4
+FANOUT = 1 << FANOUT_BITS
+
+_DIGEST_INPUT = struct.Struct("!BIIII")
+# Mensagens: (nível, índice do nó, digest) e cabeçalho (tipo, id, adv, seq, checksum).
+NODE_DIGEST = struct.Struct("!BIQ")
+LSA_SUMMARY = struct.Struct("!BIIIH")
+# Cabeçalho de LSA num DBD do OSPFv2, para comparação.
+OSPF_LSA_HEADER_SIZE = 20
+
+SyncResult = namedtuple("SyncResult", "request offer bytes rounds")
+
+
+def lsa_digest(key, seq, checksum):
+    ls_type, ls_id, adv_router = unpack_key(key)
+    data = _DIGEST_INPUT.pack(ls_type, ls_id, adv_router, seq & 0xFFFFFFFF, checksum)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+class LSDBDigest:
+    """Resumo em árvore de um LSDB (ou de qualquer fonte de cabeçalhos)."""
+
+    def __init__(self, bucket_bits=DEFAULT_BUCKET_BITS):
+        if bucket_bits % FANOUT_BITS:
+            raise ValueError(f"bucket_bits deve ser múltiplo de {FANOUT_BITS}")
+        self.bucket_bits = bucket_bits
+        self.depth = bucket_bits // FANOUT_BITS
+        # levels[0] é a raiz; levels[depth] são os baldes.
+        self.levels = [array("Q", bytes(8 * (FANOUT ** i))) for i in range(self.depth + 1)]
+        self._headers = [None] * (1 << bucket_bits)
+
+    @classmethod
+    def from_lsdb(cls, lsdb, bucket_bits=DEFAULT_BUCKET_BITS):
+        digest = cls(bucket_bits)
+        for key in lsdb.keys():
+            seq, checksum, _ = lsdb.header(key)
+            digest.add(key, seq, checksum)
+        return digest
+
+    def bucket(self, key):
+        ls_type, ls_id, adv_router = unpack_key(key)
+        h = (ls_id * 0x9E3779B1 ^ adv_router * 0x85EBCA77 ^ ls_type * 0xC2B2AE3D) & 0xFFFFFFFF
+        h ^= h >> 15
+        h = (h * 0x2C1B3C6D) & 0xFFFFFFFF
+        return h >> (32 - self.bucket_bits)
+
+    def _toggle(self, key, seq, checksum):
+        value = lsa_digest(key, seq, checksum)
+        index = self.bucket(key)
+        for level in range(self.depth, -1, -1):
+            self.levels[level][index] ^= value
+            index >>= FANOUT_BITS
+        return self.bucket(key)
+
+    def add(self, key, seq, checksum):
+        b = self._toggle(key, seq, checksum)
+        if self._headers[b] is None:
+            self._headers[b] = {}
+        self._headers[b][key] = (seq, checksum)
+
+    def discard(self, key):
+        b = self.bucket(key)
+        headers = self._headers[b]
+        if headers and key in headers:
+            seq, checksum = headers.pop(key)
+            self._toggle(key, seq, checksum)
+
+    def update(self, key, seq, checksum):
+        """Chamado quando um LSA é (re)instalado no LSDB."""
+        self.discard(key)
+        self.add(key, seq, checksum)
+
+    @property
+    def root(self):
+        return self.levels[0][0]
+
+    def children(self, level, index):
+        start = index << FANOUT_BITS
+        return self.levels[level + 1][start:start + FANOUT]
+
+    def headers(self, bucket):
+        return dict(self._headers[bucket] or {})
+
+
+def _newer(a, b):
+    return (signed_seq(a[0]), a[1]) > (signed_seq(b[0]), b[1])
+
+
+def reconcile(local, remote):
+    """Simula a troca de resumos entre dois roteadores.
+
+    Retorna SyncResult com `request` (chaves que o local precisa pedir),
+    `offer` (chaves em que o local tem a cópia mais nova), os bytes trocados
+    nos dois sentidos e o número de rodadas (idas e voltas).
+    """
+    if local.bucket_bits != remote.bucket_bits:
+        raise ValueError("resumos com números de baldes diferentes")
+    sent = NODE_DIGEST.size * 2
+    rounds = 1
+    if local.root == remote.root:
+        return SyncResult([], [], sent, rounds)
+
+    frontier = [0]
+    for level in range(local.depth):
+        next_frontier = []
+        for index in frontier:
+            # Cada lado envia os filhos do nó que diverge.
+            sent += 2 * FANOUT * NODE_DIGEST.size
+            mine, theirs = local.children(level, index), remote.children(level, index)
+            base = index << FANOUT_BITS
+            next_frontier.extend(base + i for i in range(FANOUT) if mine[i] != theirs[i])
+        frontier = next_frontier
+        rounds += 1
+
+    request, offer = [], []
+    for bucket in frontier:
+        mine, theirs = local.headers(bucket), remote.headers(bucket)
+        sent += (len(mine) + len(theirs)) * LSA_SUMMARY.size
+        for key, header in theirs.items():
+            if key not in mine or _newer(header, mine[key]):
+                request.append(key)
+        for key, header in mine.items():
+            if key not in theirs or _newer(header, theirs[key]):
+                offer.append(key)
+    rounds += 1
+    # Pedido de LSAs (LSR): tipo, id e roteador anunciante por LSA.
+    sent += len(request) * 12
+    return SyncResult(request, offer, sent, rounds)
+
+
+def encode_node_digests(level, index, values):
+    """Mensagem com os digests dos filhos de um nó."""
+    return b"".join(NODE_DIGEST.pack(level, (index << FANOUT_BITS) + i, v)
+                    for i, v in enumerate(values))
+
+
+def encode_summaries(headers):
+    """Mensagem com os cabeçalhos (chave, seq, checksum) de um balde."""
+    return b"".join(LSA_SUMMARY.pack(*unpack_key(key), seq & 0xFFFFFFFF, checksum)
+                    for key, (seq, checksum) in headers.items())
+
+
+def decode_summaries(data):
+    return {lsa_key(t, i, a): (seq, checksum)
+            for t, i, a, seq, checksum in LSA_SUMMARY.iter_unpack(data)}
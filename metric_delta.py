@@ -0,0 +1,113 @@
+"""Originação de router-LSAs com deltas de métricas e refresh periódico.
+
+Latência, perda, jitter e banda medidos mudam o tempo todo, mas a lista de
+enlaces quase nunca. Em vez de reinundar o router-LSA inteiro a cada
+medição, o roteador origina um MetricDelta com só os campos alterados; cada
+delta avança o número de sequência do router-LSA. O LSA completo sai quando
+a topologia muda, quando o delta não for menor que ele, a cada `max_deltas`
+deltas e a cada `refresh_s` segundos, o que ressincroniza quem perdeu um delta.
+"""
+
+import time
+
+from lsdb import DELTA_FIELDS, LinkRecord, MetricDelta, RouterLSA, intern_router_id, wire_value
+
+INITIAL_SEQ = 0x80000001
+DEFAULT_REFRESH_S = 30.0
+DEFAULT_MAX_DELTAS = 16
+
+
+def delta_settings(config):
+    block = config.get("delta_lsa") or {}
+    return (float(block.get("refresh_s", DEFAULT_REFRESH_S)),
+            int(block.get("max_deltas", DEFAULT_MAX_DELTAS)))
+
+
+class DeltaOriginator:
+    """Estado anunciado do router-LSA local e escolha entre delta e completo.
+
+    `update` registra medições; `originate` devolve o próximo LSA a inundar
+    (RouterLSA ou MetricDelta) ou None se nada mudou.
+    """
+
+    def __init__(self, router_id, links=(), refresh_s=DEFAULT_REFRESH_S,
+                 max_deltas=DEFAULT_MAX_DELTAS, seq=INITIAL_SEQ - 1, clock=time.monotonic):
+        self.router_id = intern_router_id(router_id)
+        self.refresh_s = refresh_s
+        self.max_deltas = max_deltas
+        self.seq = seq
+        self._clock = clock
+        self._links = []
+        self._index = {}
+        self._changed = {}
+        self._topology_changed = True
+        self._deltas_since_full = 0
+        self._full_at = None
+        self.set_links(links)
+
+        # Instrumentação.
+        self.full_sent = 0
+        self.deltas_sent = 0
+
+    @classmethod
+    def from_config(cls, router_id, config, links=(), **kwargs):
+        refresh_s, max_deltas = delta_settings(config)
+        return cls(router_id, links, refresh_s, max_deltas, **kwargs)
+
+    def set_links(self, links):
+        """Troca a lista de enlaces (adjacência subiu ou caiu): o próximo LSA é completo."""
+        self._links = [LinkRecord(link.neighbor, link.link_data,
+                                  *(wire_value(name, getattr(link, name))
+                                    for name in DELTA_FIELDS))
+                       for link in links]
+        self._index = {}
+        for i, link in enumerate(self._links):
+            self._index.setdefault(link.neighbor, i)
+        self._changed.clear()
+        self._topology_changed = True
+
+    def update(self, neighbor, **fields):
+        """Nova medição do enlace para `neighbor` (campos de DELTA_FIELDS)."""
+        index = self._index[intern_router_id(neighbor)]
+        link = self._links[index]
+        for name, value in fields.items():
+            if name not in DELTA_FIELDS:
+                raise ValueError(f"campo desconhecido: {name}")
+            # Compara como vai no fio para não gerar deltas de ruído.
+            value = wire_value(name, value)
+            if getattr(link, name) != value:
+                setattr(link, name, value)
+                self._changed.setdefault(index, set()).add(name)
+
+    def full_lsa(self):
+        links = [LinkRecord(*(getattr(link, name) for name in LinkRecord.__slots__))
+                 for link in self._links]
+        return RouterLSA(self.router_id, self.seq, links)
+
+    def originate(self, now=None):
+        now = self._clock() if now is None else now
+        refresh_due = self._full_at is None or now - self._full_at >= self.refresh_s
+        if not (self._changed or self._topology_changed or refresh_due):
+            return None
+        base_seq = self.seq
+        self.seq += 1
+        full = self.full_lsa()
+        delta = None
+        if not (self._topology_changed or refresh_due
+                or self._deltas_since_full >= self.max_deltas):
+            changes = [(index, [(name, getattr(self._links[index], name))
+                                for name in DELTA_FIELDS if name in names])
+                       for index, names in sorted(self._changed.items())]
+            delta = MetricDelta(self.router_id, base_seq, self.seq, changes)
+            if delta.size >= full.size:
+                delta = None
+        self._changed.clear()
+        if delta is not None:
+            self._deltas_since_full += 1
+            self.deltas_sent += 1
+            return delta
+        self._topology_changed = False
+        self._deltas_since_full = 0
+        self._full_at = now
+        self.full_sent += 1
+        return full
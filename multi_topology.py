@@ -0,0 +1,180 @@
+"""Roteamento multi-topologia: um SPF por perfil de pesos.
+
+O bloco `cost_profiles` do config.json define perfis nomeados (por exemplo
+`gaming`, com β/γ/δ pesados, e `bulk`, com α pesado). Todos compartilham a
+mesma topologia e as mesmas métricas medidas; só os pesos mudam. Cada perfil
+tem sua própria tabela de rotas no kernel, selecionada por `ip rule` via DSCP
+ou fwmark (veja fib.py).
+
+Os SPFs dos perfis rodam em paralelo num pool de processos. A estrutura do
+grafo é entregue aos workers uma única vez, no fork, e fica somente leitura;
+a cada rodada só a matriz de métricas é enviada.
+"""
+
+import os
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+from cost_engine import composite_costs, quantize_array, weights_vector
+from csr_graph import CSRGraph
+from spf import INF, first_hops_csr, spf_csr
+
+Profile = namedtuple("Profile", "name weights table dscp fwmark priority")
+
+DEFAULT_RULE_PRIORITY = 1000
+
+
+def load_profiles(config):
+    """Lê `cost_profiles`; perfis sem `weights` herdam `cost_weights`."""
+    profiles = []
+    for i, (name, block) in enumerate(config.get("cost_profiles", {}).items()):
+        if "table" not in block:
+            raise ValueError(f"perfil {name!r} sem tabela de rotas")
+        if "dscp" in block and "fwmark" in block:
+            raise ValueError(f"perfil {name!r}: use dscp ou fwmark, não ambos")
+        weights = block.get("weights", config["cost_weights"])
+        weights_vector(weights)  # valida
+        profiles.append(Profile(
+            name=name,
+            weights=weights,
+            table=int(block["table"]),
+            dscp=block.get("dscp"),
+            fwmark=block.get("fwmark"),
+            priority=int(block.get("priority", DEFAULT_RULE_PRIORITY + i)),
+        ))
+    return profiles
+
+
+class SharedTopology:
+    """Estrutura CSR do grafo com, para cada aresta, a coluna do enlace no
+    motor de custos. O custo da aresta é obtido por perfil.
+
+    As colunas valem para o `layout_version` do motor em que foram lidas;
+    `link_keys` guarda as chaves para refazê-las (`rebind`) depois de uma
+    remoção.
+    """
+
+    __slots__ = ("ids", "offsets", "targets", "edge_links", "link_keys", "layout_version")
+
+    def __init__(self, ids, offsets, targets, edge_links, link_keys, layout_version):
+        self.ids = ids
+        self.offsets = offsets
+        self.targets = targets
+        self.edge_links = edge_links
+        self.link_keys = link_keys
+        self.layout_version = layout_version
+
+    @classmethod
+    def from_adjacency(cls, adjacency, engine, ids=None):
+        """`adjacency[u][v]` é a chave do enlace u -> v no `CostEngine`."""
+        columns = {u: {v: engine.index_of(key) for v, key in edges.items()}
+                   for u, edges in adjacency.items()}
+        graph = CSRGraph.from_adjacency(columns, ids=ids)
+        edge_links = array("i", (int(c) for c in graph.costs))
+        keys = engine.keys()
+        return cls(graph.ids, graph.offsets, graph.targets, edge_links,
+                   tuple(keys[c] for c in edge_links), engine.layout_version)
+
+    def rebind(self, engine):
+        """Mesma estrutura com as colunas atuais dos enlaces no `engine`."""
+        missing = [key for key in self.link_keys if key not in engine]
+        if missing:
+            raise ValueError(f"enlaces da topologia fora do motor de custos: {missing!r}")
+        edge_links = array("i", (engine.index_of(key) for key in self.link_keys))
+        return SharedTopology(self.ids, self.offsets, self.targets, edge_links,
+                              self.link_keys, engine.layout_version)
+
+    def graph_for(self, link_costs, integer=False):
+        """CSRGraph com os custos de um perfil (`link_costs` indexado por coluna)."""
+        edge_costs = link_costs[self.edge_links]
+        costs = array("I" if integer else "d")
+        costs.frombytes(edge_costs.astype("uint32" if integer else "float64").tobytes())
+        return CSRGraph(self.ids, self.offsets, self.targets, costs)
+
+
+def profile_spf(topology, root, weights, metrics, bounds, metric=None):
+    """Custeia os enlaces com `weights` e roda o SPF a partir de `root`.
+
+    Retorna {ROUTER_ID destino: (ROUTER_ID do primeiro salto, custo)}.
+    """
+    lower, upper = bounds
+    link_costs = composite_costs(metrics, weights_vector(weights), lower, upper)
+    if metric is not None:
+        bits, scale = metric
+        link_costs = quantize_array(link_costs, scale, bits)
+    graph = topology.graph_for(link_costs, integer=metric is not None)
+    root_idx = topology.ids.index(root)
+    dist, parent = spf_csr(graph, root_idx)
+    hops = first_hops_csr(dist, parent, root_idx)
+    router_id = topology.ids.router_id
+    return {router_id(v): (router_id(hops[v]), dist[v])
+            for v in range(len(dist)) if hops[v] >= 0 and dist[v] != INF}
+
+
+# Estado dos workers, herdado no fork e nunca alterado.
+_worker_topology = None
+
+
+def _init_worker(topology):
+    global _worker_topology
+    _worker_topology = topology
+
+
+def _worker_spf(root, weights, metrics, bounds, metric):
+    return profile_spf(_worker_topology, root, weights, metrics, bounds, metric)
+
+
+class MultiTopologySPF:
+    """Calcula um RIB por perfil, em paralelo quando há mais de um perfil.
+
+    Com `workers=0` tudo roda no processo atual (útil em topologias pequenas,
+    em que o custo de despachar para o pool supera o do SPF).
+    """
+
+    def __init__(self, profiles, workers=None):
+        self.profiles = list(profiles)
+        if workers is None:
+            workers = min(len(self.profiles), os.cpu_count() or 1)
+        self.workers = workers if len(self.profiles) > 1 else 0
+        self._topology = None
+        self._pool = None
+
+    def set_topology(self, topology):
+        """Troca a topologia; os workers são recriados para herdá-la."""
+        self.close()
+        self._topology = topology
+        if self.workers:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(topology,),
+            )
+
+    def compute(self, root, engine):
+        """Roda o SPF de todos os perfis com as métricas atuais do `engine`.
+
+        Se o motor removeu enlaces desde que a topologia foi montada, as
+        colunas são refeitas (e os workers recriados) antes da rodada.
+        """
+        if self._topology is None:
+            raise RuntimeError("topologia não definida")
+        if self._topology.layout_version != engine.layout_version:
+            self.set_topology(self._topology.rebind(engine))
+        metrics = engine.metrics_view().copy()
+        bounds = engine.bounds
+        metric = (engine.metric_bits, engine.metric_scale) if engine.integer else None
+
+        if self._pool is None:
+            return {p.name: profile_spf(self._topology, root, p.weights, metrics, bounds, metric)
+                    for p in self.profiles}
+        futures = {p.name: self._pool.submit(_worker_spf, root, p.weights, metrics, bounds, metric)
+                   for p in self.profiles}
+        return {name: f.result() for name, f in futures.items()}
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
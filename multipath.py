@@ -0,0 +1,91 @@
+"""ECMP e multipath de custo quase igual com pesos por nexthop.
+
+Para cada destino, todo vizinho `n` da raiz é um candidato com custo
+`w(raiz, n) + D(n, destino)`. Ficam os candidatos dentro de `tolerance`
+(relativa) do melhor custo e que sejam downstream, `D(n, d) < D(raiz, d)`,
+condição que impede laços mesmo quando o caminho não é o mínimo. O peso de
+cada nexthop é inversamente proporcional ao custo pelo vizinho.
+
+A desigualdade estrita só inclui todo caminho mínimo se nenhum enlace custar
+zero (o custo composto chega a 0.0 num enlace perfeito); por isso o cálculo
+usa os custos elevados a MIN_LINK_COST, como o modo de métrica inteira já faz
+ao saturar a métrica em 1.
+"""
+
+from spf import dijkstra
+
+DEFAULT_TOLERANCE = 0.0
+DEFAULT_MAX_PATHS = 4
+# Pesos de nexthop aceitos pelo kernel: 1..256.
+MAX_NEXTHOP_WEIGHT = 255
+# Custo mínimo de um enlace no cálculo de multipath (ver docstring do módulo).
+MIN_LINK_COST = 1e-6
+
+
+def multipath_settings(config):
+    block = config.get("multipath", {})
+    return (float(block.get("tolerance", DEFAULT_TOLERANCE)),
+            int(block.get("max_paths", DEFAULT_MAX_PATHS)))
+
+
+def positive_costs(graph, minimum=MIN_LINK_COST):
+    """`graph` com os custos abaixo de `minimum` elevados a ele (o próprio
+    `graph` se nenhum for)."""
+    if all(w >= minimum for links in graph.values() for w in links.values()):
+        return graph
+    return {u: {v: max(w, minimum) for v, w in links.items()} for u, links in graph.items()}
+
+
+def neighbor_distances(graph, root):
+    """Distâncias a partir de cada vizinho da raiz (um SPF por vizinho).
+
+    Também usado no cálculo de alternativas livres de laço.
+    """
+    return {n: dijkstra(graph, n)[0] for n in graph.get(root, {})}
+
+
+def nexthop_weights(costs):
+    """Pesos inteiros em [1, MAX_NEXTHOP_WEIGHT] inversamente proporcionais a `costs`."""
+    positive = [c for c in costs if c > 0]
+    if len(positive) < len(costs):
+        # Caminhos de custo zero dominam: dividem o tráfego igualmente.
+        return [MAX_NEXTHOP_WEIGHT if c <= 0 else 1 for c in costs]
+    best = min(positive)
+    return [max(1, round(MAX_NEXTHOP_WEIGHT * best / c)) for c in costs]
+
+
+def multipath_rib(graph, root, tolerance=DEFAULT_TOLERANCE, max_paths=DEFAULT_MAX_PATHS,
+                  root_dist=None, neighbor_dist=None):
+    """RIB multipath: {destino: (melhor custo, ((vizinho, peso), ...))}.
+
+    `root_dist` e `neighbor_dist` podem ser passados para reaproveitar SPFs já
+    calculados sobre `positive_costs(graph)`. Com `tolerance=0` só caminhos de
+    custo exatamente igual (ECMP) são combinados.
+    """
+    graph = positive_costs(graph)
+    if root_dist is None:
+        root_dist = dijkstra(graph, root)[0]
+    if neighbor_dist is None:
+        neighbor_dist = neighbor_distances(graph, root)
+    links = graph.get(root, {})
+
+    rib = {}
+    for dest, d_root in root_dist.items():
+        if dest == root:
+            continue
+        candidates = []
+        for n, dist_n in neighbor_dist.items():
+            d_n = dist_n.get(dest)
+            if d_n is None:
+                continue
+            if d_n < d_root:
+                candidates.append((links[n] + d_n, n))
+        if not candidates:
+            continue
+        candidates.sort()
+        best = candidates[0][0]
+        limit = best + tolerance * best
+        chosen = [(c, n) for c, n in candidates if c <= limit][:max_paths]
+        weights = nexthop_weights([c for c, _ in chosen])
+        rib[dest] = (best, tuple((n, w) for (_, n), w in zip(chosen, weights)))
+    return rib
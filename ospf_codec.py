@@ -0,0 +1,250 @@
+"""Codec dos pacotes OSPFv2 com `struct` pré-compilado e `memoryview`.
+
+Hello, DBD, LSR, LSU e LSAck são codificados e decodificados sem objetos de
+pacote intermediários: cada formato é um `struct.Struct` criado uma vez, a
+codificação escreve num bytearray pré-dimensionado com `pack_into` e a
+decodificação lê de um memoryview sem copiar o datagrama. Os LSAs dentro de
+LSUs usam o formato de `lsdb` (router-LSA e MetricDelta).
+
+Hellos podem levar, num bloco LLS (RFC 5613) após o pacote OSPF, número de
+sequência e carimbos de tempo para a medição passiva de RTT, jitter e perda
+(ver hello_metrics).
+
+O scapy fica só como dissecador para depuração (`dissect`), se instalado.
+"""
+
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+from lsdb import LSA_HEADER, MAX_AGE, decode_lsa, intern_router_id
+
+try:
+    from scapy.contrib.ospf import OSPF_Hdr
+except ImportError:  # scapy é opcional
+    OSPF_Hdr = None
+
+OSPF_VERSION = 2
+HELLO, DBD, LSR, LSU, LSACK = 1, 2, 3, 4, 5
+
+IP_HEADER_SIZE = 20
+# versão, tipo, tamanho, router-id, área, checksum, autype, autenticação.
+OSPF_HEADER = struct.Struct("!BBHIIHH8s")
+_HELLO = struct.Struct("!IHBBIII")
+_DBD = struct.Struct("!HBBI")
+_LSR_ENTRY = struct.Struct("!III")
+_LSU_COUNT = struct.Struct("!I")
+_ROUTER_ID = struct.Struct("!I")
+_CHECKSUM_OFFSET = 12
+_AUTH = slice(16, 24)
+
+DBD_INIT, DBD_MORE, DBD_MASTER = 0x4, 0x2, 0x1
+
+# Link-Local Signaling: bit L nas opções, cabeçalho (checksum, tamanho em
+# palavras de 32 bits) e TLVs (tipo, tamanho em bytes).
+OPTION_LLS = 0x10
+_LLS_HEADER = struct.Struct("!HH")
+_LLS_TLV = struct.Struct("!HH")
+# TLV de uso privado: seq, envio (ns), carimbo do vizinho ecoado (ns) e
+# tempo em µs entre receber esse carimbo e enviar este hello.
+HELLO_TIMING_TLV = 32768
+_HELLO_TIMING = struct.Struct("!IQQI")
+
+Header = namedtuple("Header", "type router_id area_id")
+Hello = namedtuple("Hello", "netmask hello_interval options priority dead_interval "
+                            "dr bdr neighbors timing", defaults=(None,))
+HelloTiming = namedtuple("HelloTiming", "seq tx_ns echo_ns echo_delay_us")
+DatabaseDescription = namedtuple("DatabaseDescription", "mtu options flags seq headers")
+LSAHeader = namedtuple("LSAHeader", "age options ls_type ls_id adv_router seq checksum length")
+
+
+def inet_checksum(data):
+    """Checksum da Internet (complemento de 1 da soma de palavras de 16 bits)."""
+    if len(data) % 2:
+        data = bytes(data) + b"\0"
+    words = array("H", bytes(data))
+    if sys.byteorder == "little":
+        words.byteswap()
+    total = sum(words)
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+def _finish(out, packet_type, router_id, area_id):
+    OSPF_HEADER.pack_into(out, 0, OSPF_VERSION, packet_type, len(out),
+                          intern_router_id(router_id), intern_router_id(area_id), 0, 0, bytes(8))
+    # O checksum cobre o pacote inteiro exceto o campo de autenticação (zerado).
+    struct.pack_into("!H", out, _CHECKSUM_OFFSET, inet_checksum(out))
+    return bytes(out)
+
+
+def encode_hello(router_id, hello, area_id=0):
+    """Hello; com `hello.timing` (HelloTiming) acrescenta o bloco LLS."""
+    out = bytearray(OSPF_HEADER.size + _HELLO.size + 4 * len(hello.neighbors))
+    options = hello.options if hello.timing is None else hello.options | OPTION_LLS
+    _HELLO.pack_into(out, OSPF_HEADER.size, hello.netmask, hello.hello_interval, options,
+                     hello.priority, hello.dead_interval, hello.dr, hello.bdr)
+    pos = OSPF_HEADER.size + _HELLO.size
+    for neighbor in hello.neighbors:
+        _ROUTER_ID.pack_into(out, pos, intern_router_id(neighbor))
+        pos += 4
+    packet = _finish(out, HELLO, router_id, area_id)
+    if hello.timing is None:
+        return packet
+    return packet + _encode_lls(HELLO_TIMING_TLV, _HELLO_TIMING.pack(*hello.timing))
+
+
+def _encode_lls(tlv_type, value):
+    block = bytearray(_LLS_HEADER.size + _LLS_TLV.size + len(value))
+    _LLS_HEADER.pack_into(block, 0, 0, len(block) // 4)
+    _LLS_TLV.pack_into(block, _LLS_HEADER.size, tlv_type, len(value))
+    block[_LLS_HEADER.size + _LLS_TLV.size:] = value
+    struct.pack_into("!H", block, 0, inet_checksum(block))
+    return bytes(block)
+
+
+def _decode_lls_timing(view):
+    """HelloTiming do bloco LLS, se presente e válido."""
+    if len(view) < _LLS_HEADER.size:
+        return None
+    checksum, words = _LLS_HEADER.unpack_from(view, 0)
+    end = words * 4
+    if end > len(view) or (checksum and inet_checksum(view[:end])):
+        return None
+    pos = _LLS_HEADER.size
+    while pos + _LLS_TLV.size <= end:
+        tlv_type, length = _LLS_TLV.unpack_from(view, pos)
+        pos += _LLS_TLV.size
+        if tlv_type == HELLO_TIMING_TLV and length == _HELLO_TIMING.size:
+            return HelloTiming(*_HELLO_TIMING.unpack_from(view, pos))
+        pos += (length + 3) & ~3
+    return None
+
+
+def _pack_lsa_headers(out, pos, headers):
+    for header in headers:
+        LSA_HEADER.pack_into(out, pos, *header)
+        pos += LSA_HEADER.size
+
+
+def encode_dbd(router_id, dbd, area_id=0):
+    out = bytearray(OSPF_HEADER.size + _DBD.size + LSA_HEADER.size * len(dbd.headers))
+    _DBD.pack_into(out, OSPF_HEADER.size, dbd.mtu, dbd.options, dbd.flags, dbd.seq)
+    _pack_lsa_headers(out, OSPF_HEADER.size + _DBD.size, dbd.headers)
+    return _finish(out, DBD, router_id, area_id)
+
+
+def encode_lsr(router_id, requests, area_id=0):
+    """`requests`: sequência de (ls_type, ls_id, adv_router)."""
+    out = bytearray(OSPF_HEADER.size + _LSR_ENTRY.size * len(requests))
+    pos = OSPF_HEADER.size
+    for request in requests:
+        _LSR_ENTRY.pack_into(out, pos, *request)
+        pos += _LSR_ENTRY.size
+    return _finish(out, LSR, router_id, area_id)
+
+
+def lsu_body(lsas):
+    """Corpo de um LSU a partir de LSAs já codificados (bytes)."""
+    return _LSU_COUNT.pack(len(lsas)) + b"".join(lsas)
+
+
+def lsu_capacity(mtu):
+    """Bytes disponíveis para LSAs num LSU que cabe em `mtu`."""
+    return mtu - IP_HEADER_SIZE - OSPF_HEADER.size - _LSU_COUNT.size
+
+
+def encode_lsu(router_id, lsas, area_id=0):
+    """LSU com LSAs codificados (bytes) ou objetos com `to_bytes()`."""
+    return frame(LSU, router_id, lsu_body([lsa if isinstance(lsa, (bytes, bytearray))
+                                           else lsa.to_bytes() for lsa in lsas]), area_id)
+
+
+def encode_lsack(router_id, headers, area_id=0):
+    out = bytearray(OSPF_HEADER.size + LSA_HEADER.size * len(headers))
+    _pack_lsa_headers(out, OSPF_HEADER.size, headers)
+    return _finish(out, LSACK, router_id, area_id)
+
+
+def frame(packet_type, router_id, body, area_id=0):
+    """Prefixa `body` (corpo já codificado) com o cabeçalho OSPF."""
+    out = bytearray(OSPF_HEADER.size + len(body))
+    out[OSPF_HEADER.size:] = body
+    return _finish(out, packet_type, router_id, area_id)
+
+
+def lsa_header(lsa):
+    """LSAHeader de um LSA (para DBD e LSAck); a idade satura em MaxAge."""
+    return LSAHeader(min(lsa.age, MAX_AGE), 0, lsa.ls_type, lsa.ls_id, lsa.adv_router,
+                     lsa.seq & 0xFFFFFFFF, lsa.checksum, lsa.size)
+
+
+def _lsa_headers(view, pos, end):
+    return [LSAHeader(*fields) for fields in LSA_HEADER.iter_unpack(view[pos:end])]
+
+
+def decode_lsu_body(body):
+    """LSAs de um corpo de LSU (bytes ou memoryview)."""
+    (count,) = _LSU_COUNT.unpack_from(body, 0)
+    pos = _LSU_COUNT.size
+    lsas = []
+    for _ in range(count):
+        lsa, length = decode_lsa(body, pos)
+        lsas.append(lsa)
+        pos += length
+    return lsas
+
+
+def decode(data, verify=True):
+    """Decodifica um pacote OSPF; retorna (Header, conteúdo).
+
+    O conteúdo depende do tipo: Hello, DatabaseDescription, lista de
+    (ls_type, ls_id, adv_router) no LSR, lista de LSAs no LSU e lista de
+    LSAHeader no LSAck.
+    """
+    view = memoryview(data)
+    version, packet_type, length, router_id, area_id, checksum, _, _ = \
+        OSPF_HEADER.unpack_from(view, 0)
+    if version != OSPF_VERSION:
+        raise ValueError(f"versão OSPF {version}")
+    if length > len(view) or length < OSPF_HEADER.size:
+        raise ValueError("pacote truncado")
+    view = view[:length]
+    if verify and checksum:
+        # Somado junto com o próprio checksum, um pacote íntegro dá 0.
+        covered = view
+        if any(view[_AUTH]):
+            covered = bytearray(view)
+            covered[_AUTH] = bytes(8)
+        if inet_checksum(covered):
+            raise ValueError("checksum inválido")
+    header = Header(packet_type, router_id, area_id)
+    pos = OSPF_HEADER.size
+
+    if packet_type == HELLO:
+        fields = _HELLO.unpack_from(view, pos)
+        pos += _HELLO.size
+        neighbors = [n for (n,) in _ROUTER_ID.iter_unpack(view[pos:length])]
+        timing = None
+        if fields[2] & OPTION_LLS:
+            timing = _decode_lls_timing(memoryview(data)[length:])
+        return header, Hello(*fields, neighbors, timing)
+    if packet_type == DBD:
+        fields = _DBD.unpack_from(view, pos)
+        return header, DatabaseDescription(*fields, _lsa_headers(view, pos + _DBD.size, length))
+    if packet_type == LSR:
+        return header, list(_LSR_ENTRY.iter_unpack(view[pos:length]))
+    if packet_type == LSU:
+        return header, decode_lsu_body(view[pos:length])
+    if packet_type == LSACK:
+        return header, _lsa_headers(view, pos, length)
+    raise ValueError(f"tipo de pacote OSPF desconhecido: {packet_type}")
+
+
+def dissect(data):
+    """Objeto scapy do pacote, para depuração (requer scapy)."""
+    if OSPF_Hdr is None:
+        raise RuntimeError("scapy não está instalado")
+    return OSPF_Hdr(bytes(data))
@@ -0,0 +1,110 @@
+"""Frentes de Pareto de caminhos com ponto de operação selecionável.
+
+As frentes de caminhos não dominados em (latência, perda, jitter, banda) são
+calculadas uma vez por destino com path_metrics; os `cost_weights` apenas
+escolhem um ponto de cada frente. Trocar os pesos em tempo de execução (ou
+por classe de tráfego) vira uma multiplicação de matriz em vez de um novo
+SPF na rede.
+"""
+
+import numpy as np
+
+from cost_engine import WEIGHT_KEYS, weights_vector
+from path_metrics import PathCost, path_metric_tree
+from spf import forwarding_path
+
+# As frentes não dependem dos pesos; estes só ordenam a busca e decidem quem
+# sai quando uma frente passa de `max_labels`.
+NEUTRAL_WEIGHTS = {k: 1.0 / len(WEIGHT_KEYS) for k in WEIGHT_KEYS}
+DEFAULT_MAX_LABELS = 256
+
+
+class ParetoFronts:
+    """Frentes de um roteador, empilhadas numa única matriz (pontos, 4).
+
+    As linhas de cada destino são contíguas; `select` calcula o custo de todos
+    os pontos com um único produto matriz-vetor e pega o mínimo de cada bloco.
+    """
+
+    def __init__(self, root, fronts, path_cost):
+        self.root = root
+        self.destinations = []
+        self.paths = []
+        offsets = []
+        rows = []
+        for dest, front in fronts.items():
+            if dest == root:
+                continue
+            self.destinations.append(dest)
+            offsets.append(len(rows))
+            for label, path in front:
+                rows.append(path_cost.normalized(label))
+                self.paths.append(path)
+        self.offsets = np.array(offsets, dtype=np.intp)
+        self.normalized = np.array(rows, dtype=float).reshape(-1, 4)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def select(self, cost_weights):
+        """{destino: (custo, caminho)} para o ponto de operação `cost_weights`."""
+        if not self.destinations:
+            return {}
+        costs = self.normalized @ weights_vector(cost_weights)
+        ends = np.append(self.offsets[1:], len(costs))
+        result = {}
+        for dest, start, end in zip(self.destinations, self.offsets.tolist(), ends.tolist()):
+            i = start + int(np.argmin(costs[start:end]))
+            result[dest] = (float(costs[i]), self.paths[i])
+        return result
+
+
+class ParetoRouteTable:
+    """Frentes de Pareto da raiz (e, sob demanda, dos demais roteadores).
+
+    As frentes dos outros roteadores só são calculadas para validar o
+    encaminhamento salto a salto e ficam em cache até `invalidate`; mudar os
+    pesos não invalida nada.
+    """
+
+    def __init__(self, graph, root, normalization, max_labels=DEFAULT_MAX_LABELS):
+        self.graph = graph
+        self.root = root
+        self.max_labels = max_labels
+        self._path_cost = PathCost(NEUTRAL_WEIGHTS, normalization)
+        self._fronts = {}
+
+    def invalidate(self, graph=None):
+        """Descarta as frentes (topologia ou métricas mudaram)."""
+        if graph is not None:
+            self.graph = graph
+        self._fronts.clear()
+
+    def fronts(self, router=None):
+        router = self.root if router is None else router
+        if router not in self._fronts:
+            _, fronts = path_metric_tree(self.graph, router, self._path_cost, self.max_labels)
+            self._fronts[router] = ParetoFronts(router, fronts, self._path_cost)
+        return self._fronts[router]
+
+    def select(self, cost_weights, validate=True):
+        """RIB {destino: (primeiro salto, custo)} para um conjunto de pesos."""
+        chosen = {self.root: self.fronts().select(cost_weights)}
+
+        def next_hop(router, dest):
+            if router not in chosen:
+                chosen[router] = self.fronts(router).select(cost_weights)
+            entry = chosen[router].get(dest)
+            return entry[1][1] if entry is not None else None
+
+        rib = {}
+        for dest, (cost, path) in chosen[self.root].items():
+            if validate and forwarding_path(self.root, dest, next_hop) is None:
+                continue
+            rib[dest] = (path[1], cost)
+        return rib
+
+    def select_profiles(self, profiles, validate=True):
+        """Um RIB por perfil (multi_topology.Profile ou qualquer objeto com
+        `name` e `weights`)."""
+        return {p.name: self.select(p.weights, validate) for p in profiles}
@@ -0,0 +1,161 @@
+"""SPF sobre métricas de caminho compostas corretamente.
+
+Somar os custos normalizados por enlace ignora como cada métrica se compõe ao
+longo de um caminho:
+
+- latência soma;
+- perda compõe multiplicativamente: 1 - ∏(1 - p);
+- jitter soma em quadratura: sqrt(Σ j²);
+- banda é o gargalo: min.
+
+Aqui cada rótulo carrega o vetor de métricas do caminho e os `cost_weights`
+são aplicados aos valores normalizados do caminho inteiro. Como esse custo
+não é uma soma por enlace, o cálculo é label-correcting: cada nó guarda o
+conjunto de rótulos não dominados (Pareto) e o melhor custo sai dele.
+"""
+
+import heapq
+import math
+from collections import namedtuple
+
+from cost_engine import METRIC_FIELDS, normalization_bounds, weights_vector
+from spf import forwarding_path
+
+DEFAULT_MAX_LABELS = 32
+
+# Métricas de um enlace: latência (ms), perda (fração), jitter (ms), banda (Mbps).
+LinkMetrics = namedtuple("LinkMetrics", "latency_ms loss jitter_ms bandwidth_mbps")
+# Métricas de um caminho, já compostas.
+PathMetrics = namedtuple("PathMetrics", "latency_ms loss_percent jitter_ms bandwidth_mbps")
+
+
+def metric_graph(adjacency, engine):
+    """Monta `graph[u][v] = LinkMetrics` a partir das métricas do `CostEngine`."""
+    metrics = engine.metrics_view()
+    rows = [METRIC_FIELDS.index(f) for f in
+            ("latency_ms", "packet_loss_percent", "jitter_ms", "bandwidth_mbps")]
+    graph = {}
+    for u, edges in adjacency.items():
+        out = graph.setdefault(u, {})
+        for v, key in edges.items():
+            lat, loss, jitter, bw = metrics[rows, engine.index_of(key)].tolist()
+            out[v] = LinkMetrics(lat, loss / 100.0, jitter, bw)
+    return graph
+
+
+class PathCost:
+    """Custo de caminho: pesos aplicados às métricas de caminho normalizadas.
+
+    Um rótulo é a tupla (latência, sobrevivência = ∏(1 - p), Σ jitter², banda).
+    As métricas que só pioram ao longo do caminho são saturadas no limite
+    superior da normalização; isso não altera nenhum custo futuro e deixa a
+    dominância mais forte.
+    """
+
+    def __init__(self, cost_weights, normalization):
+        self.weights = weights_vector(cost_weights).tolist()
+        lower, upper = normalization_bounds(normalization)
+        self.lower = lower.tolist()
+        self.upper = upper.tolist()
+        self._max_latency = self.upper[1]
+        self._min_survival = 1.0 - self.upper[2] / 100.0
+        self._max_jitter_sq = self.upper[3] ** 2
+        self._max_bandwidth = self.upper[0]
+
+    def origin(self):
+        return (0.0, 1.0, 0.0, self._max_bandwidth)
+
+    def extend(self, label, link):
+        lat, survival, jitter_sq, bw = label
+        return (min(lat + link.latency_ms, self._max_latency),
+                max(survival * (1.0 - link.loss), self._min_survival),
+                min(jitter_sq + link.jitter_ms * link.jitter_ms, self._max_jitter_sq),
+                min(bw, link.bandwidth_mbps, self._max_bandwidth))
+
+    def path_metrics(self, label):
+        lat, survival, jitter_sq, bw = label
+        return PathMetrics(lat, (1.0 - survival) * 100.0, math.sqrt(jitter_sq), bw)
+
+    def normalized(self, label):
+        values = self.path_metrics(label)
+        bw, lat, loss, jitter = values.bandwidth_mbps, values.latency_ms, \
+            values.loss_percent, values.jitter_ms
+        out = []
+        for i, v in enumerate((bw, lat, loss, jitter)):
+            lo, hi = self.lower[i], self.upper[i]
+            out.append((min(max(v, lo), hi) - lo) / (hi - lo))
+        out[0] = 1.0 - out[0]
+        return out
+
+    def cost(self, label):
+        return sum(w * n for w, n in zip(self.weights, self.normalized(label)))
+
+
+def dominates(a, b):
+    """`a` é no mínimo tão bom quanto `b` em todas as métricas."""
+    return a[0] <= b[0] and a[1] >= b[1] and a[2] <= b[2] and a[3] >= b[3]
+
+
+def path_metric_tree(graph, root, path_cost, max_labels=DEFAULT_MAX_LABELS):
+    """Melhor caminho (custo de caminho) da raiz para cada destino.
+
+    Retorna ({destino: (custo, PathMetrics, caminho)}, frentes), em que
+    `frentes[nó]` é a lista de (rótulo, caminho) não dominados do nó.
+    `max_labels` limita cada frente, mantendo os rótulos de menor custo;
+    sem o limite o resultado é exato.
+    """
+    origin = path_cost.origin()
+    fronts = {root: [(origin, (root,))]}
+    heap = [(0.0, 0, origin, (root,))]
+    counter = 1
+    while heap:
+        _, _, label, path = heapq.heappop(heap)
+        node = path[-1]
+        if (label, path) not in fronts.get(node, ()):
+            continue  # descartado por um rótulo melhor depois de enfileirado
+        for v, link in graph.get(node, {}).items():
+            if v in path:
+                continue
+            new = path_cost.extend(label, link)
+            front = fronts.setdefault(v, [])
+            if any(dominates(old, new) for old, _ in front):
+                continue
+            front[:] = [(old, p) for old, p in front if not dominates(new, old)]
+            new_path = path + (v,)
+            front.append((new, new_path))
+            cost = path_cost.cost(new)
+            if len(front) > max_labels:
+                front.sort(key=lambda entry: path_cost.cost(entry[0]))
+                dropped = front.pop()
+                if dropped[1] == new_path:
+                    continue
+            heapq.heappush(heap, (cost, counter, new, new_path))
+            counter += 1
+
+    tree = {}
+    for node, front in fronts.items():
+        label, path = min(front, key=lambda entry: path_cost.cost(entry[0]))
+        tree[node] = (path_cost.cost(label), path_cost.path_metrics(label), list(path))
+    return tree, fronts
+
+
+def path_metric_rib(graph, root, path_cost, max_labels=DEFAULT_MAX_LABELS):
+    """RIB por custo de caminho: {destino: (primeiro salto, custo)}.
+
+    O custo de caminho não tem subcaminhos ótimos; como em cspf, o
+    encaminhamento salto a salto é simulado com as árvores dos roteadores
+    seguintes e destinos com laço ficam de fora.
+    """
+    trees = {root: path_metric_tree(graph, root, path_cost, max_labels)[0]}
+
+    def next_hop(router, dest):
+        if router not in trees:
+            trees[router] = path_metric_tree(graph, router, path_cost, max_labels)[0]
+        entry = trees[router].get(dest)
+        return entry[2][1] if entry is not None else None
+
+    rib = {}
+    for dest, (cost, _, path) in trees[root].items():
+        if dest != root and forwarding_path(root, dest, next_hop) is not None:
+            rib[dest] = (path[1], cost)
+    return rib
@@ -0,0 +1,205 @@
+"""Flooding confiável: LSAcks atrasados em lote e retransmissão com RTO adaptativo.
+
+Acks: em vez de um LSAck por LSA, os cabeçalhos a confirmar para um vizinho
+se acumulam por até `ack_delay_s` (ou até encher um pacote) e saem juntos. O
+ack é seletivo: confirma exatamente as instâncias (chave, seq) recebidas.
+
+Retransmissão: cada LSA enviado a um vizinho fica na lista de retransmissão
+dele com um timer na roda de temporização (timer_wheel). O RTO segue a
+RFC 6298 sobre as amostras de RTT (envio até o ack, sem amostras de LSAs
+retransmitidos, regra de Karn) mais o atraso de ack do outro lado, e parte
+do RTT medido do enlace. Assim o RTO não é curto a ponto de retransmitir
+LSAs cujo ack só está atrasado, nem fixo nos 5 s do RxmtInterval, que
+deixariam um enlace com perda segundos sem se recuperar. Quando um timer
+vence, os LSAs do mesmo vizinho que também estão vencendo vão no mesmo LSU.
+"""
+
+import time
+
+from lsdb import LSA_HEADER
+from ospf_codec import IP_HEADER_SIZE, OSPF_HEADER, lsu_capacity
+from timer_wheel import KeyedTimers
+
+DEFAULT_ACK_DELAY_S = 0.05
+DEFAULT_MIN_RTO_S = 0.02
+DEFAULT_MAX_RTO_S = 5.0
+DEFAULT_INITIAL_RTT_S = 0.5
+DEFAULT_MTU = 1500
+
+
+def reliable_flooding_settings(config):
+    block = config.get("reliable_flooding") or {}
+
+    def seconds(key, default):
+        return block[key] / 1000.0 if key in block else default
+
+    return (seconds("ack_delay_ms", DEFAULT_ACK_DELAY_S), seconds("min_rto_ms", DEFAULT_MIN_RTO_S),
+            seconds("max_rto_ms", DEFAULT_MAX_RTO_S))
+
+
+def link_rtt_s(config, prefix):
+    """RTT inicial de um enlace a partir da latência (ida) em `links`."""
+    link = config.get("links", {}).get(prefix)
+    return 2 * link["latency_ms"] / 1000.0 if link else DEFAULT_INITIAL_RTT_S
+
+
+class RTOEstimator:
+    """SRTT/RTTVAR da RFC 6298 com piso, teto e o atraso de ack do vizinho."""
+
+    def __init__(self, initial_rtt_s=DEFAULT_INITIAL_RTT_S, ack_delay_s=DEFAULT_ACK_DELAY_S,
+                 min_rto_s=DEFAULT_MIN_RTO_S, max_rto_s=DEFAULT_MAX_RTO_S):
+        self.ack_delay_s = ack_delay_s
+        self.min_rto_s = min_rto_s
+        self.max_rto_s = max_rto_s
+        self.samples = 0
+        self.seed(initial_rtt_s)
+
+    def seed(self, rtt_s):
+        """(Re)inicia a partir de uma medição do enlace (ex.: RTT dos hellos)
+        enquanto não houver amostras de ack."""
+        if not self.samples:
+            self.srtt = rtt_s
+            self.rttvar = rtt_s / 2
+
+    def sample(self, rtt_s):
+        if not self.samples:
+            self.srtt, self.rttvar = rtt_s, rtt_s / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt_s)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt_s
+        self.samples += 1
+
+    @property
+    def rto(self):
+        # As amostras variam com o enchimento dos acks em lote; somar o atraso
+        # máximo evita retransmitir um LSA cujo ack só está esperando.
+        rto = self.srtt + 4 * self.rttvar + self.ack_delay_s
+        return min(max(rto, self.min_rto_s), self.max_rto_s)
+
+
+class AckBatcher:
+    """LSAcks atrasados e em lote para um vizinho.
+
+    `send_ack(cabeçalhos)` recebe a lista de LSAHeader de um pacote.
+    """
+
+    def __init__(self, send_ack, wheel, delay_s=DEFAULT_ACK_DELAY_S, mtu=DEFAULT_MTU):
+        self.send_ack = send_ack
+        self.wheel = wheel
+        self.delay_s = delay_s
+        self.per_packet = (mtu - IP_HEADER_SIZE - OSPF_HEADER.size) // LSA_HEADER.size
+        self._pending = {}
+        self._timer = None
+        # Instrumentação.
+        self.packets = 0
+        self.acked = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def ack(self, header):
+        """Agenda o ack de um LSA recebido (LSAHeader); duplicatas se fundem."""
+        self._pending[(header.ls_type, header.ls_id, header.adv_router, header.seq)] = header
+        if len(self._pending) >= self.per_packet:
+            self.flush()
+        elif self._timer is None or not self._timer.active:
+            self._timer = self.wheel.schedule(self.delay_s, self.flush)
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        headers = list(self._pending.values())
+        self._pending.clear()
+        for start in range(0, len(headers), self.per_packet):
+            batch = headers[start:start + self.per_packet]
+            self.send_ack(batch)
+            self.packets += 1
+            self.acked += len(batch)
+
+
+class _Entry:
+    __slots__ = ("seq", "data", "sent_at", "retransmits", "rto")
+
+    def __init__(self, seq, data, sent_at, rto):
+        self.seq = seq
+        self.data = data
+        self.sent_at = sent_at
+        self.retransmits = 0
+        self.rto = rto
+
+
+class RetransmissionList:
+    """LSAs enviados a um vizinho e ainda não confirmados.
+
+    `send_lsas(lista de LSAs codificados)` retransmite num único LSU (ou em
+    vários, se não couberem no MTU).
+    """
+
+    def __init__(self, send_lsas, wheel, estimator=None, mtu=DEFAULT_MTU, clock=time.monotonic):
+        self.send_lsas = send_lsas
+        self.estimator = estimator or RTOEstimator()
+        self.capacity = lsu_capacity(mtu)
+        self._clock = clock
+        self._entries = {}
+        self._timers = KeyedTimers(wheel, self._expired)
+        # Instrumentação.
+        self.retransmitted = 0
+        self.packets = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def add(self, key, seq, data):
+        """Registra o envio de uma instância (substitui a anterior da chave)."""
+        rto = self.estimator.rto
+        self._entries[key] = _Entry(seq, data, self._clock(), rto)
+        self._timers.arm(key, rto)
+
+    def acknowledge(self, key, seq):
+        """Ack do vizinho; retorna True se confirmou a instância pendente."""
+        entry = self._entries.get(key)
+        if entry is None or entry.seq != seq:
+            return False
+        del self._entries[key]
+        self._timers.disarm(key)
+        if not entry.retransmits:
+            self.estimator.sample(self._clock() - entry.sent_at)
+        return True
+
+    def discard(self, key):
+        self._entries.pop(key, None)
+        self._timers.disarm(key)
+
+    def clear(self):
+        """Adjacência caiu."""
+        for key in list(self._entries):
+            self.discard(key)
+
+    def _expired(self, key):
+        now = self._clock()
+        # Leva junto quem está vencendo agora (dentro do RTO mínimo).
+        horizon = now + self.estimator.min_rto_s
+        due = [key] + [k for k, e in self._entries.items()
+                       if k != key and e.sent_at + e.rto <= horizon]
+        batch, size = [], 0
+        for k in due:
+            entry = self._entries[k]
+            if batch and size + len(entry.data) > self.capacity:
+                self._send(batch)
+                batch, size = [], 0
+            batch.append(entry.data)
+            size += len(entry.data)
+            entry.retransmits += 1
+            entry.sent_at = now
+            entry.rto = min(entry.rto * 2, self.estimator.max_rto_s)
+            self._timers.arm(k, entry.rto)
+        self._send(batch)
+
+    def _send(self, batch):
+        self.send_lsas(batch)
+        self.packets += 1
+        self.retransmitted += len(batch)
@@ -0,0 +1,153 @@
+"""Filas de saída por interface com prioridade por classe de pacote.
+
+Uma troca de banco de dados grande ou uma tempestade de flooding não pode
+atrasar hellos (o vizinho declararia a adjacência morta) nem acks (o outro
+lado retransmitiria). Cada interface tem uma fila por classe e o escalonador
+serve sempre a classe mais prioritária não vazia:
+
+    HELLO (hellos e BFD) > LSACK > LSU > DBD (e LSR)
+
+Para DBD não ficar parado durante uma tempestade de LSUs, depois de
+`fair_every` envios seguidos de LSACK/LSU com DBD esperando, um DBD sai.
+Hellos nunca esperam por isso. O envio é limitado por um balde de fichas da
+interface; sem fichas, os pacotes aguardam na fila.
+
+A instrumentação guarda, por classe, histogramas da profundidade da fila
+(no momento da chegada) e do tempo de espera, em potências de 2.
+"""
+
+import time
+from collections import deque
+
+from flooding import TokenBucket
+from ospf_codec import DBD, HELLO, LSACK, LSR, LSU
+
+CLASSES = ("hello", "lsack", "lsu", "dbd")
+HELLO_CLASS, LSACK_CLASS, LSU_CLASS, DBD_CLASS = range(len(CLASSES))
+_CLASS_OF_TYPE = {HELLO: HELLO_CLASS, LSACK: LSACK_CLASS, LSU: LSU_CLASS,
+                  DBD: DBD_CLASS, LSR: DBD_CLASS}
+
+DEFAULT_RATE_PPS = 1000.0
+DEFAULT_BURST = 50
+DEFAULT_LIMITS = {"hello": 16, "lsack": 256, "lsu": 1024, "dbd": 256}
+DEFAULT_FAIR_EVERY = 8
+
+
+def send_queue_settings(config):
+    block = config.get("send_queues") or {}
+    limits = dict(DEFAULT_LIMITS, **block.get("limits", {}))
+    return (float(block.get("rate_pps", DEFAULT_RATE_PPS)), int(block.get("burst", DEFAULT_BURST)),
+            limits, int(block.get("fair_every", DEFAULT_FAIR_EVERY)))
+
+
+def packet_class(packet):
+    """Classe de um pacote OSPF codificado (tipo no segundo byte)."""
+    return _CLASS_OF_TYPE[packet[1]]
+
+
+class Log2Histogram:
+    """Histograma em baldes de potência de 2: o balde k conta valores em
+    [2**(k-1), 2**k) (o balde 0 conta zeros)."""
+
+    def __init__(self):
+        self.counts = []
+        self.total = 0
+        self.max = 0
+
+    def observe(self, value):
+        value = int(value)
+        k = value.bit_length()
+        if k >= len(self.counts):
+            self.counts.extend([0] * (k + 1 - len(self.counts)))
+        self.counts[k] += 1
+        self.total += 1
+        self.max = max(self.max, value)
+
+    def snapshot(self):
+        """{limite superior exclusivo: contagem} dos baldes não vazios."""
+        return {1 << k: count for k, count in enumerate(self.counts) if count}
+
+
+class ClassQueue:
+    __slots__ = ("name", "limit", "packets", "sent", "dropped", "depth", "wait_us")
+
+    def __init__(self, name, limit):
+        self.name = name
+        self.limit = limit
+        self.packets = deque()
+        self.sent = 0
+        self.dropped = 0
+        self.depth = Log2Histogram()
+        self.wait_us = Log2Histogram()
+
+
+class PrioritySendQueue:
+    """Filas de saída de uma interface. `send(pacote)` faz o envio de fato."""
+
+    def __init__(self, name, send, rate_pps=DEFAULT_RATE_PPS, burst=DEFAULT_BURST,
+                 limits=None, fair_every=DEFAULT_FAIR_EVERY, clock=time.monotonic):
+        self.name = name
+        self.send = send
+        self.bucket = TokenBucket(rate_pps, burst, clock)
+        self.fair_every = fair_every
+        self._clock = clock
+        limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.queues = [ClassQueue(name, limits[name]) for name in CLASSES]
+        self._since_dbd = 0
+
+    @classmethod
+    def from_config(cls, name, send, config, **kwargs):
+        rate_pps, burst, limits, fair_every = send_queue_settings(config)
+        return cls(name, send, rate_pps, burst, limits, fair_every, **kwargs)
+
+    def __len__(self):
+        return sum(len(q.packets) for q in self.queues)
+
+    def enqueue(self, packet, cls=None, now=None):
+        """Enfileira um pacote; sem `cls`, a classe vem do tipo OSPF.
+
+        Retorna False se a fila da classe está cheia (o pacote é descartado).
+        """
+        queue = self.queues[packet_class(packet) if cls is None else cls]
+        queue.depth.observe(len(queue.packets))
+        if len(queue.packets) >= queue.limit:
+            queue.dropped += 1
+            return False
+        queue.packets.append((self._clock() if now is None else now, packet))
+        return True
+
+    def _next_queue(self):
+        hello, lsack, lsu, dbd = self.queues
+        if hello.packets:
+            return hello
+        if dbd.packets and (self._since_dbd >= self.fair_every
+                            or not (lsack.packets or lsu.packets)):
+            self._since_dbd = 0
+            return dbd
+        if dbd.packets:
+            self._since_dbd += 1
+        return lsack if lsack.packets else lsu
+
+    def poll(self, now=None):
+        """Envia o que as fichas permitirem, por prioridade; retorna quantos."""
+        now = self._clock() if now is None else now
+        sent = 0
+        while len(self) and self.bucket.take(now):
+            queue = self._next_queue()
+            enqueued_at, packet = queue.packets.popleft()
+            queue.wait_us.observe((now - enqueued_at) * 1e6)
+            queue.sent += 1
+            self.send(packet)
+            sent += 1
+        return sent
+
+    def next_deadline(self):
+        return self.bucket.ready_at() if len(self) else None
+
+    def stats(self):
+        """Por classe: enviados, descartados, profundidade atual e histogramas
+        de profundidade na chegada e de espera em µs."""
+        return {q.name: {"sent": q.sent, "dropped": q.dropped, "queued": len(q.packets),
+                         "depth": q.depth.snapshot(), "wait_us": q.wait_us.snapshot(),
+                         "max_wait_us": q.wait_us.max}
+                for q in self.queues}
@@ -0,0 +1,222 @@
+"""Snapshot persistente do LSDB, do RIB e dos vizinhos para warm restart.
+
+O arquivo é binário: um cabeçalho, uma tabela de seções e, em cada seção, os
+bytes crus de uma coluna do LSDB (array.tobytes) ou registros struct do RIB e
+dos vizinhos. Na carga o arquivo é mapeado com mmap e as colunas são copiadas
+direto do mapeamento, sem parsing por LSA.
+
+`PeriodicSnapshot` grava o estado a cada `interval_s` segundos pela roda de
+temporização (timer_wheel).
+
+No warm restart as rotas do kernel não são apagadas: o RIB do snapshot é
+adotado pelo KernelFib e o primeiro SPF só corrige as diferenças. Com o LSDB
+recarregado, a sincronização por resumos (lsdb_sync) troca só os deltas com
+os vizinhos.
+"""
+
+import logging
+import mmap
+import os
+import socket
+import struct
+import sys
+import time
+from array import array
+from collections import namedtuple
+
+from lsdb import LSDB, MAX_AGE, LinkTable
+
+log = logging.getLogger(__name__)
+
+MAGIC = b"OGSN"
+# 2: métrica dos enlaces em float64.
+VERSION = 2
+DEFAULT_INTERVAL_S = 5.0
+
+_HEADER = struct.Struct("!4sHHBd")
+_SECTION = struct.Struct("!24scQQ")
+_ROUTE = struct.Struct("!4sBB")
+_NEXTHOP = struct.Struct("!4sI")
+_NEIGHBOR = struct.Struct("!I4sIB")
+_BYTE_ORDER = {"little": 0, "big": 1}[sys.byteorder]
+
+# Seções sem as quais o snapshot não reconstrói o estado.
+REQUIRED_SECTIONS = (("rib", "neighbors") + tuple(name for name, _ in LSDB._HEADER)
+                     + tuple("link_" + name for name in LinkTable.__slots__))
+
+Neighbor = namedtuple("Neighbor", "router_id address ifindex state")
+Snapshot = namedtuple("Snapshot", "lsdb rib neighbors saved_at")
+
+
+def snapshot_settings(config):
+    block = config.get("snapshot") or {}
+    return block.get("path"), float(block.get("interval_s", DEFAULT_INTERVAL_S))
+
+
+def _encode_rib(rib):
+    out = bytearray()
+    for prefix, nexthops in rib.items():
+        address, length = prefix.split("/")
+        out += _ROUTE.pack(socket.inet_aton(address), int(length), len(nexthops))
+        for gateway, weight in nexthops:
+            out += _NEXTHOP.pack(socket.inet_aton(gateway or "0.0.0.0"), weight)
+    return bytes(out)
+
+
+def _decode_rib(data):
+    rib = {}
+    pos = 0
+    while pos < len(data):
+        address, length, count = _ROUTE.unpack_from(data, pos)
+        pos += _ROUTE.size
+        nexthops = []
+        for _ in range(count):
+            gateway, weight = _NEXTHOP.unpack_from(data, pos)
+            pos += _NEXTHOP.size
+            gateway = socket.inet_ntoa(gateway)
+            nexthops.append((None if gateway == "0.0.0.0" else gateway, weight))
+        rib[f"{socket.inet_ntoa(address)}/{length}"] = tuple(nexthops)
+    return rib
+
+
+def _encode_neighbors(neighbors):
+    return b"".join(_NEIGHBOR.pack(n.router_id, socket.inet_aton(n.address), n.ifindex, n.state)
+                    for n in neighbors)
+
+
+def _decode_neighbors(data):
+    return [Neighbor(rid, socket.inet_ntoa(addr), ifindex, state)
+            for rid, addr, ifindex, state in _NEIGHBOR.iter_unpack(data)]
+
+
+def save_snapshot(path, lsdb, rib=None, neighbors=()):
+    """Grava o snapshot de forma atômica (arquivo temporário + rename)."""
+    sections = [(name, column.typecode, column.tobytes())
+                for name, column in lsdb.export_columns().items()]
+    sections.append(("rib", "B", _encode_rib(rib or {})))
+    sections.append(("neighbors", "B", _encode_neighbors(neighbors)))
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = bytearray()
+    for name, typecode, data in sections:
+        table += _SECTION.pack(name.encode(), typecode.encode(), offset, len(data))
+        offset += len(data)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(sections), _BYTE_ORDER, time.time()))
+        f.write(table)
+        for _, _, data in sections:
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_snapshot(path, clock=time.monotonic):
+    """Carrega um snapshot; as idades dos LSAs avançam o tempo em que o
+    roteador ficou fora do ar."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, count, byte_order, saved_at = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("snapshot com formato desconhecido")
+        if byte_order != _BYTE_ORDER:
+            raise ValueError("snapshot gravado em outra arquitetura")
+
+        columns = {}
+        view = memoryview(mm)
+        try:
+            for i in range(count):
+                name, typecode, offset, length = _SECTION.unpack_from(
+                    mm, _HEADER.size + i * _SECTION.size)
+                name = name.rstrip(b"\0").decode()
+                column = array(typecode.decode())
+                column.frombytes(view[offset:offset + length])
+                columns[name] = column
+        finally:
+            view.release()
+
+    missing = [name for name in REQUIRED_SECTIONS if name not in columns]
+    if missing:
+        raise ValueError(f"snapshot sem as seções {missing!r}")
+    rows = {len(columns[name]) for name, _ in LSDB._HEADER}
+    if len(rows) != 1:
+        raise ValueError("colunas do LSDB com tamanhos diferentes")
+
+    rib = _decode_rib(columns.pop("rib").tobytes())
+    neighbors = _decode_neighbors(columns.pop("neighbors").tobytes())
+    elapsed = max(0, int(time.time() - saved_at))
+    columns["age"] = array("H", (min(age + elapsed, MAX_AGE) for age in columns["age"]))
+    return Snapshot(LSDB.from_columns(columns, clock), rib, neighbors, saved_at)
+
+
+def warm_restart(path, fib=None, clock=time.monotonic):
+    """Tenta retomar do snapshot; retorna None para partida a frio.
+
+    Com `fib`, as rotas do snapshot são adotadas sem tocar no kernel.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        snapshot = load_snapshot(path, clock)
+    except (OSError, ValueError, struct.error) as e:
+        log.warning("snapshot %s ignorado: %s", path, e)
+        return None
+    if fib is not None:
+        fib.adopt(snapshot.rib)
+    return snapshot
+
+
+class PeriodicSnapshot:
+    """Grava snapshots periódicos agendados numa roda de temporização.
+
+    `state()` devolve (lsdb, rib, vizinhos) no momento da gravação; passe
+    `LSDB.freeze()` para gravar uma versão consistente sem bloquear o
+    flooding. Falhas de E/S são registradas e a próxima gravação continua
+    agendada.
+    """
+
+    def __init__(self, wheel, path, state, interval_s=DEFAULT_INTERVAL_S):
+        self.wheel = wheel
+        self.path = path
+        self.state = state
+        self.interval_s = interval_s
+        self._timer = None
+        # Instrumentação.
+        self.saved = 0
+        self.failures = 0
+
+    @classmethod
+    def from_config(cls, wheel, config, state):
+        """None se o bloco `snapshot` não tiver `path`."""
+        path, interval_s = snapshot_settings(config)
+        return cls(wheel, path, state, interval_s) if path else None
+
+    def start(self):
+        if self._timer is None or not self._timer.active:
+            self._timer = self.wheel.schedule(self.interval_s, self._save)
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def save(self):
+        """Grava agora (ex.: no desligamento); retorna True se gravou."""
+        lsdb, rib, neighbors = self.state()
+        try:
+            save_snapshot(self.path, lsdb, rib, neighbors)
+        except OSError as e:
+            self.failures += 1
+            log.warning("falha ao gravar o snapshot %s: %s", self.path, e)
+            return False
+        self.saved += 1
+        return True
+
+    def _save(self):
+        self._timer = None
+        self.save()
+        self.start()
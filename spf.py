@@ -0,0 +1,367 @@
+"""Cálculo de caminhos mínimos (SPF).
+
+O grafo é o dicionário de adjacências montado a partir dos LSAs:
+`graph[u][v] = custo` do enlace u -> v. Além do Dijkstra completo há um motor
+incremental (SSSP dinâmico no estilo Ramalingam–Reps) que atualiza a árvore
+de caminhos mínimos existente quando o custo de um único enlace sobe ou desce,
+tocando apenas as subárvores afetadas.
+"""
+
+import heapq
+import logging
+
+INF = float("inf")
+_EPSILON = 1e-9
+
+log = logging.getLogger(__name__)
+
+
+def dijkstra(graph, root):
+    """SPF completo. Retorna (dist, parent) apenas para os nós alcançáveis."""
+    dist = {root: 0.0}
+    parent = {root: None}
+    heap = [(0.0, root)]
+    done = set()
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in done:
+            continue
+        done.add(u)
+        for v, w in graph.get(u, {}).items():
+            nd = d + w
+            if nd < dist.get(v, INF):
+                dist[v] = nd
+                parent[v] = u
+                heapq.heappush(heap, (nd, v))
+    return dist, parent
+
+
+def forwarding_path(root, dest, next_hop):
+    """Caminho efetivo do encaminhamento salto a salto até `dest`.
+
+    `next_hop(roteador, destino)` dá a escolha de cada roteador (ou None).
+    Retorna a lista de nós ou None se o encaminhamento travar ou formar laço;
+    serve para validar cálculos cujos caminhos não têm subcaminhos ótimos.
+    """
+    path = [root]
+    seen = {root}
+    x = root
+    while x != dest:
+        x = next_hop(x, dest)
+        if x is None or x in seen:
+            return None
+        seen.add(x)
+        path.append(x)
+    return path
+
+
+def first_hops(parent, root):
+    """{destino: primeiro salto a partir de `root`} de uma árvore de SPF.
+
+    `parent` é um dict {nó: pai} (pai None na raiz) ou uma lista indexada
+    pelo nó com pai -1 na raiz e nos inalcançáveis, como a de `spf_csr`. A
+    raiz e os inalcançáveis ficam de fora.
+    """
+    nodes = parent.keys() if isinstance(parent, dict) else range(len(parent))
+    hops = {}
+    for v in nodes:
+        # Sobe até um nó com salto conhecido ou filho direto da raiz.
+        path = []
+        x = v
+        while x != root and x not in hops:
+            p = parent[x]
+            if p is None or p == -1:
+                break
+            if p == root:
+                hops[x] = x
+                break
+            path.append(x)
+            x = p
+        hop = hops.get(x)
+        if hop is not None:
+            for y in path:
+                hops[y] = hop
+    return hops
+
+
+def reverse_graph(graph):
+    pred = {}
+    for u, edges in graph.items():
+        pred.setdefault(u, {})
+        for v, w in edges.items():
+            pred.setdefault(v, {})[u] = w
+    return pred
+
+
+class IncrementalSPF:
+    """Árvore de caminhos mínimos mantida incrementalmente a partir de `root`.
+
+    `update_edge` aplica a mudança de custo de um enlace e corrige só os nós
+    afetados. `recompute` é o caminho completo (fallback). Com `verify=True`
+    cada atualização incremental é conferida contra um Dijkstra completo; em
+    caso de divergência o resultado completo é adotado e `mismatches` cresce.
+    """
+
+    def __init__(self, graph, root, verify=False):
+        self.graph = graph
+        self.root = root
+        self.verify = verify
+        self.mismatches = 0
+        self.recompute()
+
+    def recompute(self):
+        self._pred = reverse_graph(self.graph)
+        self.dist, self.parent = dijkstra(self.graph, self.root)
+        self._rebuild_children()
+
+    def _rebuild_children(self):
+        self._children = {}
+        for v, p in self.parent.items():
+            if p is not None:
+                self._children.setdefault(p, set()).add(v)
+
+    def _set_parent(self, v, p):
+        old = self.parent.get(v)
+        if old is not None:
+            self._children[old].discard(v)
+        self.parent[v] = p
+        if p is not None:
+            self._children.setdefault(p, set()).add(v)
+
+    def _detach(self, v):
+        old = self.parent.pop(v, None)
+        if old is not None:
+            self._children[old].discard(v)
+        self.dist.pop(v, None)
+
+    def _subtree(self, v):
+        nodes = [v]
+        i = 0
+        while i < len(nodes):
+            nodes.extend(self._children.get(nodes[i], ()))
+            i += 1
+        return nodes
+
+    def _propagate(self, heap, touched):
+        """Dijkstra a partir de rótulos provisórios já gravados em `dist`."""
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > self.dist.get(u, INF):
+                continue
+            for v, w in self.graph.get(u, {}).items():
+                nd = d + w
+                if nd < self.dist.get(v, INF):
+                    self.dist[v] = nd
+                    self._set_parent(v, u)
+                    touched.add(v)
+                    heapq.heappush(heap, (nd, v))
+
+    def update_edge(self, u, v, cost):
+        """Muda o custo do enlace u -> v (`None` remove o enlace).
+
+        Retorna o conjunto de nós cuja distância ou pai mudou.
+        """
+        old = self.graph.get(u, {}).get(v)
+        if cost is None:
+            self.graph.get(u, {}).pop(v, None)
+            self._pred.get(v, {}).pop(u, None)
+        else:
+            self.graph.setdefault(u, {})[v] = cost
+            self._pred.setdefault(v, {})[u] = cost
+            self.graph.setdefault(v, {})
+            self._pred.setdefault(u, {})
+        new = INF if cost is None else cost
+        old = INF if old is None else old
+
+        if new < old:
+            changed = self._decrease(u, v, new)
+        elif new > old and self.parent.get(v) == u:
+            changed = self._increase(v)
+        else:
+            changed = set()
+
+        if self.verify:
+            self._cross_check()
+        return changed
+
+    def _decrease(self, u, v, cost):
+        du = self.dist.get(u)
+        if du is None or du + cost >= self.dist.get(v, INF):
+            return set()
+        self.dist[v] = du + cost
+        self._set_parent(v, u)
+        touched = {v}
+        self._propagate([(self.dist[v], v)], touched)
+        return touched
+
+    def _increase(self, v):
+        affected = self._subtree(v)
+        before = {x: (self.dist[x], self.parent[x]) for x in affected}
+        for x in affected:
+            self._detach(x)
+
+        # Rótulos provisórios: melhor entrada vinda de fora da subárvore.
+        heap = []
+        for x in affected:
+            best, best_parent = INF, None
+            for p, w in self._pred.get(x, {}).items():
+                dp = self.dist.get(p)
+                if dp is not None and dp + w < best:
+                    best, best_parent = dp + w, p
+            if best_parent is not None:
+                self.dist[x] = best
+                self._set_parent(x, best_parent)
+                heap.append((best, x))
+        heapq.heapify(heap)
+        self._propagate(heap, set())
+
+        return {x for x, (d, p) in before.items()
+                if self.dist.get(x) != d or self.parent.get(x) != p}
+
+    def _cross_check(self):
+        dist, parent = dijkstra(self.graph, self.root)
+        ok = dist.keys() == self.dist.keys() and all(
+            abs(dist[x] - self.dist[x]) <= _EPSILON * max(1.0, dist[x]) for x in dist)
+        if not ok:
+            self.mismatches += 1
+            log.warning("SPF incremental divergiu do completo; adotando o completo")
+            self.dist, self.parent = dist, parent
+            self._rebuild_children()
+
+    def first_hops(self):
+        """Primeiro salto a partir da raiz para cada destino alcançável."""
+        return first_hops(self.parent, self.root)
+
+
+class RadixHeap:
+    """Fila de prioridade monotônica para chaves inteiras.
+
+    Válida para o Dijkstra com custos quantizados: nenhuma chave inserida é
+    menor que a última removida. Cada elemento é redistribuído no máximo
+    uma vez por bit da chave.
+    """
+
+    __slots__ = ("_buckets", "_last", "_size")
+
+    def __init__(self):
+        self._buckets = [[] for _ in range(65)]
+        self._last = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def push(self, key, item):
+        if key < self._last:
+            raise ValueError("chave menor que a última removida")
+        self._buckets[(key ^ self._last).bit_length()].append((key, item))
+        self._size += 1
+
+    def pop(self):
+        buckets = self._buckets
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            bucket = buckets[i]
+            buckets[i] = []
+            last = min(e[0] for e in bucket)
+            self._last = last
+            for entry in bucket:
+                buckets[(entry[0] ^ last).bit_length()].append(entry)
+        self._size -= 1
+        return buckets[0].pop()
+
+
+def spf_csr(graph, root, radix=False):
+    """SPF completo sobre um `CSRGraph` a partir do índice `root`.
+
+    Retorna (dist, parent) como listas indexadas pelo índice do roteador;
+    nós inalcançáveis ficam com distância INF e pai -1. `radix=True` usa o
+    radix heap (só para custos inteiros); em CPython o `heapq`, escrito em C,
+    costuma ser mais rápido — veja benchmarks/bench_spf.py.
+    """
+    if radix:
+        if not graph.integer_costs:
+            raise ValueError("radix heap exige custos quantizados")
+        return _spf_csr_radix(graph, root)
+
+    offsets, targets, costs = graph.offsets, graph.targets, graph.costs
+    n = len(graph)
+    dist = [INF] * n
+    parent = [-1] * n
+    dist[root] = 0 if graph.integer_costs else 0.0
+    heap = [(dist[root], root)]
+    pop, push = heapq.heappop, heapq.heappush
+    while heap:
+        d, u = pop(heap)
+        if d > dist[u]:
+            continue
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            nd = d + costs[i]
+            if nd < dist[v]:
+                dist[v] = nd
+                parent[v] = u
+                push(heap, (nd, v))
+    return dist, parent
+
+
+def _spf_csr_radix(graph, root):
+    # Radix heap embutido no laço: evita uma chamada de método por relaxamento.
+    offsets, targets, costs = graph.offsets, graph.targets, graph.costs
+    n = len(graph)
+    dist = [INF] * n
+    parent = [-1] * n
+    dist[root] = 0
+    buckets = [[] for _ in range(65)]
+    buckets[0].append((0, root))
+    last = 0
+    size = 1
+    while size:
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            bucket = buckets[i]
+            buckets[i] = []
+            last = min(e[0] for e in bucket)
+            for entry in bucket:
+                buckets[(entry[0] ^ last).bit_length()].append(entry)
+        d, u = buckets[0].pop()
+        size -= 1
+        if d > dist[u]:
+            continue
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            nd = d + costs[i]
+            if nd < dist[v]:
+                dist[v] = nd
+                parent[v] = u
+                buckets[(nd ^ last).bit_length()].append((nd, v))
+                size += 1
+    return dist, parent
+
+
+def first_hops_csr(dist, parent, root):
+    """Primeiro salto (índice) para cada destino de um resultado de `spf_csr`.
+
+    Destinos inalcançáveis e a própria raiz ficam com -1.
+    """
+    hops = [-1] * len(dist)
+    for v, hop in first_hops(parent, root).items():
+        hops[v] = hop
+    return hops
+
+
+def spf_csr_by_router_id(graph, root_id, radix=False):
+    """Atalho que devolve (dist, parent) indexados por ROUTER_ID."""
+    ids = graph.ids
+    dist, parent = spf_csr(graph, ids.index(root_id), radix=radix)
+    named_dist, named_parent = {}, {}
+    for i, d in enumerate(dist):
+        if d != INF:
+            router_id = ids.router_id(i)
+            named_dist[router_id] = d
+            named_parent[router_id] = ids.router_id(parent[i]) if parent[i] >= 0 else None
+    return named_dist, named_parent
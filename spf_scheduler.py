@@ -0,0 +1,132 @@
+"""Agendamento do SPF com backoff (RFC 8405) e coalescência de eventos.
+
+Cada LSA recebido ou mudança de custo é um gatilho; gatilhos que chegam
+enquanto o timer do SPF está armado são fundidos na mesma execução. A
+máquina de estados da RFC 8405 decide o atraso:
+
+- QUIET: rede estável; o primeiro gatilho arma o SPF com `initial_delay`.
+- SHORT_WAIT: durante `time_to_learn` após o primeiro gatilho, atraso curto.
+- LONG_WAIT: a instabilidade persistiu; atraso longo até a rede ficar
+  `holddown` sem gatilhos e voltar a QUIET.
+
+O relógio é injetável e o laço principal chama `poll()`; `next_deadline()`
+diz quando há algo a fazer.
+"""
+
+import time
+from collections import Counter
+
+QUIET = "QUIET"
+SHORT_WAIT = "SHORT_WAIT"
+LONG_WAIT = "LONG_WAIT"
+
+# Valores de exemplo da RFC 8405, em segundos.
+DEFAULT_INITIAL_DELAY_S = 0.05
+DEFAULT_SHORT_DELAY_S = 0.2
+DEFAULT_LONG_DELAY_S = 2.0
+DEFAULT_TIME_TO_LEARN_S = 0.5
+DEFAULT_HOLDDOWN_S = 10.0
+
+
+class SPFScheduler:
+    """Dispara `run_spf(motivos)` respeitando o backoff da RFC 8405.
+
+    `motivos` é um Counter com os gatilhos fundidos naquela execução.
+    """
+
+    def __init__(self, run_spf, initial_delay_s=DEFAULT_INITIAL_DELAY_S,
+                 short_delay_s=DEFAULT_SHORT_DELAY_S, long_delay_s=DEFAULT_LONG_DELAY_S,
+                 time_to_learn_s=DEFAULT_TIME_TO_LEARN_S, holddown_s=DEFAULT_HOLDDOWN_S,
+                 clock=time.monotonic):
+        self.run_spf = run_spf
+        self.initial_delay_s = initial_delay_s
+        self.short_delay_s = short_delay_s
+        self.long_delay_s = long_delay_s
+        self.time_to_learn_s = time_to_learn_s
+        self.holddown_s = holddown_s
+        self._clock = clock
+
+        self.state = QUIET
+        self._spf_at = None
+        self._learn_at = None
+        self._holddown_at = None
+        self._reasons = Counter()
+
+        # Instrumentação.
+        self.runs = 0
+        self.triggers = 0
+        self.merged = 0
+        self.last_merged = 0
+        self.max_merged = 0
+
+    @classmethod
+    def from_config(cls, run_spf, config, **kwargs):
+        block = config.get("spf_throttle", {})
+
+        def seconds(key, default):
+            return block[key] / 1000.0 if key in block else default
+
+        return cls(run_spf,
+                   initial_delay_s=seconds("initial_delay_ms", DEFAULT_INITIAL_DELAY_S),
+                   short_delay_s=seconds("short_delay_ms", DEFAULT_SHORT_DELAY_S),
+                   long_delay_s=seconds("long_delay_ms", DEFAULT_LONG_DELAY_S),
+                   time_to_learn_s=seconds("time_to_learn_ms", DEFAULT_TIME_TO_LEARN_S),
+                   holddown_s=seconds("holddown_ms", DEFAULT_HOLDDOWN_S),
+                   **kwargs)
+
+    def trigger(self, reason="lsa", now=None):
+        """Registra um evento que exige SPF (LSA novo, custo alterado...)."""
+        now = self._clock() if now is None else now
+        self.triggers += 1
+        self._reasons[reason] += 1
+        self._holddown_at = now + self.holddown_s
+
+        if self.state == QUIET:
+            self.state = SHORT_WAIT
+            self._learn_at = now + self.time_to_learn_s
+            delay = self.initial_delay_s
+        elif self.state == SHORT_WAIT:
+            delay = self.short_delay_s
+        else:
+            delay = self.long_delay_s
+
+        if self._spf_at is None:
+            self._spf_at = now + delay
+
+    def next_deadline(self):
+        deadlines = [t for t in (self._spf_at, self._learn_at, self._holddown_at) if t is not None]
+        return min(deadlines) if deadlines else None
+
+    def poll(self, now=None):
+        """Processa os timers vencidos; retorna True se o SPF rodou."""
+        now = self._clock() if now is None else now
+        ran = False
+        if self._spf_at is not None and now >= self._spf_at:
+            self._spf_at = None
+            reasons, self._reasons = self._reasons, Counter()
+            count = sum(reasons.values())
+            self.runs += 1
+            self.merged += count - 1
+            self.last_merged = count
+            self.max_merged = max(self.max_merged, count)
+            self.run_spf(reasons)
+            ran = True
+        if self._learn_at is not None and now >= self._learn_at:
+            self._learn_at = None
+            if self.state == SHORT_WAIT:
+                self.state = LONG_WAIT
+        if self._holddown_at is not None and now >= self._holddown_at:
+            self._holddown_at = None
+            self._learn_at = None
+            self.state = QUIET
+        return ran
+
+    def stats(self):
+        return {
+            "state": self.state,
+            "runs": self.runs,
+            "triggers": self.triggers,
+            "merged": self.merged,
+            "last_merged": self.last_merged,
+            "max_merged": self.max_merged,
+        }
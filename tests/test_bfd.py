@@ -0,0 +1,67 @@
+"""BFD: GTSM (RFC 5881, 5) descarta pacotes recebidos com TTL diferente de 255."""
+
+import asyncio
+import os
+import socket
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import bfd  # noqa: E402
+
+PORT = 13784
+
+
+class ReceivedTTLTest(unittest.TestCase):
+    def test_reads_ttl_from_ancillary_data(self):
+        ancdata = [(socket.IPPROTO_IP, socket.IP_TTL, bfd._TTL.pack(255))]
+        self.assertEqual(bfd.received_ttl(ancdata), 255)
+
+    def test_missing_ttl(self):
+        self.assertIsNone(bfd.received_ttl([]))
+
+
+class GTSMTest(unittest.TestCase):
+    def test_ttl_other_than_255_is_dropped(self):
+        asyncio.run(self.exercise())
+
+    async def exercise(self):
+        a = bfd.BFDService(tx_ms=20, rx_ms=20, listen=("127.0.0.1", PORT))
+        b = bfd.BFDService(tx_ms=20, rx_ms=20, listen=("127.0.0.2", PORT))
+        try:
+            await a.start()
+            await b.start()
+        except OSError as e:
+            a.close()
+            b.close()
+            self.skipTest(f"loopback indisponível: {e}")
+        spoofer = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            session = a.add_session("127.0.0.2", port=PORT)
+            b.add_session("127.0.0.1", port=PORT)
+            for _ in range(100):
+                if session.state == bfd.UP:
+                    break
+                await asyncio.sleep(0.05)
+            self.assertEqual(session.state, bfd.UP)
+            self.assertEqual(a.dropped_ttl, 0)
+
+            # Um Down forjado com TTL 64 derrubaria a sessão se fosse aceito.
+            spoofer.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, 64)
+            spoofer.sendto(bfd.encode_control(bfd.DOWN, 0, 0, 3, 12345, session.local_disc,
+                                              1_000_000, 1_000_000), ("127.0.0.1", PORT))
+            for _ in range(20):
+                if a.dropped_ttl:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(a.dropped_ttl, 1)
+            self.assertEqual(session.state, bfd.UP)
+        finally:
+            spoofer.close()
+            a.close()
+            b.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""CostChangeTracker: medições parciais dos hellos sobre a banda da configuração."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from change_tracker import CostChangeTracker  # noqa: E402
+from cost_engine import CostEngine, load_config  # noqa: E402
+from hello_metrics import HelloProbe, record_measurements  # noqa: E402
+
+CONFIG = load_config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config.json"))
+KEY = "10.1.2.0/24"
+
+
+def measured_probe():
+    """HelloProbe com latência, jitter e perda medidos, mas nunca banda."""
+    local, peer = HelloProbe(), HelloProbe()
+    now = 0
+    for _ in range(4):
+        peer.receive(local.timing(now), now + 3_000_000)
+        now += 10_000_000
+        local.receive(peer.timing(now), now + 3_000_000)
+        now += 10_000_000
+    return local
+
+
+class RecordTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = CostEngine.from_config(CONFIG)
+        self.tracker = CostChangeTracker.from_config(self.engine, CONFIG, clock=lambda: 0.0)
+
+    def test_partial_update_keeps_other_metrics(self):
+        self.assertTrue(self.tracker.record(KEY, latency_ms=40.0))
+        metrics = self.engine.metrics(KEY)
+        self.assertEqual(metrics["latency_ms"], 40.0)
+        self.assertEqual(metrics["bandwidth_mbps"], CONFIG["links"][KEY]["bandwidth_mbps"])
+        self.assertEqual(self.tracker.recost(), [KEY])
+
+    def test_forgotten_link_uses_configured_bandwidth(self):
+        self.tracker.forget(KEY)
+        self.assertTrue(self.tracker.record(KEY, jitter_ms=2.5))
+        metrics = self.engine.metrics(KEY)
+        self.assertEqual(metrics["jitter_ms"], 2.5)
+        self.assertEqual(metrics["bandwidth_mbps"], CONFIG["links"][KEY]["bandwidth_mbps"])
+        self.assertEqual(self.tracker.recost(), [KEY])
+
+    def test_unknown_key_without_defaults_is_skipped(self):
+        self.assertFalse(self.tracker.record(("R1", "R9"), latency_ms=1.0))
+        self.assertNotIn(("R1", "R9"), self.engine)
+        self.assertEqual(self.tracker.skipped, 1)
+        self.assertFalse(self.tracker.has_pending())
+
+    def test_unknown_key_with_all_metrics_is_added(self):
+        self.assertTrue(self.tracker.record(("R1", "R9"), bandwidth_mbps=100, latency_ms=1.0,
+                                            packet_loss_percent=0.0, jitter_ms=0.1))
+        self.assertIn(("R1", "R9"), self.engine)
+
+    def test_hello_measurements(self):
+        probe = measured_probe()
+        self.assertNotIn("bandwidth_mbps", probe.metrics())
+        self.tracker.forget(KEY)
+        record_measurements(self.tracker, {"eth0": probe, "eth1": measured_probe()},
+                            {"eth0": KEY, "eth1": ("R1", "R9")})
+        metrics = self.engine.metrics(KEY)
+        self.assertAlmostEqual(metrics["latency_ms"], probe.metrics()["latency_ms"])
+        self.assertEqual(metrics["bandwidth_mbps"], CONFIG["links"][KEY]["bandwidth_mbps"])
+        self.assertEqual(self.tracker.skipped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""CSPF e frentes de Pareto contra força bruta em grafos pequenos."""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cost_engine import load_config  # noqa: E402
+from cspf import cspf_tree  # noqa: E402
+from pareto import ParetoRouteTable  # noqa: E402
+from path_metrics import LinkMetrics, PathCost, path_metric_tree  # noqa: E402
+
+CONFIG = load_config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config.json"))
+
+
+def simple_paths(graph, root):
+    """Todos os caminhos simples a partir de `root`."""
+    stack = [(root,)]
+    while stack:
+        path = stack.pop()
+        yield path
+        for v in graph.get(path[-1], {}):
+            if v not in path:
+                stack.append(path + (v,))
+
+
+def random_graph(rng, n, p, make_edge):
+    graph = {u: {} for u in range(n)}
+    for u in range(n):
+        for v in range(n):
+            if u != v and rng.random() < p:
+                graph[u][v] = make_edge(rng)
+    return graph
+
+
+class CSPFTest(unittest.TestCase):
+    def test_against_brute_force(self):
+        rng = random.Random(21)
+        for _ in range(30):
+            graph = random_graph(rng, 7, 0.4,
+                                 lambda r: (r.randint(1, 10), float(r.randint(1, 10))))
+            max_latency = rng.choice((8.0, 12.0, 20.0))
+            tree = cspf_tree(graph, 0, max_latency)
+            best = {}
+            for path in simple_paths(graph, 0):
+                edges = list(zip(path, path[1:]))
+                cost = sum(graph[u][v][0] for u, v in edges)
+                latency = sum(graph[u][v][1] for u, v in edges)
+                if latency <= max_latency and cost < best.get(path[-1], float("inf")):
+                    best[path[-1]] = cost
+            self.assertEqual({d: e[0] for d, e in tree.items()}, best)
+            for dest, (cost, latency, path) in tree.items():
+                edges = list(zip(path, path[1:]))
+                self.assertEqual(path[0], 0)
+                self.assertEqual(path[-1], dest)
+                self.assertEqual(sum(graph[u][v][0] for u, v in edges), cost)
+                self.assertAlmostEqual(sum(graph[u][v][1] for u, v in edges), latency)
+                self.assertLessEqual(latency, max_latency)
+
+
+def random_link(rng):
+    return LinkMetrics(rng.uniform(1, 40), rng.uniform(0, 0.02), rng.uniform(0.1, 5),
+                       rng.choice((10, 50, 100, 1000)))
+
+
+def brute_force_costs(graph, root, path_cost):
+    best = {}
+    for path in simple_paths(graph, root):
+        label = path_cost.origin()
+        for u, v in zip(path, path[1:]):
+            label = path_cost.extend(label, graph[u][v])
+        cost = path_cost.cost(label)
+        if cost < best.get(path[-1], float("inf")):
+            best[path[-1]] = cost
+    return best
+
+
+class ParetoTest(unittest.TestCase):
+    def test_path_metric_tree_is_exact_without_label_limit(self):
+        rng = random.Random(22)
+        path_cost = PathCost(CONFIG["cost_weights"], CONFIG["normalization"])
+        for _ in range(20):
+            graph = random_graph(rng, 7, 0.4, random_link)
+            tree, _ = path_metric_tree(graph, 0, path_cost, max_labels=10 ** 6)
+            expected = brute_force_costs(graph, 0, path_cost)
+            self.assertEqual(tree.keys(), expected.keys())
+            for dest, cost in expected.items():
+                self.assertAlmostEqual(tree[dest][0], cost, places=12)
+
+    def test_fronts_select_any_weights(self):
+        rng = random.Random(23)
+        for _ in range(10):
+            graph = random_graph(rng, 6, 0.5, random_link)
+            table = ParetoRouteTable(graph, 0, CONFIG["normalization"], max_labels=10 ** 6)
+            for _ in range(5):
+                raw = [rng.random() for _ in range(4)]
+                weights = dict(zip(("alpha", "beta", "gamma", "delta"),
+                                   (w / sum(raw) for w in raw)))
+                expected = brute_force_costs(
+                    graph, 0, PathCost(weights, CONFIG["normalization"]))
+                expected.pop(0)
+                selected = table.fronts().select(weights)
+                self.assertEqual(selected.keys(), expected.keys())
+                for dest, (cost, path) in selected.items():
+                    self.assertAlmostEqual(cost, expected[dest], places=9)
+                    self.assertEqual((path[0], path[-1]), (0, dest))
+
+
+if __name__ == "__main__":
+    unittest.main()
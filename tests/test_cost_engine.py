@@ -0,0 +1,69 @@
+"""Custo composto: recálculo completo, parcial e por perfil contra a fórmula."""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np  # noqa: E402
+
+from cost_engine import (METRIC_FIELDS, CostEngine, composite_costs, load_config,  # noqa: E402
+                         quantize, quantize_array)
+
+CONFIG = load_config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config.json"))
+
+
+def reference_cost(link, weights, normalization):
+    def norm(value, lo, hi):
+        return (min(max(value, lo), hi) - lo) / (hi - lo)
+
+    n = normalization
+    terms = (1 - norm(link["bandwidth_mbps"], n["bandwidth"]["min_mbps"], n["bandwidth"]["max_mbps"]),
+             norm(link["latency_ms"], n["latency"]["min_ms"], n["latency"]["max_ms"]),
+             norm(link["packet_loss_percent"], n["packet_loss"]["min_percent"],
+                  n["packet_loss"]["max_percent"]),
+             norm(link["jitter_ms"], n["jitter"]["min_ms"], n["jitter"]["max_ms"]))
+    return sum(weights[k] * t for k, t in zip(("alpha", "beta", "gamma", "delta"), terms))
+
+
+class CostEngineTest(unittest.TestCase):
+    def test_config_costs_match_formula(self):
+        engine = CostEngine.from_config(CONFIG)
+        for key, link in CONFIG["links"].items():
+            expected = reference_cost(link, CONFIG["cost_weights"], CONFIG["normalization"])
+            self.assertAlmostEqual(engine.cost(key), expected, places=12)
+
+    def test_partial_recompute_matches_full(self):
+        rng = random.Random(1)
+        engine = CostEngine.from_config(CONFIG)
+        keys = engine.keys()
+        for _ in range(50):
+            key = rng.choice(keys)
+            engine.update_link(key, latency_ms=rng.uniform(0, 200), jitter_ms=rng.uniform(0, 20))
+            partial = engine.recompute([engine.index_of(key)])
+            self.assertAlmostEqual(float(partial[0]), reference_cost(
+                engine.metrics(key), CONFIG["cost_weights"], CONFIG["normalization"]), places=12)
+        partial = engine.costs().copy()
+        np.testing.assert_allclose(engine.recompute(), partial)
+
+    def test_composite_costs_matches_engine(self):
+        engine = CostEngine.from_config(CONFIG)
+        lower, upper = engine.bounds
+        weights = np.array([CONFIG["cost_weights"][k] for k in ("alpha", "beta", "gamma", "delta")])
+        costs = composite_costs(engine.metrics_view().copy(), weights, lower, upper)
+        np.testing.assert_allclose(costs, engine.costs())
+        self.assertEqual(engine.metrics_view().shape[0], len(METRIC_FIELDS))
+
+    def test_integer_mode(self):
+        config = dict(CONFIG, metric={"integer": True, "bits": 16, "scale": 65535})
+        engine = CostEngine.from_config(config)
+        for key in engine.keys():
+            raw = float(engine.raw_costs()[engine.index_of(key)])
+            self.assertEqual(engine.cost(key), quantize(raw, 65535, 16))
+        self.assertEqual(quantize_array([0.0, 2.0], 65535, 16).tolist(), [1, 65535])
+
+
+if __name__ == "__main__":
+    unittest.main()
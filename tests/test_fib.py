@@ -0,0 +1,75 @@
+"""Fast reroute sobre grupos ECMP e backups LFA."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fib import FastReroute  # noqa: E402
+from lfa import compute_alternates  # noqa: E402
+from multipath import multipath_rib  # noqa: E402
+
+# S com dois caminhos de custo igual para D (via A e via B) e um terceiro,
+# mais caro, via C.
+GRAPH = {
+    "S": {"A": 1, "B": 1, "C": 1},
+    "A": {"S": 1, "D": 1},
+    "B": {"S": 1, "D": 1},
+    "C": {"S": 1, "D": 3},
+    "D": {"A": 1, "B": 1, "C": 3},
+}
+GATEWAYS = {"A": "10.0.0.1", "B": "10.0.0.2", "C": "10.0.0.3"}
+PREFIXES = {"D": ["192.168.0.0/24"]}
+
+
+class FakeFib:
+    def __init__(self):
+        self.routes = {}
+
+    def replace(self, route):
+        self.routes[route.prefix] = route.nexthops
+
+    def replace_via_interface(self, prefix, oif):
+        self.routes[prefix] = ((None, oif),)
+
+
+class FastRerouteTest(unittest.TestCase):
+    def armed(self, multipath=True):
+        fib = FakeFib()
+        frr = FastReroute(fib, GATEWAYS, clock=lambda: 0.0)
+        rib = multipath_rib(GRAPH, "S") if multipath else None
+        frr.arm(compute_alternates(GRAPH, "S"), PREFIXES, multipath=rib)
+        return fib, frr
+
+    def test_non_primary_member_removed_from_group(self):
+        fib, frr = self.armed()
+        primary = compute_alternates(GRAPH, "S")["D"][0]
+        other = ({"A", "B"} - {primary}).pop()
+        self.assertEqual(frr.neighbor_down(other), [])
+        self.assertEqual(fib.routes["192.168.0.0/24"], ((GATEWAYS[primary], 255),))
+
+    def test_backup_only_when_group_empty(self):
+        fib, frr = self.armed()
+        self.assertEqual(frr.neighbor_down("A"), [])
+        self.assertEqual(fib.routes["192.168.0.0/24"], ((GATEWAYS["B"], 255),))
+        # O LFA de D é B, que também caiu: C não é livre de laço.
+        self.assertEqual(frr.neighbor_down("B"), ["192.168.0.0/24"])
+        self.assertEqual(frr.neighbor_down("C"), [])
+
+    def test_single_path_uses_lfa(self):
+        fib, frr = self.armed(multipath=False)
+        primary = compute_alternates(GRAPH, "S")["D"][0]
+        frr.neighbor_down(primary)
+        self.assertIn(fib.routes["192.168.0.0/24"][0][0], (GATEWAYS["A"], GATEWAYS["B"]))
+
+    def test_backup_through_dead_neighbor_is_unprotected(self):
+        fib, frr = self.armed(multipath=False)
+        alternates = compute_alternates(GRAPH, "S")
+        primary, alt = alternates["D"]
+        frr.neighbor_down(alt.neighbor)
+        self.assertEqual(frr.neighbor_down(primary), ["192.168.0.0/24"])
+
+
+if __name__ == "__main__":
+    unittest.main()
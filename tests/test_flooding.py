@@ -0,0 +1,129 @@
+"""Flooding em lote: empacotamento até o MTU, substituição e cadência."""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from flooding import Flooder, InterfaceFlooder  # noqa: E402
+from lsdb import LinkRecord, RouterLSA  # noqa: E402
+from ospf_codec import decode_lsu_body, lsu_capacity  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def router_lsa(adv, seq=0x80000001, links=3):
+    return RouterLSA(adv, seq, [LinkRecord(adv + i + 1, i, 0.5) for i in range(links)])
+
+
+class InterfaceFlooderTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.sent = []
+
+    def flooder(self, **kwargs):
+        kwargs.setdefault("batch_delay_s", 0.005)
+        return InterfaceFlooder("eth0", self.sent.append, clock=self.clock, **kwargs)
+
+    def decoded(self):
+        return [[(lsa.adv_router, lsa.seq) for lsa in decode_lsu_body(body)]
+                for body in self.sent]
+
+    def test_packs_up_to_mtu(self):
+        rng = random.Random(1)
+        flooder = self.flooder(mtu=600, burst=100)
+        lsas = [router_lsa(adv, links=rng.randint(1, 12)) for adv in range(1, 80)]
+        for lsa in lsas:
+            flooder.enqueue(lsa.key, lsa.to_bytes())
+        self.clock.now = 0.005
+        flooder.poll()
+        # O resto, que não enche um LSU, espera mais um batch_delay.
+        self.assertEqual(flooder.poll(), 0)
+        self.clock.now = 0.01
+        flooder.poll()
+        self.assertEqual(len(flooder), 0)
+        capacity = lsu_capacity(600)
+        for body in self.sent:
+            self.assertLessEqual(len(body) - 4, capacity)
+        # Todos saem, na ordem, e só o último pacote pode ter folga para o próximo LSA.
+        flat = [entry for packet in self.decoded() for entry in packet]
+        self.assertEqual(flat, [(lsa.adv_router, lsa.seq) for lsa in lsas])
+        sizes = [lsa.size for lsa in lsas]
+        pos = 0
+        for packet in self.decoded()[:-1]:
+            used = sum(sizes[pos:pos + len(packet)])
+            pos += len(packet)
+            self.assertGreater(used + sizes[pos], capacity)
+        self.assertEqual(flooder.max_lsas_per_packet, max(len(p) for p in self.decoded()))
+
+    def test_waits_for_batch_delay(self):
+        flooder = self.flooder()
+        lsa = router_lsa(1)
+        flooder.enqueue(lsa.key, lsa.to_bytes())
+        self.assertEqual(flooder.poll(), 0)
+        self.assertAlmostEqual(flooder.next_deadline(), 0.005)
+        self.clock.now = 0.005
+        self.assertEqual(flooder.poll(), 1)
+        self.assertIsNone(flooder.next_deadline())
+
+    def test_full_packet_does_not_wait(self):
+        flooder = self.flooder(mtu=300)
+        for adv in range(1, 20):
+            lsa = router_lsa(adv)
+            flooder.enqueue(lsa.key, lsa.to_bytes())
+        self.assertGreaterEqual(flooder.poll(), 1)
+
+    def test_supersede(self):
+        flooder = self.flooder()
+        for seq in range(0x80000001, 0x80000006):
+            lsa = router_lsa(7, seq)
+            flooder.enqueue(lsa.key, lsa.to_bytes())
+        other = router_lsa(8)
+        flooder.enqueue(other.key, other.to_bytes())
+        flooder.discard(other.key)
+        self.assertEqual(len(flooder), 1)
+        self.clock.now = 1.0
+        flooder.poll()
+        self.assertEqual(self.decoded(), [[(7, 0x80000005)]])
+        self.assertEqual(flooder.superseded, 4)
+
+    def test_token_bucket_pacing(self):
+        flooder = self.flooder(mtu=200, rate_pps=10.0, burst=2)
+        for adv in range(1, 11):
+            lsa = router_lsa(adv, links=10)  # um LSA por pacote
+            flooder.enqueue(lsa.key, lsa.to_bytes())
+        self.clock.now = 0.005
+        self.assertEqual(flooder.poll(), 2)
+        self.assertAlmostEqual(flooder.next_deadline(), 0.105)
+        self.clock.now = 0.11
+        self.assertEqual(flooder.poll(), 1)
+        self.clock.now = 0.36
+        self.assertEqual(flooder.poll(), 2)
+        self.assertEqual(flooder.stats()["pending"], 5)
+
+
+class FlooderTest(unittest.TestCase):
+    def test_excludes_incoming_interface(self):
+        clock = Clock()
+        sent = {}
+        flooder = Flooder(batch_delay_s=0.0, clock=clock)
+        for name in ("eth0", "eth1", "eth2"):
+            flooder.add_interface(name, sent.setdefault(name, []).append)
+        flooder.flood(router_lsa(3), exclude="eth0")
+        flooder.flood(router_lsa(4), only={"eth2"})
+        flooder.poll()
+        counts = {name: sum(len(decode_lsu_body(b)) for b in bodies)
+                  for name, bodies in sent.items()}
+        self.assertEqual(counts, {"eth0": 0, "eth1": 1, "eth2": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Topologia de flooding: subgrafo 2-aresta-conexo e volta ao flooding completo."""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from flooding_topology import (DynamicFlooding, _connected, flooding_topology,  # noqa: E402
+                               undirected_edges)
+
+
+def random_graph(rng, n, chords):
+    """Anel com cordas aleatórias (2-aresta-conexo) como adjacência simétrica."""
+    graph = {u: {} for u in range(n)}
+
+    def link(u, v):
+        graph[u][v] = graph[v][u] = 1
+
+    for u in range(n):
+        link(u, (u + 1) % n)
+    for _ in range(chords):
+        u, v = rng.sample(range(n), 2)
+        link(u, v)
+    return graph
+
+
+def nodes_of(edges):
+    return {u for edge in edges for u in edge}
+
+
+class FloodingTopologyTest(unittest.TestCase):
+    def assert_survives_single_failures(self, graph):
+        edges = undirected_edges(graph)
+        topology = flooding_topology(graph)
+        nodes = nodes_of(edges)
+        self.assertLessEqual(topology, edges)
+        self.assertTrue(_connected(nodes, topology))
+        for edge in topology:
+            if _connected(nodes, edges - {edge}):
+                self.assertTrue(_connected(nodes, topology - {edge}), edge)
+        return topology
+
+    def test_two_edge_connected(self):
+        rng = random.Random(2)
+        for _ in range(30):
+            n = rng.randint(4, 40)
+            graph = random_graph(rng, n, rng.randint(0, 4 * n))
+            topology = self.assert_survives_single_failures(graph)
+            # No máximo uma aresta extra por aresta da árvore.
+            self.assertLessEqual(len(topology), 2 * (n - 1))
+
+    def test_full_mesh_is_sparse(self):
+        n = 30
+        graph = {u: {v: 1 for v in range(n) if v != u} for u in range(n)}
+        topology = self.assert_survives_single_failures(graph)
+        self.assertLess(len(topology), len(undirected_edges(graph)) // 5)
+
+    def test_graph_with_bridge_still_spans(self):
+        rng = random.Random(4)
+        left, right = random_graph(rng, 6, 5), random_graph(rng, 6, 5)
+        graph = {u: dict(v) for u, v in left.items()}
+        graph.update({u + 6: {v + 6: w for v, w in vs.items()} for u, vs in right.items()})
+        graph[0][6] = graph[6][0] = 1
+        self.assert_survives_single_failures(graph)
+
+    def test_deterministic(self):
+        graph = random_graph(random.Random(8), 20, 30)
+        shuffled = {u: dict(reversed(list(vs.items()))) for u, vs in reversed(list(graph.items()))}
+        self.assertEqual(flooding_topology(graph), flooding_topology(shuffled))
+
+
+class DynamicFloodingTest(unittest.TestCase):
+    def setUp(self):
+        # Anel de 6: a topologia é o próprio anel.
+        self.graph = random_graph(random.Random(0), 6, 0)
+
+    def test_floods_only_topology_neighbors(self):
+        graph = {u: {v: 1 for v in range(8) if v != u} for u in range(8)}
+        # Fora da raiz da árvore (0), um roteador inunda só por poucas adjacências.
+        dynamic = DynamicFlooding(7)
+        dynamic.update(graph)
+        neighbors = set(graph[7])
+        chosen = dynamic.flood_neighbors(neighbors)
+        self.assertLess(chosen, neighbors)
+        self.assertEqual(chosen, {u for u, v in dynamic.edges if v == 7})
+
+    def test_fallback_on_partition(self):
+        dynamic = DynamicFlooding(0)
+        dynamic.update(self.graph)
+        self.assertFalse(dynamic.full_flooding)
+        dynamic.link_down(0, 1)
+        # Um enlace do anel caiu: o subgrafo ainda liga todos.
+        self.assertFalse(dynamic.full_flooding)
+        self.assertEqual(dynamic.flood_neighbors({1, 5}), {5})
+        dynamic.link_down(3, 4)
+        self.assertTrue(dynamic.full_flooding)
+        self.assertEqual(dynamic.flood_neighbors({1, 5}), {1, 5})
+        self.assertEqual(dynamic.fallbacks, 1)
+        dynamic.link_up(3, 4)
+        self.assertFalse(dynamic.full_flooding)
+        # Recalcular a topologia zera as quedas locais registradas.
+        dynamic.update(self.graph)
+        self.assertFalse(dynamic.full_flooding)
+
+    def test_disabled(self):
+        dynamic = DynamicFlooding.from_config(0, {})
+        dynamic.update(self.graph)
+        self.assertTrue(dynamic.full_flooding)
+        self.assertEqual(dynamic.flood_neighbors({1, 5}), {1, 5})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Medição pelos hellos: perda, hellos atrasados e reinício do vizinho."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from hello_metrics import HelloProbe  # noqa: E402
+from ospf_codec import HelloTiming  # noqa: E402
+
+INTERVAL_NS = 100_000_000
+TRANSIT_NS = 2_000_000
+
+
+class Neighbor:
+    """Vizinho simulado que envia hellos com sequência e relógio próprios."""
+
+    def __init__(self, start_ns=0):
+        self.probe = HelloProbe()
+        self.now_ns = start_ns
+
+    def hello(self):
+        self.now_ns += INTERVAL_NS
+        return self.probe.timing(self.now_ns)
+
+    def restart(self):
+        # Processo novo: a sequência recomeça, o relógio monotônico não.
+        self.probe = HelloProbe()
+
+
+class HelloProbeTest(unittest.TestCase):
+    def setUp(self):
+        self.probe = HelloProbe()
+        self.neighbor = Neighbor()
+
+    def deliver(self, timing):
+        self.probe.receive(timing, timing.tx_ns + TRANSIT_NS)
+
+    def test_loss_from_sequence_gaps(self):
+        for n in range(20):
+            timing = self.neighbor.hello()
+            if n % 5 != 4:
+                self.deliver(timing)
+        # 5, 10 e 15 perdidos (o 20 ainda não conta: o maior visto é 19).
+        self.assertAlmostEqual(self.probe.loss_percent, 100 * 3 / 19)
+
+    def test_late_hello_is_not_a_restart(self):
+        for _ in range(10):
+            self.deliver(self.neighbor.hello())
+        late = self.neighbor.hello()
+        self.deliver(self.neighbor.hello())
+        self.deliver(late)
+        self.assertEqual(self.probe._highest, 12)
+        self.assertEqual(self.probe._first, 1)
+        self.assertEqual(self.probe.loss_percent, 0.0)
+
+    def check_restart_detected(self, lose_first):
+        for _ in range(10):
+            self.deliver(self.neighbor.hello())
+        self.neighbor.restart()
+        if lose_first:
+            self.neighbor.hello()
+        for _ in range(3):
+            timing = self.neighbor.hello()
+            self.deliver(timing)
+            # Cada hello novo atualiza o carimbo ecoado de volta.
+            self.assertEqual(self.probe.timing(timing.tx_ns + TRANSIT_NS).echo_ns, timing.tx_ns)
+        self.assertEqual(self.probe._highest, timing.seq)
+        self.assertEqual(self.probe.loss_percent, 0.0)
+
+    def test_restart_below_window(self):
+        self.check_restart_detected(lose_first=False)
+
+    def test_restart_with_first_hello_lost(self):
+        self.check_restart_detected(lose_first=True)
+
+    def test_restart_below_first_seen(self):
+        # Começamos a ouvir no meio da sequência (10) e o vizinho reinicia
+        # com o hello 1 perdido.
+        for _ in range(9):
+            self.neighbor.hello()
+        for _ in range(5):
+            self.deliver(self.neighbor.hello())
+        self.assertEqual(self.probe._first, 10)
+        self.neighbor.restart()
+        self.neighbor.hello()
+        timing = self.neighbor.hello()
+        self.deliver(timing)
+        self.assertEqual((self.probe._first, self.probe._highest), (2, 2))
+
+    def test_reset(self):
+        for _ in range(5):
+            self.deliver(self.neighbor.hello())
+        self.probe.reset()
+        self.assertIsNone(self.probe.loss_percent)
+        self.assertEqual(self.probe.timing(0).echo_ns, 0)
+        self.deliver(self.neighbor.hello())
+        self.assertEqual(self.probe._first, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
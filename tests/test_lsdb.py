@@ -0,0 +1,205 @@
+"""LSDB colunar: índice, instalação/remoção e formato no fio."""
+
+import os
+import random
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cost_engine import CostEngine, load_config  # noqa: E402
+from lsdb import LSDB, ROUTER_LSA, LinkRecord, RouterLSA, decode_lsa, lsa_key  # noqa: E402
+
+CONFIG = load_config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config.json"))
+
+
+def random_lsa(rng, adv_router, seq, ls_id=None):
+    links = [LinkRecord(rng.randrange(1, 1 << 32), rng.randrange(1 << 32), rng.random(),
+                        rng.uniform(1, 50), rng.uniform(0, 1), rng.uniform(0, 5), 100.0)
+             for _ in range(rng.randint(0, 5))]
+    return RouterLSA(adv_router, seq, links, ls_id=ls_id)
+
+
+def assert_same_lsa(test, a, b):
+    test.assertEqual((a.ls_type, a.ls_id, a.adv_router, a.seq, a.checksum),
+                     (b.ls_type, b.ls_id, b.adv_router, b.seq, b.checksum))
+    test.assertEqual([(l.neighbor, l.link_data, l.metric) for l in a.links],
+                     [(l.neighbor, l.link_data, l.metric) for l in b.links])
+
+
+class LSDBModelTest(unittest.TestCase):
+    """Instala e remove LSAs aleatórios conferindo contra um dict."""
+
+    def check(self, db, model):
+        self.assertEqual(len(db), len(model))
+        self.assertEqual(sorted(db.keys()), sorted(model))
+        self.assertEqual(db.link_count, sum(len(lsa.links) for lsa in model.values()))
+        for key, lsa in model.items():
+            self.assertIn(key, db)
+            assert_same_lsa(self, db.get(lsa.ls_type, lsa.ls_id, lsa.adv_router), lsa)
+
+    def test_random_install_remove(self):
+        rng = random.Random(31)
+        db = LSDB(clock=lambda: 0.0)
+        model = {}
+        # Poucos roteadores e ls_ids para forçar colisões e atualizações.
+        for step in range(3000):
+            if model and rng.random() < 0.3:
+                key = rng.choice(list(model))
+                db.remove(key)
+                del model[key]
+                self.assertNotIn(key, db)
+            else:
+                adv = rng.randrange(1, 200)
+                ls_id = rng.choice((adv, rng.randrange(1, 50)))
+                key = lsa_key(ROUTER_LSA, ls_id, adv)
+                seq = model[key].seq + 1 if key in model else 0x80000001
+                lsa = random_lsa(rng, adv, seq, ls_id)
+                self.assertTrue(db.install(lsa))
+                model[key] = lsa
+            if step % 97 == 0:
+                self.check(db, model)
+        self.check(db, model)
+        while model:
+            key = model.popitem()[0]
+            db.remove(key)
+        self.assertEqual(len(db), 0)
+
+    def test_older_instance_rejected(self):
+        rng = random.Random(32)
+        db = LSDB()
+        self.assertTrue(db.install(random_lsa(rng, 1, 0x80000005)))
+        self.assertFalse(db.install(random_lsa(rng, 1, 0x80000004)))
+        self.assertFalse(db.install(random_lsa(rng, 1, 0x80000005)))
+        self.assertTrue(db.install(random_lsa(rng, 1, 0x80000006)))
+
+    def test_remove_missing_raises(self):
+        with self.assertRaises(KeyError):
+            LSDB().remove(lsa_key(ROUTER_LSA, 1, 1))
+
+    def test_columns_round_trip(self):
+        rng = random.Random(33)
+        db = LSDB(clock=lambda: 0.0)
+        for adv in range(1, 50):
+            db.install(random_lsa(rng, adv, 0x80000001))
+        for adv in range(1, 50, 3):
+            db.remove(lsa_key(ROUTER_LSA, adv, adv))
+        copy = LSDB.from_columns(db.export_columns(), clock=lambda: 0.0)
+        self.assertEqual(copy.adjacency(), db.adjacency())
+        for lsa in db:
+            assert_same_lsa(self, copy.get(ROUTER_LSA, lsa.ls_id, lsa.adv_router), lsa)
+
+
+class FreezeTest(unittest.TestCase):
+    def test_versions_keep_their_state(self):
+        rng = random.Random(34)
+        db = LSDB(clock=lambda: 0.0)
+        model = {}
+        versions = []
+        for step in range(2000):
+            if model and rng.random() < 0.25:
+                key = rng.choice(list(model))
+                db.remove(key)
+                del model[key]
+            else:
+                adv = rng.randrange(1, 100)
+                key = lsa_key(ROUTER_LSA, adv, adv)
+                seq = model[key].seq + 1 if key in model else 0x80000001
+                model[key] = random_lsa(rng, adv, seq)
+                db.install(model[key])
+            if step % 50 == 0:
+                versions.append((db.freeze(), dict(model)))
+        for version, expected in versions:
+            LSDBModelTest.check(self, version, expected)
+            copy = LSDB.from_columns(version.export_columns())
+            LSDBModelTest.check(self, copy, expected)
+
+    def test_freeze_is_cached_until_write(self):
+        db = LSDB()
+        db.install(random_lsa(random.Random(35), 1, 0x80000001))
+        self.assertIs(db.freeze(), db.freeze())
+        version = db.freeze()
+        db.install(random_lsa(random.Random(36), 2, 0x80000001))
+        self.assertIsNot(db.freeze(), version)
+        self.assertEqual(len(version), 1)
+
+    def test_version_is_read_only(self):
+        version = LSDB().freeze()
+        lsa = random_lsa(random.Random(37), 1, 0x80000001)
+        with self.assertRaises(TypeError):
+            version.install(lsa)
+        with self.assertRaises(TypeError):
+            version.remove(lsa.key)
+
+    def test_export_does_not_disturb_concurrent_readers(self):
+        rng = random.Random(38)
+        db = LSDB()
+        for adv in range(1, 200):
+            db.install(random_lsa(rng, adv, 0x80000001))
+        # Atualizações com outro número de enlaces deixam lixo a compactar.
+        for adv in range(1, 200, 2):
+            lsa = random_lsa(rng, adv, 0x80000002)
+            lsa.links = lsa.links + (LinkRecord(1, 0, 0.5),)
+            db.install(lsa)
+        version = db.freeze()
+        expected = version.adjacency()
+        errors = []
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                try:
+                    if version.adjacency() != expected:
+                        errors.append("adjacência errada")
+                except Exception as e:  # noqa: BLE001 - qualquer falha conta
+                    errors.append(repr(e))
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        try:
+            for i in range(100):
+                version.export_columns()
+                # O LSDB vivo continua escrevendo nos arrays compartilhados.
+                adv = rng.randrange(1, 200)
+                db.install(random_lsa(rng, adv, 0x80000003 + i))
+        finally:
+            stop.set()
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(version.adjacency(), expected)
+
+
+class MetricWireTest(unittest.TestCase):
+    def round_trip(self, config):
+        engine = CostEngine.from_config(config)
+        links = [LinkRecord(i + 2, i, engine.cost(key), **{
+                     "latency_ms": engine.metrics(key)["latency_ms"],
+                     "bandwidth_mbps": engine.metrics(key)["bandwidth_mbps"]})
+                 for i, key in enumerate(engine.keys())]
+        lsa = RouterLSA("1.1.1.1", 0x80000001, links)
+        db = LSDB()
+        self.assertTrue(db.install(lsa))
+        data = lsa.to_bytes()
+        decoded, length = decode_lsa(data)
+        self.assertEqual(length, len(data))
+        remote = LSDB()
+        self.assertTrue(remote.install(decoded))
+        expected = {link.neighbor: link.metric for link in links}
+        self.assertEqual(db.adjacency()[lsa.adv_router], expected)
+        self.assertEqual(remote.adjacency()[lsa.adv_router], expected)
+        return expected
+
+    def test_default_config_float_costs(self):
+        self.assertFalse(CONFIG["metric"]["integer"])
+        metrics = self.round_trip(CONFIG)
+        self.assertTrue(all(0 <= m <= 1 for m in metrics.values()))
+        self.assertTrue(any(m != int(m) for m in metrics.values()))
+
+    def test_integer_metric(self):
+        metrics = self.round_trip(dict(CONFIG, metric={"integer": True, "bits": 24}))
+        self.assertTrue(all(m == int(m) and m >= 1 for m in metrics.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
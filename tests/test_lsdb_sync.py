@@ -0,0 +1,86 @@
+"""Sincronização por resumos: `reconcile` contra a diferença direta dos LSDBs."""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lsdb import lsa_key, signed_seq  # noqa: E402
+from lsdb_sync import LSDBDigest, decode_summaries, encode_summaries, reconcile  # noqa: E402
+
+
+def random_headers(rng, n):
+    return {lsa_key(1, adv, adv): (0x80000001 + rng.randrange(5), rng.randrange(1 << 16))
+            for adv in rng.sample(range(1, 100000), n)}
+
+
+def digest_of(headers, bucket_bits=8):
+    digest = LSDBDigest(bucket_bits)
+    for key, (seq, checksum) in headers.items():
+        digest.add(key, seq, checksum)
+    return digest
+
+
+def newer(a, b):
+    return (signed_seq(a[0]), a[1]) > (signed_seq(b[0]), b[1])
+
+
+class ReconcileTest(unittest.TestCase):
+    def diverge(self, rng, headers):
+        """Cópia de `headers` com LSAs a mais, a menos e com seq diferente."""
+        other = dict(headers)
+        keys = list(other)
+        for key in rng.sample(keys, 10):
+            del other[key]
+        for key in rng.sample(keys, 10):
+            if key in other:
+                seq, checksum = other[key]
+                other[key] = (seq + rng.choice((-1, 1)), checksum)
+        other.update(random_headers(rng, 10))
+        return other
+
+    def test_request_and_offer_match_direct_diff(self):
+        for seed in range(10):
+            rng = random.Random(seed)
+            local = random_headers(rng, 500)
+            remote = self.diverge(rng, local)
+            result = reconcile(digest_of(local), digest_of(remote))
+
+            request = {k for k, h in remote.items() if k not in local or newer(h, local[k])}
+            offer = {k for k, h in local.items() if k not in remote or newer(h, remote[k])}
+            self.assertEqual(set(result.request), request)
+            self.assertEqual(set(result.offer), offer)
+            self.assertEqual(len(result.request), len(request))
+
+    def test_identical_databases(self):
+        headers = random_headers(random.Random(3), 200)
+        result = reconcile(digest_of(headers), digest_of(headers))
+        self.assertEqual((result.request, result.offer, result.rounds), ([], [], 1))
+
+    def test_incremental_updates_match_rebuild(self):
+        rng = random.Random(5)
+        headers = random_headers(rng, 300)
+        digest = digest_of(headers)
+        for key in rng.sample(list(headers), 50):
+            if rng.random() < 0.5:
+                digest.discard(key)
+                del headers[key]
+            else:
+                seq, checksum = headers[key]
+                headers[key] = (seq + 1, checksum)
+                digest.update(key, seq + 1, checksum)
+        self.assertEqual(digest.levels, digest_of(headers).levels)
+
+    def test_bucket_bits_must_match(self):
+        with self.assertRaises(ValueError):
+            reconcile(LSDBDigest(8), LSDBDigest(4))
+
+    def test_summaries_round_trip(self):
+        headers = random_headers(random.Random(9), 20)
+        self.assertEqual(decode_summaries(encode_summaries(headers)), headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Deltas de métricas: originação, formato no fio e aplicação no LSDB."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lsdb import LSDB, LinkRecord, MetricDelta, RouterLSA, decode_lsa  # noqa: E402
+from metric_delta import DeltaOriginator  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def links():
+    return [LinkRecord("2.2.2.2", 1, 0.1307, 5.0, 0.1, 1.0, 100.0),
+            LinkRecord("3.3.3.3", 2, 0.13, 10.0, 0.2, 2.0, 50.0)]
+
+
+def flood(db, lsa):
+    """Instala `lsa` como um vizinho o receberia (codificado e decodificado)."""
+    data = lsa.to_bytes()
+    decoded, length = decode_lsa(data)
+    assert length == len(data)
+    return db.install(decoded)
+
+
+class DeltaOriginatorTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.origin = DeltaOriginator("1.1.1.1", links(), refresh_s=30, max_deltas=3,
+                                      clock=self.clock)
+        self.db = LSDB(clock=self.clock)
+        self.assertIsInstance(self.origin.originate(), RouterLSA)
+
+    def test_float_metric_advertised_exactly(self):
+        lsa = self.origin.full_lsa()
+        self.assertEqual([link.metric for link in lsa.links], [0.1307, 0.13])
+
+    def test_float_metric_change_produces_delta(self):
+        flood(self.db, self.origin.full_lsa())
+        self.origin.update("3.3.3.3", metric=0.25)
+        delta = self.origin.originate()
+        self.assertIsInstance(delta, MetricDelta)
+        self.assertEqual(delta.changes, ((1, (("metric", 0.25),)),))
+        self.assertTrue(flood(self.db, delta))
+        full = LSDB()
+        flood(full, self.origin.full_lsa())
+        self.assertEqual(self.db.adjacency(), full.adjacency())
+        self.assertEqual(self.db.adjacency()[self.origin.router_id][0x03030303], 0.25)
+
+    def test_integer_metric(self):
+        origin = DeltaOriginator("1.1.1.1", [LinkRecord("2.2.2.2", 1, 100)], clock=self.clock)
+        origin.originate()
+        origin.update("2.2.2.2", metric=101)
+        delta = origin.originate()
+        self.assertEqual(delta.changes, ((0, (("metric", 101.0),)),))
+
+    def test_no_change_no_lsa(self):
+        self.origin.update("2.2.2.2", latency_ms=5.0)
+        self.assertIsNone(self.origin.originate())
+
+    def test_measured_fields_compared_as_float32(self):
+        self.origin.update("2.2.2.2", latency_ms=5.0 + 1e-9)
+        self.assertIsNone(self.origin.originate())
+
+    def test_refresh_and_max_deltas_send_full(self):
+        for i in range(3):
+            self.origin.update("2.2.2.2", latency_ms=6.0 + i)
+            self.assertIsInstance(self.origin.originate(), MetricDelta)
+        self.origin.update("2.2.2.2", latency_ms=20.0)
+        self.assertIsInstance(self.origin.originate(), RouterLSA)
+        self.clock.now = 31.0
+        self.assertIsInstance(self.origin.originate(), RouterLSA)
+
+    def test_delta_on_wrong_base_is_rejected(self):
+        flood(self.db, self.origin.full_lsa())
+        self.origin.update("2.2.2.2", metric=0.5)
+        self.origin.originate()
+        self.origin.update("2.2.2.2", metric=0.6)
+        second = self.origin.originate()
+        self.assertFalse(flood(self.db, second))
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            self.origin.update("2.2.2.2", cost=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
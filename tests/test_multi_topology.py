@@ -0,0 +1,89 @@
+"""Multi-topologia: RIBs por perfil contra o Dijkstra e remoção de enlaces no motor."""
+
+import os
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cost_engine import METRIC_FIELDS, CostEngine, load_config  # noqa: E402
+from multi_topology import MultiTopologySPF, SharedTopology, load_profiles  # noqa: E402
+from spf import dijkstra  # noqa: E402
+
+CONFIG = load_config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config.json"))
+ROOT = "1.1.1.1"
+
+
+def config_adjacency(config):
+    """{u: {v: chave do enlace}} dos enlaces roteador-roteador."""
+    adjacency = {}
+    for key, link in config["links"].items():
+        match = re.fullmatch(r"R(\d+)-R(\d+)", link["description"])
+        if match:
+            a, b = (f"{n}.{n}.{n}.{n}" for n in match.groups())
+            adjacency.setdefault(a, {})[b] = key
+            adjacency.setdefault(b, {})[a] = key
+    return adjacency
+
+
+def reference_rib(adjacency, engine, weights):
+    profile_engine = CostEngine(weights, CONFIG["normalization"])
+    for key in engine.keys():
+        profile_engine.add_link(key, **engine.metrics(key))
+    costs = profile_engine.recompute()
+    graph = {u: {v: float(costs[profile_engine.index_of(k)]) for v, k in edges.items()}
+             for u, edges in adjacency.items()}
+    return graph, dijkstra(graph, ROOT)[0]
+
+
+class MultiTopologyTest(unittest.TestCase):
+    def setUp(self):
+        # Ordem inversa: os enlaces de host ficam nas primeiras colunas e
+        # removê-los move enlaces do grafo.
+        self.engine = CostEngine(CONFIG["cost_weights"], CONFIG["normalization"])
+        for key, link in reversed(list(CONFIG["links"].items())):
+            self.engine.add_link(key, **{f: link[f] for f in METRIC_FIELDS})
+        self.adjacency = config_adjacency(CONFIG)
+        self.profiles = load_profiles(CONFIG)
+
+    def assert_matches_reference(self, ribs):
+        for profile in self.profiles:
+            graph, dist = reference_rib(self.adjacency, self.engine, profile.weights)
+            rib = ribs[profile.name]
+            self.assertEqual(set(rib), set(dist) - {ROOT})
+            for dest, (hop, cost) in rib.items():
+                self.assertAlmostEqual(cost, dist[dest], places=9)
+                # O primeiro salto está num caminho mínimo.
+                via = graph[ROOT][hop] + dijkstra(graph, hop)[0][dest]
+                self.assertAlmostEqual(via, dist[dest], places=9)
+
+    def run_after_removal(self, workers):
+        spf = MultiTopologySPF(self.profiles, workers=workers)
+        try:
+            spf.set_topology(SharedTopology.from_adjacency(self.adjacency, self.engine))
+            self.assert_matches_reference(spf.compute(ROOT, self.engine))
+            # Um enlace de host (fora do grafo) sai do motor e a última
+            # coluna, um enlace do grafo, ocupa o lugar dele.
+            self.engine.remove_link("10.10.2.0/24")
+            self.engine.update_link("10.3.6.0/24", latency_ms=400.0)
+            self.assert_matches_reference(spf.compute(ROOT, self.engine))
+        finally:
+            spf.close()
+
+    def test_removal_in_process(self):
+        self.run_after_removal(workers=0)
+
+    def test_removal_with_pool(self):
+        self.run_after_removal(workers=2)
+
+    def test_removed_graph_link_is_rejected(self):
+        spf = MultiTopologySPF(self.profiles, workers=0)
+        spf.set_topology(SharedTopology.from_adjacency(self.adjacency, self.engine))
+        self.engine.remove_link("10.1.2.0/24")
+        with self.assertRaises(ValueError):
+            spf.compute(ROOT, self.engine)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Multipath: grupos de nexthop sem laços na topologia do config.json."""
+
+import os
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cost_engine import CostEngine, load_config  # noqa: E402
+from multipath import multipath_rib  # noqa: E402
+from spf import dijkstra  # noqa: E402
+
+CONFIG = load_config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config.json"))
+
+
+def config_graph(config):
+    """Grafo roteador-roteador com os custos compostos (float) do bloco `links`."""
+    costs = CostEngine.from_config(config).as_dict()
+    graph = {}
+    for key, link in config["links"].items():
+        match = re.fullmatch(r"R(\d+)-R(\d+)", link["description"])
+        if match:
+            a, b = (f"{n}.{n}.{n}.{n}" for n in match.groups())
+            graph.setdefault(a, {})[b] = costs[key]
+            graph.setdefault(b, {})[a] = costs[key]
+    return graph
+
+
+class MultipathLoopTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = config_graph(CONFIG)
+
+    def ribs(self, tolerance):
+        return {r: multipath_rib(self.graph, r, tolerance=tolerance) for r in self.graph}
+
+    def test_config_has_zero_cost_link(self):
+        # O caso que o teste cobre: R7-R8 tem custo composto 0.0.
+        self.assertEqual(self.graph["7.7.7.7"]["8.8.8.8"], 0.0)
+
+    def test_no_mutual_nexthops(self):
+        for tolerance in (0.0, 0.1):
+            ribs = self.ribs(tolerance)
+            for router, rib in ribs.items():
+                for dest, (_, nexthops) in rib.items():
+                    for n, _ in nexthops:
+                        if n == dest:
+                            continue
+                        back = {m for m, _ in ribs[n].get(dest, (0, ()))[1]}
+                        self.assertNotIn(router, back, (tolerance, router, n, dest))
+
+    def test_forwarding_graph_is_acyclic_and_complete(self):
+        for tolerance in (0.0, 0.1):
+            ribs = self.ribs(tolerance)
+            for dest in self.graph:
+                # Todo roteador alcança o destino e segue uma ordem topológica.
+                state = {dest: 2}
+
+                def visit(x):
+                    self.assertNotEqual(state.get(x), 1, f"laço para {dest} em {x}")
+                    if state.get(x) == 2:
+                        return
+                    state[x] = 1
+                    self.assertIn(dest, ribs[x], (tolerance, x, dest))
+                    for n, _ in ribs[x][dest][1]:
+                        visit(n)
+                    state[x] = 2
+
+                for router in self.graph:
+                    visit(router)
+
+    def test_best_cost_is_shortest_path(self):
+        for router in self.graph:
+            dist = dijkstra(self.graph, router)[0]
+            for dest, (best, _) in multipath_rib(self.graph, router).items():
+                self.assertAlmostEqual(best, dist[dest], places=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
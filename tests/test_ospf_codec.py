@@ -0,0 +1,138 @@
+"""Codec OSPF: ida e volta de cada tipo de pacote, checksum e bloco LLS."""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lsdb import MAX_AGE, LinkRecord, MetricDelta, RouterLSA  # noqa: E402
+from ospf_codec import (DBD, DBD_INIT, HELLO, LSACK, LSR, LSU, OPTION_LLS,  # noqa: E402
+                        DatabaseDescription, Hello, HelloTiming, decode, encode_dbd,
+                        encode_hello, encode_lsack, encode_lsr, encode_lsu, inet_checksum,
+                        lsa_header, lsu_capacity)
+
+ROUTER = "1.1.1.1"
+
+
+def sample_lsas(rng, count):
+    lsas = []
+    for i in range(count):
+        links = [LinkRecord(rng.randrange(1, 1 << 32), rng.randrange(1 << 32), rng.random(),
+                            1.5, 0.25, 0.5, 100.0) for _ in range(rng.randint(0, 4))]
+        lsas.append(RouterLSA(0x0A000001 + i, 0x80000001 + i, links, age=i, checksum=i))
+    lsas.append(MetricDelta(0x0A000001, 0x80000001, 0x80000002,
+                            [(0, [("metric", 0.25), ("jitter_ms", 1.5)])]))
+    return lsas
+
+
+class RoundTripTest(unittest.TestCase):
+    def test_hello(self):
+        hello = Hello(0xFFFFFF00, 10, 0x02, 1, 40, 0, 0, [0x02020202, 0x03030303])
+        header, decoded = decode(encode_hello(ROUTER, hello, area_id=5))
+        self.assertEqual((header.type, header.router_id, header.area_id), (HELLO, 0x01010101, 5))
+        self.assertEqual(decoded, hello)
+
+    def test_hello_with_lls_timing(self):
+        timing = HelloTiming(7, 123456789012, 123000000000, 250)
+        hello = Hello(0xFFFFFF00, 10, 0x02, 1, 40, 0, 0, [0x02020202], timing)
+        packet = encode_hello(ROUTER, hello)
+        _, decoded = decode(packet)
+        self.assertEqual(decoded.timing, timing)
+        self.assertEqual(decoded.options, 0x02 | OPTION_LLS)
+        self.assertEqual(decoded.neighbors, hello.neighbors)
+
+    def test_corrupted_lls_is_ignored(self):
+        hello = Hello(0, 10, 0, 1, 40, 0, 0, [], HelloTiming(1, 2, 3, 4))
+        packet = bytearray(encode_hello(ROUTER, hello))
+        packet[-1] ^= 0xFF
+        _, decoded = decode(bytes(packet))
+        self.assertIsNone(decoded.timing)
+
+    def test_dbd(self):
+        rng = random.Random(51)
+        headers = [lsa_header(lsa) for lsa in sample_lsas(rng, 5)]
+        dbd = DatabaseDescription(1500, 0x02, DBD_INIT, 0x1234, headers)
+        header, decoded = decode(encode_dbd(ROUTER, dbd))
+        self.assertEqual(header.type, DBD)
+        self.assertEqual(decoded, dbd)
+
+    def test_lsr(self):
+        requests = [(1, 0x0A000001, 0x0A000001), (128, 0x80000001, 0x0A000002)]
+        header, decoded = decode(encode_lsr(ROUTER, requests))
+        self.assertEqual(header.type, LSR)
+        self.assertEqual(decoded, requests)
+
+    def test_lsu(self):
+        rng = random.Random(52)
+        lsas = sample_lsas(rng, 6)
+        header, decoded = decode(encode_lsu(ROUTER, lsas))
+        self.assertEqual(header.type, LSU)
+        self.assertEqual([lsa.to_bytes() for lsa in decoded], [lsa.to_bytes() for lsa in lsas])
+        self.assertEqual(decoded[-1].changes, lsas[-1].changes)
+
+    def test_lsack(self):
+        rng = random.Random(53)
+        headers = [lsa_header(lsa) for lsa in sample_lsas(rng, 4)]
+        header, decoded = decode(encode_lsack(ROUTER, headers))
+        self.assertEqual(header.type, LSACK)
+        self.assertEqual(decoded, headers)
+
+    def test_lsu_capacity_fits_mtu(self):
+        self.assertEqual(lsu_capacity(1500) + 20 + 24 + 4, 1500)
+
+
+class ValidationTest(unittest.TestCase):
+    def packet(self):
+        return bytearray(encode_lsu(ROUTER, sample_lsas(random.Random(54), 3)))
+
+    def test_checksum_valid(self):
+        self.assertEqual(inet_checksum(self.packet()[:16] + bytes(8) + self.packet()[24:]), 0)
+
+    def test_corruption_rejected(self):
+        rng = random.Random(55)
+        for _ in range(50):
+            packet = self.packet()
+            # Qualquer byte fora do checksum e da autenticação.
+            pos = rng.choice([i for i in range(len(packet)) if not 12 <= i < 24])
+            packet[pos] ^= 1 << rng.randrange(8)
+            with self.assertRaises(ValueError):
+                decode(bytes(packet))
+
+    def test_auth_field_not_covered(self):
+        packet = self.packet()
+        packet[16:24] = b"password"
+        decode(bytes(packet))
+
+    def test_unverified_decode(self):
+        packet = self.packet()
+        packet[12:14] = b"\x12\x34"
+        with self.assertRaises(ValueError):
+            decode(bytes(packet))
+        decode(bytes(packet), verify=False)
+
+    def test_truncated(self):
+        with self.assertRaises(ValueError):
+            decode(bytes(self.packet()[:30]))
+
+    def test_wrong_version(self):
+        packet = self.packet()
+        packet[0] = 3
+        with self.assertRaises(ValueError):
+            decode(bytes(packet))
+
+
+class LSAHeaderTest(unittest.TestCase):
+    def test_age_clamped_to_max_age(self):
+        lsa = RouterLSA(1, 0x80000001, [], age=5000)
+        self.assertEqual(lsa_header(lsa).age, MAX_AGE)
+        self.assertEqual(lsa_header(RouterLSA(1, 0x80000001, [], age=10)).age, 10)
+
+    def test_negative_sequence_numbers(self):
+        lsa = RouterLSA(1, -5, [])
+        self.assertEqual(lsa_header(lsa).seq, 0xFFFFFFFB)
+
+
+if __name__ == "__main__":
+    unittest.main()
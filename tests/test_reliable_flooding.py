@@ -0,0 +1,128 @@
+"""Flooding confiável: regra de Karn, backoff do RTO e acks em lote."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lsdb import LSA_HEADER  # noqa: E402
+from ospf_codec import IP_HEADER_SIZE, OSPF_HEADER, LSAHeader  # noqa: E402
+from reliable_flooding import AckBatcher, RetransmissionList, RTOEstimator  # noqa: E402
+from timer_wheel import TimerWheel  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def header(adv, seq=0x80000001):
+    return LSAHeader(0, 0, 1, adv, adv, seq, 0, 48)
+
+
+class RetransmissionTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.wheel = TimerWheel(tick_s=0.001, clock=self.clock)
+        self.sent = []
+        self.estimator = RTOEstimator(initial_rtt_s=0.1, ack_delay_s=0.0, min_rto_s=0.02,
+                                      max_rto_s=1.0)
+        self.rxmt = RetransmissionList(self.sent.append, self.wheel, self.estimator,
+                                       clock=self.clock)
+
+    def at(self, t):
+        self.clock.now = t
+        self.wheel.advance()
+
+    def test_ack_samples_rtt(self):
+        self.rxmt.add("a", 1, b"x" * 40)
+        self.at(0.03)
+        self.assertFalse(self.rxmt.acknowledge("a", 2))
+        self.assertTrue(self.rxmt.acknowledge("a", 1))
+        self.assertEqual(self.estimator.samples, 1)
+        self.assertAlmostEqual(self.estimator.srtt, 0.03)
+        self.at(5.0)
+        self.assertEqual(self.sent, [])
+
+    def test_karn_and_backoff(self):
+        rto = self.estimator.rto  # 0.1 + 4 * 0.05 = 0.3
+        self.assertAlmostEqual(rto, 0.3)
+        self.rxmt.add("a", 1, b"x" * 40)
+        fired_at = 0.0
+        for n in range(5):
+            # O RTO dobra a cada retransmissão: 0.3, 0.6, 1.0 (teto), 1.0, 1.0.
+            due = fired_at + min(rto * 2 ** n, 1.0)
+            self.at(due - 0.002)
+            self.assertEqual(len(self.sent), n)
+            fired_at = due + 0.002
+            self.at(fired_at)
+            self.assertEqual(len(self.sent), n + 1)
+        self.assertEqual(self.rxmt.retransmitted, 5)
+        self.assertTrue(self.rxmt.acknowledge("a", 1))
+        # Regra de Karn: ack de LSA retransmitido não vira amostra.
+        self.assertEqual(self.estimator.samples, 0)
+        self.assertAlmostEqual(self.estimator.rto, rto)
+
+    def test_due_entries_share_a_packet(self):
+        self.rxmt.add("a", 1, b"a" * 40)
+        self.at(0.01)
+        self.rxmt.add("b", 1, b"b" * 40)
+        self.at(0.2)
+        self.rxmt.add("c", 1, b"c" * 40)
+        self.at(0.301)
+        # "b" vence 10 ms depois de "a" (dentro do RTO mínimo) e vai junto.
+        self.assertEqual(self.sent, [[b"a" * 40, b"b" * 40]])
+        self.assertIn("c", self.rxmt)
+
+    def test_clear(self):
+        self.rxmt.add("a", 1, b"a")
+        self.rxmt.clear()
+        self.at(5.0)
+        self.assertEqual((len(self.rxmt), self.sent), (0, []))
+
+
+class AckBatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.wheel = TimerWheel(tick_s=0.001, clock=self.clock)
+        self.acks = []
+
+    def test_flush_on_timer(self):
+        batcher = AckBatcher(self.acks.append, self.wheel, delay_s=0.05)
+        batcher.ack(header(1))
+        self.clock.now = 0.02
+        batcher.ack(header(2))
+        batcher.ack(header(2))  # duplicata
+        self.clock.now = 0.049
+        self.wheel.advance()
+        self.assertEqual(self.acks, [])
+        self.clock.now = 0.051
+        self.wheel.advance()
+        self.assertEqual(self.acks, [[header(1), header(2)]])
+        self.assertEqual((batcher.packets, batcher.acked, len(batcher)), (1, 2, 0))
+
+    def test_flush_on_size(self):
+        mtu = IP_HEADER_SIZE + OSPF_HEADER.size + 3 * LSA_HEADER.size
+        batcher = AckBatcher(self.acks.append, self.wheel, delay_s=0.05, mtu=mtu)
+        for adv in range(1, 5):
+            batcher.ack(header(adv))
+        # O pacote encheu com 3 e saiu sem esperar; o quarto espera o timer.
+        self.assertEqual(self.acks, [[header(1), header(2), header(3)]])
+        self.clock.now = 0.06
+        self.wheel.advance()
+        self.assertEqual(self.acks[1:], [[header(4)]])
+
+    def test_selective_by_instance(self):
+        batcher = AckBatcher(self.acks.append, self.wheel)
+        batcher.ack(header(1, 0x80000001))
+        batcher.ack(header(1, 0x80000002))
+        batcher.flush()
+        self.assertEqual(len(self.acks[0]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Filas de saída: prioridade estrita, liberação justa de DBD, descarte e histogramas."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ospf_codec import DBD, HELLO, LSACK, LSR, LSU  # noqa: E402
+from send_queue import (DBD_CLASS, HELLO_CLASS, Log2Histogram, PrioritySendQueue,  # noqa: E402
+                        packet_class)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def packet(packet_type, n=0):
+    """Pacote mínimo: o escalonador só olha o tipo OSPF no segundo byte."""
+    return bytes((2, packet_type, n))
+
+
+class SendQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.sent = []
+        self.queue = PrioritySendQueue("eth0", self.sent.append, rate_pps=1000.0, burst=1000,
+                                       fair_every=3, clock=self.clock)
+
+    def sent_types(self):
+        return [p[1] for p in self.sent]
+
+    def test_packet_class(self):
+        self.assertEqual(packet_class(packet(HELLO)), HELLO_CLASS)
+        self.assertEqual(packet_class(packet(LSR)), DBD_CLASS)
+
+    def test_strict_priority(self):
+        queue = PrioritySendQueue("eth0", self.sent.append, fair_every=100, clock=self.clock)
+        for packet_type in (DBD, LSU, LSACK, HELLO, LSU, LSACK, HELLO):
+            queue.enqueue(packet(packet_type))
+        queue.poll()
+        self.assertEqual(self.sent_types(), [HELLO, HELLO, LSACK, LSACK, LSU, LSU, DBD])
+
+    def test_fair_every_releases_dbd(self):
+        for n in range(10):
+            self.queue.enqueue(packet(LSU, n))
+        self.queue.enqueue(packet(DBD, 0))
+        self.queue.enqueue(packet(DBD, 1))
+        self.queue.enqueue(packet(HELLO))
+        self.queue.poll()
+        # O hello sai primeiro; depois de 3 LSUs com DBD esperando, sai um DBD.
+        self.assertEqual(self.sent_types()[:9],
+                         [HELLO, LSU, LSU, LSU, DBD, LSU, LSU, LSU, DBD])
+        self.assertEqual(len(self.sent), 13)
+
+    def test_drop_tail(self):
+        queue = PrioritySendQueue("eth0", self.sent.append, limits={"lsu": 2}, clock=self.clock)
+        self.assertTrue(queue.enqueue(packet(LSU, 0)))
+        self.assertTrue(queue.enqueue(packet(LSU, 1)))
+        self.assertFalse(queue.enqueue(packet(LSU, 2)))
+        queue.poll()
+        self.assertEqual([p[2] for p in self.sent], [0, 1])
+        self.assertEqual(queue.stats()["lsu"]["dropped"], 1)
+
+    def test_token_bucket_pacing(self):
+        queue = PrioritySendQueue("eth0", self.sent.append, rate_pps=10.0, burst=2,
+                                  clock=self.clock)
+        for n in range(5):
+            queue.enqueue(packet(LSU, n))
+        self.assertEqual(queue.poll(), 2)
+        self.assertAlmostEqual(queue.next_deadline(), 0.1)
+        self.clock.now = 0.1
+        self.assertEqual(queue.poll(), 1)
+        self.clock.now = 0.35
+        self.assertEqual(queue.poll(), 2)
+        self.assertIsNone(queue.next_deadline())
+
+    def test_histograms(self):
+        queue = PrioritySendQueue("eth0", self.sent.append, rate_pps=1000.0, burst=1,
+                                  clock=self.clock)
+        for n in range(4):
+            queue.enqueue(packet(LSACK, n))
+        # Profundidades na chegada: 0, 1, 2, 3.
+        self.assertEqual(queue.stats()["lsack"]["depth"], {1: 1, 2: 1, 4: 2})
+        self.clock.now = 0.0
+        queue.poll()
+        self.clock.now = 0.003
+        queue.poll()
+        stats = queue.stats()["lsack"]
+        # Esperas de 0 µs e 3000 µs.
+        self.assertEqual(stats["wait_us"], {1: 1, 4096: 1})
+        self.assertEqual(stats["max_wait_us"], 3000)
+        self.assertEqual((stats["sent"], stats["queued"]), (2, 2))
+
+    def test_log2_histogram(self):
+        h = Log2Histogram()
+        for value in (0, 1, 2, 3, 4, 1000):
+            h.observe(value)
+        self.assertEqual(h.snapshot(), {1: 1, 2: 1, 4: 2, 8: 1, 1024: 1})
+        self.assertEqual((h.total, h.max), (6, 1000))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Snapshot: gravação em diretório novo, carga e gravação periódica."""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lsdb import LSDB, LinkRecord, RouterLSA  # noqa: E402
+import snapshot  # noqa: E402
+from snapshot import (Neighbor, PeriodicSnapshot, load_snapshot, save_snapshot,  # noqa: E402
+                      warm_restart)
+from timer_wheel import TimerWheel  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def sample_lsdb():
+    rng = random.Random(41)
+    db = LSDB()
+    for adv in range(1, 10):
+        db.install(RouterLSA(adv, 0x80000001, [LinkRecord(adv + 1, 0, rng.random())]))
+    return db
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def test_save_creates_parent_directory(self):
+        path = os.path.join(self.dir, "var", "lib", "ospf-gaming", "snapshot.bin")
+        db = sample_lsdb()
+        rib = {"10.1.2.0/24": (("10.0.0.1", 1),)}
+        neighbors = [Neighbor(2, "10.0.0.2", 3, 1)]
+        save_snapshot(path, db, rib, neighbors)
+        snapshot = load_snapshot(path)
+        self.assertEqual(snapshot.lsdb.adjacency(), db.adjacency())
+        self.assertEqual(snapshot.rib, rib)
+        self.assertEqual(snapshot.neighbors, neighbors)
+
+    def test_periodic_saves(self):
+        clock = Clock()
+        wheel = TimerWheel(tick_s=0.1, clock=clock)
+        path = os.path.join(self.dir, "state", "snapshot.bin")
+        db = sample_lsdb()
+        saver = PeriodicSnapshot.from_config(
+            wheel, {"snapshot": {"path": path, "interval_s": 5}},
+            lambda: (db.freeze(), {}, ()))
+        saver.start()
+        for step in range(1, 121):
+            clock.now = step * 0.1
+            wheel.advance()
+        self.assertEqual(saver.saved, 2)
+        self.assertTrue(os.path.exists(path))
+        saver.stop()
+        clock.now = 60.0
+        wheel.advance()
+        self.assertEqual(saver.saved, 2)
+
+    def rename_section(self, path, old, new):
+        """Troca o nome de uma seção na tabela, como se ela faltasse."""
+        with open(path, "r+b") as f:
+            data = bytearray(f.read())
+            count = snapshot._HEADER.unpack_from(data, 0)[2]
+            for i in range(count):
+                pos = snapshot._HEADER.size + i * snapshot._SECTION.size
+                if data[pos:pos + 24].rstrip(b"\0") == old.encode():
+                    data[pos:pos + 24] = new.encode().ljust(24, b"\0")
+                    break
+            else:
+                self.fail(f"seção {old!r} não encontrada")
+            f.seek(0)
+            f.write(data)
+
+    def test_missing_sections_mean_cold_start(self):
+        for section in ("rib", "neighbors", "seq", "link_metric"):
+            path = os.path.join(self.dir, f"{section}.bin")
+            save_snapshot(path, sample_lsdb(), {"10.1.2.0/24": (("10.0.0.1", 1),)})
+            self.rename_section(path, section, "unknown")
+            with self.assertRaises(ValueError):
+                load_snapshot(path)
+            with self.assertLogs("snapshot", "WARNING"):
+                self.assertIsNone(warm_restart(path))
+
+    def test_without_path_is_disabled(self):
+        self.assertIsNone(PeriodicSnapshot.from_config(TimerWheel(), {}, lambda: None))
+
+
+if __name__ == "__main__":
+    unittest.main()
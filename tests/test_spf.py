@@ -0,0 +1,171 @@
+"""SPF incremental, CSR/radix heap e primeiros saltos contra o Dijkstra."""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from csr_graph import CSRGraph  # noqa: E402
+from spf import (INF, IncrementalSPF, RadixHeap, dijkstra, first_hops,  # noqa: E402
+                 first_hops_csr, forwarding_path, spf_csr)
+
+
+def random_graph(rng, n, degree, integer=False):
+    graph = {u: {} for u in range(n)}
+    for u in range(n):
+        for v in rng.sample(range(n), degree):
+            if v != u:
+                graph[u][v] = rng.randint(1, 20) if integer else rng.uniform(0.01, 1.0)
+    return graph
+
+
+def hop_of(parent, root, dest):
+    x = dest
+    while parent[x] != root:
+        x = parent[x]
+    return x
+
+
+class IncrementalSPFTest(unittest.TestCase):
+    def assert_matches_full(self, spf):
+        dist, _ = dijkstra(spf.graph, spf.root)
+        self.assertEqual(dist.keys(), spf.dist.keys())
+        for node, d in dist.items():
+            self.assertAlmostEqual(spf.dist[node], d, places=9)
+        # A árvore mantida tem de ser coerente com as distâncias.
+        for node, p in spf.parent.items():
+            if p is not None:
+                self.assertAlmostEqual(spf.dist[p] + spf.graph[p][node], spf.dist[node], places=9)
+
+    def test_random_edge_changes(self):
+        rng = random.Random(3)
+        for trial in range(20):
+            graph = random_graph(rng, 30, 3)
+            spf = IncrementalSPF(graph, 0)
+            for _ in range(60):
+                u = rng.randrange(30)
+                v = rng.randrange(30)
+                if u == v:
+                    continue
+                choice = rng.random()
+                if choice < 0.2:
+                    cost = None
+                elif choice < 0.6:
+                    cost = rng.uniform(0.01, 1.0)
+                else:
+                    # Mudanças no enlace da árvore exercitam o caso de aumento.
+                    old = graph.get(u, {}).get(v)
+                    cost = rng.uniform(0.01, 1.0) if old is None else old * rng.uniform(0.5, 3)
+                spf.update_edge(u, v, cost)
+                self.assert_matches_full(spf)
+
+    def test_increase_on_tree_edge_reroutes_subtree(self):
+        graph = {"a": {"b": 1, "c": 5}, "b": {"d": 1}, "c": {"d": 1}, "d": {}}
+        spf = IncrementalSPF(graph, "a")
+        self.assertEqual(spf.parent["d"], "b")
+        changed = spf.update_edge("a", "b", 10)
+        self.assertEqual(spf.parent["d"], "c")
+        self.assertEqual(spf.dist["d"], 6)
+        self.assertIn("d", changed)
+
+    def test_removal_disconnects(self):
+        spf = IncrementalSPF({"a": {"b": 1}, "b": {"c": 1}, "c": {}}, "a")
+        spf.update_edge("a", "b", None)
+        self.assertEqual(set(spf.dist), {"a"})
+        self.assertEqual(spf.first_hops(), {})
+
+    def test_verify_has_no_mismatches(self):
+        rng = random.Random(5)
+        spf = IncrementalSPF(random_graph(rng, 20, 3), 0, verify=True)
+        for _ in range(200):
+            u, v = rng.sample(range(20), 2)
+            spf.update_edge(u, v, rng.choice((None, rng.uniform(0.01, 1.0))))
+        self.assertEqual(spf.mismatches, 0)
+
+
+class FirstHopsTest(unittest.TestCase):
+    def test_dict_tree(self):
+        rng = random.Random(7)
+        graph = random_graph(rng, 40, 3)
+        dist, parent = dijkstra(graph, 0)
+        hops = first_hops(parent, 0)
+        self.assertEqual(hops.keys(), dist.keys() - {0})
+        for dest, hop in hops.items():
+            self.assertEqual(hop, hop_of(parent, 0, dest))
+            self.assertIn(hop, graph[0])
+
+    def test_incremental_matches_dijkstra(self):
+        rng = random.Random(8)
+        graph = random_graph(rng, 40, 3)
+        spf = IncrementalSPF(graph, 0)
+        self.assertEqual(spf.first_hops(), first_hops(dijkstra(graph, 0)[1], 0))
+
+    def test_csr_list(self):
+        rng = random.Random(9)
+        graph = random_graph(rng, 40, 2)
+        csr = CSRGraph.from_adjacency(graph)
+        root = csr.ids.index(0)
+        dist, parent = spf_csr(csr, root)
+        hops = first_hops_csr(dist, parent, root)
+        self.assertEqual(hops[root], -1)
+        for v, hop in enumerate(hops):
+            if dist[v] == INF or v == root:
+                self.assertEqual(hop, -1)
+            else:
+                self.assertEqual(hop, hop_of(parent, root, v))
+
+
+class CSRSPFTest(unittest.TestCase):
+    def test_heap_and_radix_match_dijkstra(self):
+        rng = random.Random(11)
+        for _ in range(10):
+            graph = random_graph(rng, 60, 3, integer=True)
+            expected, _ = dijkstra(graph, 0)
+            csr = CSRGraph.from_adjacency(graph, integer=True)
+            root = csr.ids.index(0)
+            for radix in (False, True):
+                dist, parent = spf_csr(csr, root, radix=radix)
+                for i, d in enumerate(dist):
+                    self.assertEqual(d, expected.get(csr.ids.router_id(i), INF))
+                    if parent[i] >= 0:
+                        self.assertEqual(dist[parent[i]] + graph[csr.ids.router_id(parent[i])]
+                                         [csr.ids.router_id(i)], d)
+
+    def test_radix_rejects_float_costs(self):
+        csr = CSRGraph.from_adjacency({"a": {"b": 0.5}})
+        with self.assertRaises(ValueError):
+            spf_csr(csr, 0, radix=True)
+
+
+class ForwardingPathTest(unittest.TestCase):
+    def test_loop_detected(self):
+        hops = {("a", "c"): "b", ("b", "c"): "a"}
+        self.assertIsNone(forwarding_path("a", "c", lambda x, d: hops.get((x, d))))
+
+
+class RadixHeapTest(unittest.TestCase):
+    def test_monotone_order(self):
+        rng = random.Random(6)
+        heap, popped, last = RadixHeap(), [], 0
+        for _ in range(2000):
+            if heap and rng.random() < 0.4:
+                last = heap.pop()[0]
+                popped.append(last)
+            else:
+                heap.push(last + rng.randint(0, 1000), None)
+        while heap:
+            popped.append(heap.pop()[0])
+        self.assertEqual(popped, sorted(popped))
+
+    def test_items_are_never_compared(self):
+        heap = RadixHeap()
+        heap.push(5, {"a": 1})
+        heap.push(5, {"b": 2})
+        heap.push(9, {})
+        self.assertEqual([heap.pop()[0] for _ in range(3)], [5, 5, 9])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Agendamento do SPF: estados da RFC 8405, atrasos escolhidos e coalescência."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from spf_scheduler import LONG_WAIT, QUIET, SHORT_WAIT, SPFScheduler  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SPFSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.runs = []
+        self.scheduler = SPFScheduler(self.runs.append, initial_delay_s=0.05, short_delay_s=0.2,
+                                      long_delay_s=2.0, time_to_learn_s=0.5, holddown_s=10.0,
+                                      clock=self.clock)
+
+    def at(self, t):
+        self.clock.now = t
+        return self.scheduler.poll()
+
+    def test_initial_delay_and_merge(self):
+        s = self.scheduler
+        self.assertEqual(s.state, QUIET)
+        s.trigger("lsa")
+        s.trigger("lsa")
+        s.trigger("cost")
+        self.assertEqual(s.state, SHORT_WAIT)
+        self.assertAlmostEqual(s.next_deadline(), 0.05)
+        self.assertFalse(self.at(0.049))
+        self.assertTrue(self.at(0.05))
+        self.assertEqual(self.runs, [{"lsa": 2, "cost": 1}])
+        self.assertEqual((s.runs, s.triggers, s.merged, s.last_merged, s.max_merged),
+                         (1, 3, 2, 3, 3))
+
+    def test_full_cycle(self):
+        s = self.scheduler
+        s.trigger()
+        self.at(0.05)
+        # Ainda em SHORT_WAIT: atraso curto.
+        self.clock.now = 0.3
+        s.trigger()
+        self.assertAlmostEqual(s.next_deadline(), 0.5)  # fim do time_to_learn antes
+        self.assertFalse(self.at(0.49))
+        self.assertEqual(s.state, SHORT_WAIT)
+        self.assertTrue(self.at(0.5))
+        self.assertEqual(s.state, LONG_WAIT)
+
+        # A instabilidade persistiu: atraso longo.
+        self.clock.now = 1.0
+        s.trigger()
+        self.assertFalse(self.at(2.99))
+        self.assertTrue(self.at(3.0))
+        self.assertEqual(s.state, LONG_WAIT)
+
+        # Sem gatilhos por `holddown` a partir do último: volta a QUIET.
+        self.assertAlmostEqual(s.next_deadline(), 11.0)
+        self.at(10.99)
+        self.assertEqual(s.state, LONG_WAIT)
+        self.at(11.0)
+        self.assertEqual(s.state, QUIET)
+        self.assertIsNone(s.next_deadline())
+
+        # E o próximo gatilho volta a usar o atraso inicial.
+        self.clock.now = 20.0
+        s.trigger()
+        self.assertEqual(s.state, SHORT_WAIT)
+        self.assertAlmostEqual(s.next_deadline(), 20.05)
+        self.assertEqual(s.runs, 3)
+        self.assertEqual(s.merged, 0)
+
+    def test_triggers_extend_holddown(self):
+        s = self.scheduler
+        for t in range(0, 30, 5):
+            self.clock.now = float(t)
+            s.trigger()
+            self.at(t + 2.5)
+            self.assertNotEqual(s.state, QUIET)
+        self.at(25 + 10.0)
+        self.assertEqual(s.state, QUIET)
+
+    def test_from_config(self):
+        s = SPFScheduler.from_config(None, {"spf_throttle": {"initial_delay_ms": 10,
+                                                             "long_delay_ms": 5000}})
+        self.assertEqual((s.initial_delay_s, s.short_delay_s, s.long_delay_s),
+                         (0.01, 0.2, 5.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""Roda de temporização: sem disparos adiantados ou atrasados nas cascatas."""
+
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from timer_wheel import KeyedTimers, TimerWheel  # noqa: E402
+
+
+class Clock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TimerWheelTest(unittest.TestCase):
+    def run_random(self, seed, slots, levels, max_delay):
+        rng = random.Random(seed)
+        clock = Clock(rng.uniform(0, 100))
+        wheel = TimerWheel(tick_s=1.0, slots=slots, levels=levels, clock=clock)
+        pending = {}
+        fired = []
+
+        def callback(timer_id):
+            fired.append(timer_id)
+
+        next_id = 0
+        for _ in range(400):
+            for _ in range(rng.randint(0, 5)):
+                delay = rng.uniform(0, max_delay)
+                pending[next_id] = wheel.schedule(delay, callback, next_id)
+                next_id += 1
+            if pending and rng.random() < 0.2:
+                timer_id = rng.choice(list(pending))
+                pending.pop(timer_id).cancel()
+            if pending and rng.random() < 0.1:
+                timer = pending[rng.choice(list(pending))]
+                wheel.reschedule(timer, rng.uniform(0, max_delay))
+
+            clock.now += rng.choice((0.3, 1.0, 2.5, rng.uniform(0, max_delay / 4)))
+            fired.clear()
+            wheel.advance()
+            ticks = [math.ceil(pending[t].deadline) for t in fired]
+            self.assertEqual(ticks, sorted(ticks), "fora de ordem")
+            for timer_id in fired:
+                timer = pending.pop(timer_id)
+                self.assertLessEqual(timer.deadline, clock.now, "disparo adiantado")
+                self.assertFalse(timer.active)
+            for timer in pending.values():
+                self.assertGreater(math.ceil(timer.deadline), math.floor(clock.now),
+                                   "disparo atrasado")
+            self.assertEqual(len(wheel), len(pending))
+
+        clock.now += max_delay * 2
+        fired.clear()
+        wheel.advance()
+        self.assertEqual(sorted(fired), sorted(pending))
+        self.assertEqual(len(wheel), 0)
+        self.assertIsNone(wheel.next_deadline())
+
+    def test_cascades(self):
+        # 4 slots e 3 níveis: atrasos de até 200 ticks passam por todos os
+        # níveis e pelo overflow.
+        for seed in range(5):
+            self.run_random(seed, slots=4, levels=3, max_delay=200)
+
+    def test_default_geometry(self):
+        self.run_random(10, slots=256, levels=2, max_delay=70000)
+
+    def sleep_until_fired(self, wheel, clock, delay_s):
+        """Laço que só dorme até `next_deadline()`; retorna o atraso do disparo."""
+        fired = []
+        deadline = clock.now + delay_s
+        wheel.schedule(delay_s, fired.append, "x")
+        while not fired:
+            wake = wheel.next_deadline()
+            self.assertIsNotNone(wake)
+            self.assertGreater(wake, clock.now)
+            self.assertLessEqual(wake, deadline + wheel.tick_s)
+            clock.now = wake
+            wheel.advance()
+        self.assertGreaterEqual(clock.now, deadline)
+        return clock.now - deadline
+
+    def test_next_deadline_is_lower_bound(self):
+        clock = Clock()
+        wheel = TimerWheel(tick_s=0.01, slots=8, levels=3, clock=clock)
+        self.assertLess(self.sleep_until_fired(wheel, clock, 0.5), 0.02)
+
+    def test_next_deadline_from_arbitrary_clock(self):
+        # Um timer de 3 s visto em 2.5 s está no nível 1 e desce na virada
+        # de 2.56 s; esperar o fim da volta do nível 0 o atrasaria 2 s.
+        clock = Clock()
+        wheel = TimerWheel(clock=clock)
+        wheel.schedule(3.0, lambda: None)
+        clock.now = 2.5
+        wheel.advance()
+        self.assertLessEqual(wheel.next_deadline(), 3.0 + wheel.tick_s)
+
+        rng = random.Random(7)
+        for slots, levels in ((8, 3), (256, 4)):
+            for _ in range(200):
+                clock = Clock(rng.uniform(0, 1000))
+                wheel = TimerWheel(tick_s=0.01, slots=slots, levels=levels, clock=clock)
+                clock.now += rng.uniform(0, 50)
+                wheel.advance()
+                late = self.sleep_until_fired(wheel, clock, rng.uniform(0, 30))
+                self.assertLess(late, 2 * wheel.tick_s)
+
+
+class KeyedTimersTest(unittest.TestCase):
+    def test_rearm_replaces(self):
+        clock = Clock()
+        wheel = TimerWheel(tick_s=0.1, clock=clock)
+        expired = []
+        timers = KeyedTimers(wheel, expired.append)
+        timers.arm("n1", 1.0)
+        clock.now = 0.9
+        wheel.advance()
+        timers.arm("n1", 1.0)
+        clock.now = 1.5
+        wheel.advance()
+        self.assertEqual(expired, [])
+        clock.now = 2.0
+        wheel.advance()
+        self.assertEqual(expired, ["n1"])
+        self.assertNotIn("n1", timers)
+
+    def test_disarm(self):
+        clock = Clock()
+        wheel = TimerWheel(tick_s=0.1, clock=clock)
+        expired = []
+        timers = KeyedTimers(wheel, expired.append)
+        timers.arm("a", 0.5)
+        timers.disarm("a")
+        clock.now = 1.0
+        wheel.advance()
+        self.assertEqual(expired, [])
+        self.assertEqual(len(wheel), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
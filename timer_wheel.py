@@ -0,0 +1,191 @@
+"""Roda de temporização hierárquica.
+
+Um único relógio dirige todos os timers do protocolo (MaxAge e refresh de
+LSAs, retransmissões, dead interval dos vizinhos) no lugar de threads ou
+laços com sleep por objeto. Inserir e cancelar são O(1); `advance` só visita
+os slots cujo tempo passou, e timers distantes descem de nível (cascata) à
+medida que se aproximam.
+
+O tempo é discretizado em ticks de `tick_s` segundos. O nível 0 tem
+`slots` posições de 1 tick; cada nível seguinte cobre `slots` vezes mais.
+"""
+
+import time
+
+DEFAULT_TICK_S = 0.01
+DEFAULT_SLOTS = 256
+DEFAULT_LEVELS = 4
+_TICK_SLACK = 1e-6
+
+
+class Timer:
+    """Timer agendado; `cancel()` o desarma sem procurá-lo na roda."""
+
+    __slots__ = ("deadline", "callback", "args", "_bucket", "_wheel")
+
+    def __init__(self, wheel, deadline, callback, args):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self._bucket = None
+        self._wheel = wheel
+
+    @property
+    def active(self):
+        return self._bucket is not None
+
+    def cancel(self):
+        if self._bucket is not None:
+            del self._bucket[self]
+            self._bucket = None
+            self._wheel._count -= 1
+
+
+class TimerWheel:
+    """Roda hierárquica com relógio injetável.
+
+    Cada slot é um dict usado como conjunto ordenado (remoção O(1) no
+    cancelamento). O laço principal chama `advance()` e pode dormir até
+    `next_deadline()`.
+    """
+
+    def __init__(self, tick_s=DEFAULT_TICK_S, slots=DEFAULT_SLOTS, levels=DEFAULT_LEVELS,
+                 clock=time.monotonic):
+        if slots & (slots - 1):
+            raise ValueError("slots deve ser potência de 2")
+        self.tick_s = tick_s
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._levels = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._overflow = {}
+        self._clock = clock
+        self._tick = self._to_tick(clock())
+        self._count = 0
+        self.fired = 0
+
+    def __len__(self):
+        return self._count
+
+    def _to_tick(self, t):
+        # `next_deadline` devolve tick * tick_s, que na divisão de volta pode
+        # dar um fio abaixo do tick; sem a folga o laço acordaria sem avançar.
+        return int(t / self.tick_s + _TICK_SLACK)
+
+    def schedule(self, delay_s, callback, *args):
+        """Agenda `callback(*args)` para daqui a `delay_s` segundos."""
+        return self.schedule_at(self._clock() + delay_s, callback, *args)
+
+    def schedule_at(self, deadline, callback, *args):
+        timer = Timer(self, deadline, callback, args)
+        self._place(timer)
+        return timer
+
+    def reschedule(self, timer, delay_s):
+        """Move um timer (ativo ou não) para daqui a `delay_s` segundos."""
+        timer.cancel()
+        timer.deadline = self._clock() + delay_s
+        self._place(timer)
+        return timer
+
+    def _place(self, timer, earliest=None):
+        # Arredonda para cima: um timer nunca dispara antes do prazo. Na
+        # cascata o tick atual ainda vai ser processado (earliest = tick).
+        earliest = self._tick + 1 if earliest is None else earliest
+        tick = max(-int(-timer.deadline // self.tick_s), earliest)
+        delta = tick - self._tick
+        bucket = self._overflow
+        for level, slots in enumerate(self._levels):
+            if delta < 1 << (self._bits * (level + 1)):
+                bucket = slots[(tick >> (self._bits * level)) & self._mask]
+                break
+        bucket[timer] = tick
+        timer._bucket = bucket
+        self._count += 1
+
+    def cancel(self, timer):
+        timer.cancel()
+
+    def advance(self, now=None):
+        """Dispara todos os timers vencidos até `now`; retorna quantos."""
+        now = self._clock() if now is None else now
+        target = self._to_tick(now)
+        fired = 0
+        while self._tick < target:
+            self._tick += 1
+            tick = self._tick
+            # Ao virar um slot de nível superior, redistribui seus timers.
+            for level in range(1, len(self._levels)):
+                if tick & ((1 << (self._bits * level)) - 1):
+                    break
+                self._cascade(self._levels[level][(tick >> (self._bits * level)) & self._mask])
+            else:
+                if not tick & ((1 << (self._bits * len(self._levels))) - 1):
+                    self._cascade(self._overflow)
+            bucket = self._levels[0][tick & self._mask]
+            while bucket:
+                timer, _ = bucket.popitem()
+                timer._bucket = None
+                self._count -= 1
+                fired += 1
+                timer.callback(*timer.args)
+        self.fired += fired
+        return fired
+
+    def _cascade(self, bucket):
+        timers = list(bucket)
+        bucket.clear()
+        for timer in timers:
+            timer._bucket = None
+            self._count -= 1
+            self._place(timer, self._tick)
+
+    def next_deadline(self):
+        """Limite inferior do próximo disparo (None se a roda está vazia).
+
+        Procura só no nível 0 até a próxima virada do nível 1, quando a
+        cascata pode trazer timers de cima para qualquer slot; sem nada antes
+        disso, devolve a própria virada.
+        """
+        if not self._count:
+            return None
+        boundary = ((self._tick >> self._bits) + 1) << self._bits
+        for tick in range(self._tick + 1, boundary):
+            if self._levels[0][tick & self._mask]:
+                return tick * self.tick_s
+        return boundary * self.tick_s
+
+
+class KeyedTimers:
+    """Um timer por chave sobre uma roda compartilhada.
+
+    Ex.: dead interval por vizinho (rearmado a cada hello), MaxAge e refresh
+    por LSA, retransmissão por (vizinho, LSA). Rearmar substitui o timer
+    anterior da chave.
+    """
+
+    def __init__(self, wheel, callback):
+        self.wheel = wheel
+        self.callback = callback
+        self._timers = {}
+
+    def __len__(self):
+        return len(self._timers)
+
+    def __contains__(self, key):
+        return key in self._timers
+
+    def arm(self, key, delay_s):
+        timer = self._timers.get(key)
+        if timer is None:
+            self._timers[key] = self.wheel.schedule(delay_s, self._fire, key)
+        else:
+            self.wheel.reschedule(timer, delay_s)
+
+    def disarm(self, key):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _fire(self, key):
+        del self._timers[key]
+        self.callback(key)